@@ -7,7 +7,9 @@ License: Commercial (requires activation)
 Version: 1.0.0
 """
 
+import functools
 import os
+import threading
 from pathlib import Path
 from typing import Optional
 
@@ -19,10 +21,9 @@ from dotenv import load_dotenv
 # Load environment variables
 load_dotenv()
 
-# Import custom components
-from utils.auth import AuthManager
-from utils.data_loader import DataLoader
-from utils.metrics import MetricsCalculator
+# Import custom components (pandas, plotly figures, bcrypt... load on first use)
+from utils.jobs import get_background_manager
+from utils.profiling import init_app as init_profiling, instrument
 from pages import home, analytics, comparison, settings
 
 # ============================================
@@ -42,6 +43,8 @@ app = dash.Dash(
     suppress_callback_exceptions=True,
     title="Trading Dashboard Pro",
     update_title="Updating...",
+    # Heavy uploads run as background jobs (None: synchronous fallback)
+    background_callback_manager=get_background_manager(),
     meta_tags=[
         {"name": "viewport", "content": "width=device-width, initial-scale=1.0"}
     ],
@@ -50,6 +53,27 @@ app = dash.Dash(
 # For deployment
 server = app.server
 
+# /metrics and request timings (inactive unless PROFILING_ENABLED=True)
+init_profiling(server)
+
+
+def scan_library():
+    """Import new training logs from data/ into the library (once per worker)."""
+    from utils.library import get_library
+
+    try:
+        imported = get_library().scan()
+    except Exception as e:
+        print(f"Library scan failed: {e}")
+        return
+    if imported:
+        print(f"📚 Library: {len(imported)} new dataset(s) imported from data/")
+
+
+# In a thread, off the request path: the scan loads pandas and computes metrics
+if os.getenv("LIBRARY_SCAN_ON_STARTUP", "True") == "True":
+    threading.Thread(target=scan_library, name="library-scan", daemon=True).start()
+
 # ============================================
 # 🔐 AUTHENTICATION SETUP (Optional)
 # ============================================
@@ -57,6 +81,8 @@ server = app.server
 ENABLE_AUTH = os.getenv("ENABLE_AUTH", "False") == "True"
 
 if ENABLE_AUTH:
+    from utils.auth import AuthManager
+
     auth_manager = AuthManager()
     # Will be implemented in utils/auth.py
 
@@ -179,10 +205,55 @@ app.layout = dbc.Container(
 # ============================================
 
 
+def not_found_layout():
+    """404 page layout."""
+    return dbc.Container(
+        [
+            dbc.Row(
+                dbc.Col(
+                    [
+                        html.H1("404", className="display-1 text-danger"),
+                        html.H3("Page Not Found"),
+                        html.P("The page you're looking for doesn't exist."),
+                        dbc.Button("Go Home", href="/", color="primary", size="lg"),
+                    ],
+                    className="text-center my-5",
+                ),
+            ),
+        ],
+    )
+
+
+PAGE_LAYOUTS = {
+    "/": home.layout,
+    "/analytics": analytics.layout,
+    "/comparison": comparison.layout,
+    "/settings": settings.layout,
+}
+
+
+@functools.lru_cache(maxsize=None)
+def page_layout(pathname: Optional[str]):
+    """
+    Layout of a page, built once per worker.
+
+    Page layouts are static trees (data arrives through callbacks), so the
+    same instance is served on every navigation.
+
+    Args:
+        pathname: Key of PAGE_LAYOUTS, or None for the 404 page
+
+    Returns:
+        Page layout component
+    """
+    return PAGE_LAYOUTS.get(pathname, not_found_layout)()
+
+
 @callback(
     Output("page-content", "children"),
     Input("url", "pathname"),
 )
+@instrument("display_page")
 def display_page(pathname: Optional[str]):
     """
     Route to different pages based on URL pathname.
@@ -193,31 +264,10 @@ def display_page(pathname: Optional[str]):
     Returns:
         Page layout component
     """
-    if pathname == "/" or pathname is None:
-        return home.layout()
-    elif pathname == "/analytics":
-        return analytics.layout()
-    elif pathname == "/comparison":
-        return comparison.layout()
-    elif pathname == "/settings":
-        return settings.layout()
-    else:
-        # 404 page
-        return dbc.Container(
-            [
-                dbc.Row(
-                    dbc.Col(
-                        [
-                            html.H1("404", className="display-1 text-danger"),
-                            html.H3("Page Not Found"),
-                            html.P("The page you're looking for doesn't exist."),
-                            dbc.Button("Go Home", href="/", color="primary", size="lg"),
-                        ],
-                        className="text-center my-5",
-                    ),
-                ),
-            ],
-        )
+    if pathname is None:
+        pathname = "/"
+    # Unknown paths share one cache entry
+    return page_layout(pathname if pathname in PAGE_LAYOUTS else None)
 
 
 @callback(
@@ -242,6 +292,35 @@ def update_nav_active(pathname: Optional[str]):
     return False, False, False, False
 
 
+@callback(
+    [
+        Output("interval-component", "interval"),
+        Output("interval-component", "disabled"),
+    ],
+    Input("user-preferences", "data"),
+)
+def configure_auto_refresh(preferences: Optional[dict]):
+    """Enable the refresh interval from the Settings auto-refresh preference."""
+    seconds = int((preferences or {}).get("refresh_seconds", 0) or 0)
+    if seconds <= 0:
+        return 30 * 1000, True
+    return seconds * 1000, False
+
+
+# ============================================
+# 🗄️ CACHE STATS
+# ============================================
+
+
+@server.route("/api/cache-stats")
+def cache_stats():
+    """Metrics cache hit/miss counters (shared by all workers)."""
+    from flask import jsonify
+    from utils.cache import get_metrics_cache
+
+    return jsonify(get_metrics_cache().stats())
+
+
 # ============================================
 # 🚀 RUN SERVER
 # ============================================
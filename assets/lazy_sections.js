@@ -0,0 +1,46 @@
+/*
+ * Lazy dashboard sections - Trading Dashboard Pro
+ * Clicks the hidden trigger of a .lazy-section once it nears the viewport,
+ * so its Dash callback (render_dashboard_section) only runs when needed.
+ */
+(function () {
+    var MARGIN = "200px";
+
+    function reveal(section) {
+        var trigger = section.querySelector(".lazy-section-trigger");
+        if (trigger) {
+            trigger.click();
+        }
+    }
+
+    var observer = "IntersectionObserver" in window
+        ? new IntersectionObserver(function (entries) {
+            entries.forEach(function (entry) {
+                if (entry.isIntersecting) {
+                    observer.unobserve(entry.target);
+                    reveal(entry.target);
+                }
+            });
+        }, { rootMargin: MARGIN })
+        : null;
+
+    function watch(root) {
+        root.querySelectorAll(".lazy-section").forEach(function (section) {
+            // React keeps the node when another dataset is loaded
+            if (section.dataset.watched === section.dataset.dataset) {
+                return;
+            }
+            section.dataset.watched = section.dataset.dataset;
+            if (observer) {
+                observer.observe(section);
+            } else {
+                reveal(section);
+            }
+        });
+    }
+
+    // Sections are created by Dash callbacks after page load
+    new MutationObserver(function () {
+        watch(document);
+    }).observe(document.documentElement, { childList: true, subtree: true });
+})();
@@ -0,0 +1 @@
+"""Benchmarks module - Performance measurements for loaders, metrics and figures."""
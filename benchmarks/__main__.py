@@ -0,0 +1,167 @@
+"""
+🏁 BENCHMARK RUNNER - Trading Dashboard Pro
+Runs the asv-style suites in isolated processes and records peak RSS
+
+Usage:
+    python -m benchmarks                          # run everything
+    python -m benchmarks --filter ParseUpload     # substring filter
+    python -m benchmarks --save baseline.json
+    python -m benchmarks --compare baseline.json --threshold 1.25
+
+Every benchmark runs in a fresh (spawned) process so peak RSS is not
+polluted by earlier runs. With --compare, the exit code is 1 when any
+time_* benchmark is slower than threshold x the baseline.
+
+The suites also follow asv naming (setup, time_*, peakmem_*, track_*,
+params), so `asv run` can discover them unchanged.
+"""
+
+import argparse
+import importlib
+import inspect
+import itertools
+import json
+import multiprocessing
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import resource  # Not available on Windows
+except ImportError:
+    resource = None
+
+
+MODULES = [
+    "benchmarks.bench_loader",
+    "benchmarks.bench_metrics",
+    "benchmarks.bench_rolling",
+    "benchmarks.bench_simulation",
+    "benchmarks.bench_figures",
+    "benchmarks.bench_startup",
+]
+PREFIXES = ("time_", "peakmem_", "track_")
+
+
+def _peak_rss_mb() -> Optional[float]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KB, macOS bytes
+    return peak / 1024 / (1024 if sys.platform == "darwin" else 1)
+
+
+def _run_one(module_name: str, class_name: str, method_name: str, params: Tuple, repeat: int) -> Dict:
+    """Execute one benchmark in the current (child) process."""
+    cls = getattr(importlib.import_module(module_name), class_name)
+    bench = cls()
+    try:
+        if hasattr(bench, "setup"):
+            bench.setup(*params)
+    except NotImplementedError as e:
+        return {"skipped": str(e)}
+
+    method = getattr(bench, method_name)
+    result = {}
+    try:
+        if method_name.startswith("time_"):
+            best = float("inf")
+            for _ in range(repeat):
+                start = time.perf_counter()
+                method(*params)
+                best = min(best, time.perf_counter() - start)
+            result["seconds"] = best
+        elif method_name.startswith("track_"):
+            result["value"] = method(*params)
+        else:
+            method(*params)
+    finally:
+        if hasattr(bench, "teardown"):
+            bench.teardown(*params)
+
+    result["peak_rss_mb"] = _peak_rss_mb()
+    return result
+
+
+def discover(filter_text: str = "") -> List[Tuple[str, str, str, Tuple]]:
+    """List (module, class, method, params) for every benchmark."""
+    found = []
+    for module_name in MODULES:
+        module = importlib.import_module(module_name)
+        for class_name, cls in inspect.getmembers(module, inspect.isclass):
+            if cls.__module__ != module_name:
+                continue
+            methods = [m for m in dir(cls) if m.startswith(PREFIXES)]
+            grid = list(itertools.product(*getattr(cls, "params", [])))
+            for method_name, params in itertools.product(methods, grid or [()]):
+                name = _name(module_name, class_name, method_name, params)
+                if filter_text in name:
+                    found.append((module_name, class_name, method_name, params))
+    return found
+
+
+def _name(module_name: str, class_name: str, method_name: str, params: Tuple) -> str:
+    suffix = f"({', '.join(map(str, params))})" if params else ""
+    return f"{module_name.split('.')[-1]}.{class_name}.{method_name}{suffix}"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Trading Dashboard Pro benchmarks")
+    parser.add_argument("--filter", default="", help="Only run benchmarks whose name contains this")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per time_* benchmark (best is kept)")
+    parser.add_argument("--save", help="Write results to this JSON file")
+    parser.add_argument("--compare", help="Baseline JSON file to compare time_* results against")
+    parser.add_argument("--threshold", type=float, default=1.25, help="Allowed slowdown ratio vs baseline")
+    args = parser.parse_args(argv)
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    context = multiprocessing.get_context("spawn")
+    results, regressions = {}, []
+
+    print("=" * 90)
+    print(f"{'Benchmark':<64}{'Result':>14}{'Peak RSS':>12}")
+    print("=" * 90)
+
+    for module_name, class_name, method_name, params in discover(args.filter):
+        name = _name(module_name, class_name, method_name, params)
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+            result = pool.submit(_run_one, module_name, class_name, method_name, params, args.repeat).result()
+        results[name] = result
+
+        if "skipped" in result:
+            print(f"{name:<64}{'skipped':>14}")
+            continue
+
+        if "seconds" in result:
+            shown = f"{result['seconds'] * 1000:.2f} ms"
+        elif "value" in result:
+            shown = f"{result['value']:,}"
+        else:
+            shown = "-"
+        rss = result.get("peak_rss_mb")
+        print(f"{name:<64}{shown:>14}{(f'{rss:.0f} MB' if rss else '-'):>12}")
+
+        previous = baseline.get(name, {}).get("seconds")
+        if previous and "seconds" in result and result["seconds"] > previous * args.threshold:
+            regressions.append((name, previous, result["seconds"]))
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    if regressions:
+        print("\n❌ Regressions:")
+        for name, previous, current in regressions:
+            print(f"  {name}: {previous * 1000:.2f} ms -> {current * 1000:.2f} ms ({current / previous:.2f}x)")
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
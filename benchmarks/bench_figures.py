@@ -0,0 +1,123 @@
+"""
+⏱️ FIGURE BENCHMARK - Trading Dashboard Pro
+Dashboard layout/figure build time, serialized payload size and figure cache
+
+Usage:
+    python -m benchmarks.bench_figures [n_checkpoints]
+    python -m benchmarks --filter bench_figures
+"""
+
+import json
+import sys
+import tempfile
+from typing import Dict
+
+import plotly
+
+from benchmarks.bench_metrics import best_of
+from benchmarks.generators import SIZES, synthetic_frame
+from utils.cache import FigureCache
+from utils.dataset import TrainingDataset
+from utils.metrics import MetricsCalculator
+
+
+class DashboardContent:
+    """create_dashboard_content and the equity figure."""
+
+    params = [SIZES]
+    param_names = ["checkpoints"]
+
+    def setup(self, n):
+        from pages import home
+
+        self.home = home
+        self.dataset = TrainingDataset.from_parsed(synthetic_frame(n))
+        self.metrics = MetricsCalculator(self.dataset).get_all_metrics()
+
+    def time_create_dashboard_content(self, n):
+        self.home.create_dashboard_content(self.metrics, self.dataset.frame)
+
+    def time_equity_chart(self, n):
+        self.home.create_modern_equity_chart(self.dataset.frame)
+
+    def track_equity_figure_json_bytes(self, n):
+        return len(self.home.create_modern_equity_chart(self.dataset.frame).to_json())
+
+    def track_dashboard_payload_bytes(self, n):
+        content = self.home.create_dashboard_content(self.metrics, self.dataset.frame)
+        return len(json.dumps(content.to_plotly_json(), cls=plotly.utils.PlotlyJSONEncoder))
+
+
+class CachedFigures:
+    """Equity figure: cold build (go.Figure + validation + JSON) vs FigureCache hit."""
+
+    params = [SIZES]
+    param_names = ["checkpoints"]
+
+    def setup(self, n):
+        from pages import home
+
+        self.home = home
+        self.frame = TrainingDataset.from_parsed(synthetic_frame(n)).frame
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = FigureCache(self.tmp.name)
+        self.key = FigureCache.make_key("bench", "equity", max_points=2000)
+        self.cache.get_or_build(self.key, self.build)
+
+    def teardown(self, n):
+        self.tmp.cleanup()
+
+    def build(self):
+        return self.home.create_modern_equity_chart(self.frame)
+
+    def time_cold_build(self, n):
+        self.build().to_json()
+
+    def time_warm_hit(self, n):
+        self.cache.get(self.key)
+
+
+def run(n: int = 1_000_000) -> Dict[str, float]:
+    """
+    Time a cold equity figure build vs a FigureCache hit.
+
+    Args:
+        n: Number of checkpoints
+
+    Returns:
+        Dictionary with timings (seconds), speedup and figure JSON size
+    """
+    from pages import home
+
+    frame = TrainingDataset.from_parsed(synthetic_frame(n)).frame
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = FigureCache(tmp)
+        key = FigureCache.make_key("bench", "equity", max_points=2000)
+
+        cold_time, figure_json = best_of(lambda: home.create_modern_equity_chart(frame).to_json())
+        cache.put(key, figure_json)
+        warm_time, figure = best_of(lambda: cache.get(key))
+
+    # The hit is the same figure, not a rebuilt one
+    if figure != json.loads(figure_json):
+        raise AssertionError("cached figure differs from the cold build")
+
+    return {
+        "checkpoints": n,
+        "cold_s": cold_time,
+        "warm_s": warm_time,
+        "speedup": cold_time / warm_time if warm_time else float("inf"),
+        "json_bytes": len(figure_json),
+    }
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    result = run(n)
+    print("=" * 60)
+    print(f"📈 Equity figure on {result['checkpoints']:,} checkpoints ({result['json_bytes']:,} JSON bytes)")
+    print("=" * 60)
+    print(f"Cold (go.Figure + to_json): {result['cold_s'] * 1000:9.1f} ms")
+    print(f"Warm (FigureCache hit):     {result['warm_s'] * 1000:9.1f} ms")
+    print(f"Speedup:                    {result['speedup']:9.1f}x")
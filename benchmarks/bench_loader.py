@@ -0,0 +1,35 @@
+"""
+⏱️ LOADER BENCHMARK - Trading Dashboard Pro
+DataLoader.parse_upload per format and size
+"""
+
+from benchmarks.generators import FORMATS, SIZES, XLSX_MAX_CHECKPOINTS, encode_upload, synthetic_frame
+from utils.data_loader import DataLoader
+
+
+class ParseUpload:
+    """Decode + parse a dcc.Upload payload into a TrainingDataset."""
+
+    params = [SIZES, FORMATS]
+    param_names = ["checkpoints", "format"]
+
+    def setup(self, n, fmt):
+        if fmt == "xlsx" and n > XLSX_MAX_CHECKPOINTS:
+            raise NotImplementedError("xlsx skipped at this size")
+        self.contents, self.filename = encode_upload(synthetic_frame(n), fmt)
+        self.loader = DataLoader()
+        # Large sizes exceed MAX_UPLOAD_SIZE_MB: time the parse, not the rejection
+        self.loader.max_upload_bytes = max(self.loader.max_upload_bytes, 2 * len(self.contents))
+
+    def _parse(self):
+        dataset = self.loader.parse_upload(self.contents, self.filename)
+        assert dataset is not None, f"{self.filename} was not parsed"
+
+    def time_parse_upload(self, n, fmt):
+        self._parse()
+
+    def peakmem_parse_upload(self, n, fmt):
+        self._parse()
+
+    def track_upload_bytes(self, n, fmt):
+        return len(self.contents)
@@ -0,0 +1,188 @@
+"""
+⏱️ METRICS BENCHMARK - Trading Dashboard Pro
+Compares the single-pass MetricsKernel against the legacy per-metric pandas path
+
+Usage:
+    python -m benchmarks.bench_metrics [n_checkpoints]
+    python -m benchmarks --filter bench_metrics
+"""
+
+import sys
+import time
+from typing import Callable, Dict, Tuple
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.generators import SIZES, synthetic_balance, synthetic_frame
+from utils.dataset import TrainingDataset
+from utils.metrics import MetricsCalculator
+
+
+METRIC_METHODS = [
+    "calculate_profit_factor",
+    "calculate_expectancy",
+    "calculate_sharpe_ratio",
+    "calculate_sortino_ratio",
+    "calculate_calmar_ratio",
+    "calculate_max_drawdown",
+    "calculate_cagr",
+    "calculate_var",
+    "calculate_cvar",
+    "calculate_win_rate",
+    "calculate_win_loss_ratio",
+    "calculate_recovery_factor",
+    "calculate_ulcer_index",
+    "calculate_pain_index",
+    "calculate_kelly_criterion",
+    "calculate_tail_risk",
+    "get_ftmo_compliance",
+]
+
+
+# ============================================
+# SUITE (asv-style: setup / time_* / peakmem_*)
+# ============================================
+
+
+class AllMetrics:
+    """MetricsCalculator construction + get_all_metrics."""
+
+    params = [SIZES]
+    param_names = ["checkpoints"]
+
+    def setup(self, n):
+        self.dataset = TrainingDataset.from_parsed(synthetic_frame(n))
+
+    def time_get_all_metrics(self, n):
+        MetricsCalculator(self.dataset).get_all_metrics()
+
+    def peakmem_get_all_metrics(self, n):
+        MetricsCalculator(self.dataset).get_all_metrics()
+
+
+class MetricMethod:
+    """Each metric method on a fresh calculator (includes kernel build)."""
+
+    params = [SIZES, METRIC_METHODS]
+    param_names = ["checkpoints", "method"]
+
+    def setup(self, n, method):
+        self.dataset = TrainingDataset.from_parsed(synthetic_frame(n))
+
+    def time_method(self, n, method):
+        getattr(MetricsCalculator(self.dataset), method)()
+
+
+# ============================================
+# LEGACY COMPARISON
+# ============================================
+
+
+def legacy_all_metrics(balance: pd.Series, initial_balance: float = 10000.0) -> Dict[str, float]:
+    """Reference implementation: each metric rebuilds its own intermediates (pre-kernel behaviour)."""
+    returns = balance.pct_change().fillna(0).values
+
+    def max_dd():
+        running_max = balance.cummax()
+        return ((balance - running_max) / running_max * 100).min()
+
+    def cagr():
+        years = max(0.1, len(balance) / 1000)
+        return (((balance.iloc[-1] / initial_balance) ** (1 / years)) - 1) * 100
+
+    def sharpe():
+        excess = returns - 0.02 / 252
+        return np.mean(excess) / np.std(excess) * np.sqrt(252)
+
+    def sortino():
+        excess = returns - 0.02 / 252
+        downside = excess[excess < 0]
+        return np.mean(excess) / np.std(downside) * np.sqrt(252)
+
+    def var():
+        return np.percentile(returns, 5) * 100
+
+    def cvar():
+        threshold = np.percentile(returns, 5)
+        return returns[returns <= threshold].mean() * 100
+
+    def profit_factor():
+        pnl = balance.diff().fillna(0)
+        return pnl[pnl > 0].sum() / abs(pnl[pnl < 0].sum())
+
+    def recovery():
+        running_max = balance.cummax()
+        return abs((balance.iloc[-1] - initial_balance) / (balance - running_max).min())
+
+    def ulcer():
+        running_max = balance.cummax()
+        return np.sqrt((((balance - running_max) / running_max * 100) ** 2).mean())
+
+    def pain():
+        running_max = balance.cummax()
+        return abs((balance - running_max) / running_max * 100).mean()
+
+    return {
+        "profit_factor": profit_factor(),
+        "sharpe_ratio": sharpe(),
+        "sortino_ratio": sortino(),
+        "calmar_ratio": cagr() / abs(max_dd()),
+        "max_drawdown_pct": max_dd(),
+        "var_95": var(),
+        "cvar_95": cvar(),
+        "recovery_factor": recovery(),
+        "ulcer_index": ulcer(),
+        "pain_index": pain(),
+        "cagr": cagr(),
+    }
+
+
+def best_of(fn: Callable, repeat: int = 3) -> Tuple[float, object]:
+    """Best wall time over `repeat` runs, plus the last result."""
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def run(n: int = 1_000_000) -> Dict[str, float]:
+    """
+    Time legacy vs kernel metrics on an n-checkpoint history.
+
+    Args:
+        n: Number of checkpoints
+
+    Returns:
+        Dictionary with timings (seconds) and speedup
+    """
+    balance = synthetic_balance(n)
+    data = pd.DataFrame({"timestep": np.arange(n), "balance": balance})
+
+    legacy_time, legacy = best_of(lambda: legacy_all_metrics(data["balance"]))
+    kernel_time, metrics = best_of(lambda: MetricsCalculator(data).get_all_metrics())
+
+    # Same numbers, faster path
+    for key, expected in legacy.items():
+        if not np.isclose(metrics[key], expected, rtol=1e-9, atol=1e-12):
+            raise AssertionError(f"{key}: kernel={metrics[key]} legacy={expected}")
+
+    return {
+        "checkpoints": n,
+        "legacy_s": legacy_time,
+        "kernel_s": kernel_time,
+        "speedup": legacy_time / kernel_time if kernel_time else float("inf"),
+    }
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    result = run(n)
+    print("=" * 60)
+    print(f"📊 get_all_metrics on {result['checkpoints']:,} checkpoints")
+    print("=" * 60)
+    print(f"Legacy (per-metric pandas): {result['legacy_s'] * 1000:9.1f} ms")
+    print(f"Kernel (shared NumPy):      {result['kernel_s'] * 1000:9.1f} ms")
+    print(f"Speedup:                    {result['speedup']:9.1f}x")
@@ -0,0 +1,131 @@
+"""
+⏱️ ROLLING BENCHMARK - Trading Dashboard Pro
+O(n) rolling risk metrics vs naive pandas rolling().apply
+
+Usage:
+    python -m benchmarks.bench_rolling [n_checkpoints] [window]
+    python -m benchmarks --filter bench_rolling
+"""
+
+import sys
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.bench_metrics import best_of
+from benchmarks.generators import SIZES, synthetic_balance
+from utils.metrics import TRADING_DAYS_PER_YEAR
+from utils.rolling import rolling_risk_metrics
+
+
+WINDOWS = [50, 250, 1000]
+
+
+class RollingMetrics:
+    """rolling_risk_metrics (all six series) per window length."""
+
+    params = [SIZES, WINDOWS]
+    param_names = ["checkpoints", "window"]
+
+    def setup(self, n, window):
+        self.balance = synthetic_balance(n)
+
+    def time_rolling_risk_metrics(self, n, window):
+        rolling_risk_metrics(self.balance, window)
+
+    def peakmem_rolling_risk_metrics(self, n, window):
+        rolling_risk_metrics(self.balance, window)
+
+
+# ============================================
+# NAIVE COMPARISON
+# ============================================
+
+
+def naive_rolling(balance: np.ndarray, window: int, risk_free_rate: float = 0.02) -> pd.DataFrame:
+    """
+    Reference implementation: one Python call per window (O(n * window)).
+
+    Constant windows count as zero deviation (kernel rule), whatever
+    np.std's round-off says.
+    """
+    returns = pd.Series(balance).pct_change().fillna(0)
+    daily_rf = risk_free_rate / TRADING_DAYS_PER_YEAR
+
+    def std_of(r):
+        return r.std() if len(r) and np.ptp(r) > 0 else 0.0
+
+    def sharpe(r):
+        std = std_of(r)
+        return (r.mean() - daily_rf) / std * np.sqrt(TRADING_DAYS_PER_YEAR) if std > 0 else 0.0
+
+    def sortino(r):
+        std = std_of(r[r < daily_rf])
+        return (r.mean() - daily_rf) / std * np.sqrt(TRADING_DAYS_PER_YEAR) if std > 0 else 0.0
+
+    rolling = returns.rolling(window)
+    high = pd.Series(balance).rolling(window).apply(np.max, raw=True)
+    return pd.DataFrame(
+        {
+            "sharpe_ratio": rolling.apply(sharpe, raw=True),
+            "sortino_ratio": rolling.apply(sortino, raw=True),
+            "volatility_pct": rolling.apply(std_of, raw=True) * np.sqrt(TRADING_DAYS_PER_YEAR) * 100,
+            "drawdown_pct": (balance - high) / high * 100,
+        }
+    )
+
+
+def flat_stretch(balance: np.ndarray, start: int, length: int) -> np.ndarray:
+    """Copy of balance that stays constant over [start, start + length) (idle agent)."""
+    balance = balance.copy()
+    balance[start:start + length] = balance[start]
+    return balance
+
+
+def run(n: int = 100_000, window: int = 250) -> Dict[str, float]:
+    """
+    Time naive vs O(n) rolling metrics on an n-checkpoint history.
+
+    The history includes an idle (flat balance) stretch of three windows,
+    so the equivalence check covers constant windows too.
+
+    Args:
+        n: Number of checkpoints
+        window: Window length
+
+    Returns:
+        Dictionary with timings (seconds) and speedup
+    """
+    balance = flat_stretch(synthetic_balance(n), n // 3, 3 * window)
+
+    naive_time, naive = best_of(lambda: naive_rolling(balance, window), repeat=1)
+    fast_time, fast = best_of(lambda: rolling_risk_metrics(balance, window))
+
+    # Same series, faster path
+    for column in naive.columns:
+        expected = naive[column].to_numpy()[window - 1:]
+        actual = fast[column].to_numpy()[window - 1:]
+        if not np.allclose(actual, expected, rtol=1e-6, atol=1e-9):
+            worst = np.nanmax(np.abs(actual - expected))
+            raise AssertionError(f"{column}: max abs difference {worst}")
+
+    return {
+        "checkpoints": n,
+        "window": window,
+        "naive_s": naive_time,
+        "fast_s": fast_time,
+        "speedup": naive_time / fast_time if fast_time else float("inf"),
+    }
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    window = int(sys.argv[2]) if len(sys.argv) > 2 else 250
+    result = run(n, window)
+    print("=" * 60)
+    print(f"🪟 Rolling metrics on {result['checkpoints']:,} checkpoints (window {result['window']})")
+    print("=" * 60)
+    print(f"Naive (rolling().apply): {result['naive_s'] * 1000:9.1f} ms")
+    print(f"O(n) (cumulative sums):  {result['fast_s'] * 1000:9.1f} ms")
+    print(f"Speedup:                 {result['speedup']:9.1f}x")
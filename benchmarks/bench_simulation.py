@@ -0,0 +1,42 @@
+"""
+⏱️ SIMULATION BENCHMARK - Trading Dashboard Pro
+Bootstrap confidence intervals and Monte Carlo FTMO breach simulation
+
+Usage:
+    python -m benchmarks --filter bench_simulation
+"""
+
+from benchmarks.generators import synthetic_balance
+from utils.bootstrap import bootstrap_confidence_intervals
+from utils.metrics import MetricsKernel
+from utils.monte_carlo import ftmo_breach_probabilities
+
+
+def _returns(n: int):
+    return MetricsKernel(synthetic_balance(n)).returns
+
+
+class Bootstrap:
+    """bootstrap_confidence_intervals (block bootstrap, B resamples)."""
+
+    params = [[10_000, 100_000, 1_000_000], [500, 2000]]
+    param_names = ["checkpoints", "resamples"]
+
+    def setup(self, n, resamples):
+        self.returns = _returns(n)
+
+    def time_bootstrap(self, n, resamples):
+        bootstrap_confidence_intervals(self.returns, n_resamples=resamples, seed=0)
+
+
+class MonteCarlo:
+    """ftmo_breach_probabilities (process pool + shared-memory results)."""
+
+    params = [[10_000, 100_000], [1_000, 10_000]]
+    param_names = ["paths", "steps"]
+
+    def setup(self, paths, steps):
+        self.returns = _returns(100_000)
+
+    def time_ftmo_breach(self, paths, steps):
+        ftmo_breach_probabilities(self.returns, n_paths=paths, n_steps=steps, seed=0)
@@ -0,0 +1,119 @@
+"""
+⏱️ STARTUP BENCHMARK - Trading Dashboard Pro
+Cold import time of the app (what each gunicorn worker pays at boot)
+
+Usage:
+    python -m benchmarks.bench_startup [repeat]
+    python -m benchmarks --filter bench_startup
+"""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# The startup library scan runs in its own thread; keep it out of the import timing
+_ENV = {**os.environ, "LIBRARY_SCAN_ON_STARTUP": "False"}
+
+# Modules that should only load on first use, not at boot
+HEAVY_MODULES = ["pandas", "plotly.graph_objects", "scipy", "pyarrow", "bcrypt", "utils.metrics"]
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import app
+elapsed = time.perf_counter() - start
+print(json.dumps({"seconds": elapsed, "loaded": [m for m in %r if m in sys.modules]}))
+"""
+
+
+def _probe() -> Dict:
+    """Import app in a fresh interpreter; return import time and heavy modules loaded."""
+    output = subprocess.run(
+        [sys.executable, "-c", _PROBE % (HEAVY_MODULES,)],
+        cwd=ROOT,
+        env=_ENV,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+class Startup:
+    """`import app` in a fresh interpreter."""
+
+    def time_import_app(self):
+        _probe()
+
+    def track_heavy_modules_loaded(self):
+        return len(_probe()["loaded"])
+
+
+def import_times(limit: int = 15) -> List[Dict]:
+    """
+    Slowest modules of `import app` by cumulative time (python -X importtime).
+
+    Args:
+        limit: Number of modules to return
+
+    Returns:
+        List of {"module", "cumulative_ms"} sorted by cost
+    """
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app"],
+        cwd=ROOT,
+        env=_ENV,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stderr
+
+    rows = []
+    for line in stderr.splitlines():
+        # "import time:      self [us] |  cumulative | imported package"
+        parts = line.removeprefix("import time:").split("|")
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        rows.append({"module": parts[2].strip(), "cumulative_ms": int(parts[1]) / 1000})
+    return sorted(rows, key=lambda r: r["cumulative_ms"], reverse=True)[:limit]
+
+
+def run(repeat: int = 5) -> Dict:
+    """
+    Best cold import time over `repeat` fresh interpreters.
+
+    Args:
+        repeat: Number of interpreters to start
+
+    Returns:
+        Dictionary with best/worst seconds, heavy modules loaded and the
+        slowest imports
+    """
+    probes = [_probe() for _ in range(repeat)]
+    times = [p["seconds"] for p in probes]
+    return {
+        "best_s": min(times),
+        "worst_s": max(times),
+        "heavy_loaded": probes[-1]["loaded"],
+        "slowest": import_times(),
+    }
+
+
+if __name__ == "__main__":
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    result = run(repeat)
+    print("=" * 60)
+    print(f"🚀 Cold start: import app (best of {repeat})")
+    print("=" * 60)
+    print(f"Best:  {result['best_s'] * 1000:9.1f} ms")
+    print(f"Worst: {result['worst_s'] * 1000:9.1f} ms")
+    print(f"Heavy modules loaded at boot: {', '.join(result['heavy_loaded']) or 'none'}")
+    print("\nSlowest imports (cumulative):")
+    for row in result["slowest"]:
+        print(f"  {row['cumulative_ms']:9.1f} ms  {row['module']}")
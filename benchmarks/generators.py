@@ -0,0 +1,94 @@
+"""
+🧪 SYNTHETIC DATA - Trading Dashboard Pro
+Deterministic training-log generators for benchmarks
+"""
+
+import base64
+import io
+import json
+import os
+import zipfile
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+
+
+ALL_SIZES = [1_000, 100_000, 1_000_000, 10_000_000]
+
+# 10M-row runs take minutes and several GB: opt in with BENCH_MAX_CHECKPOINTS
+MAX_CHECKPOINTS = int(os.getenv("BENCH_MAX_CHECKPOINTS", "1000000"))
+SIZES = [n for n in ALL_SIZES if n <= MAX_CHECKPOINTS]
+
+FORMATS = ["zip", "json", "csv", "xlsx"]
+
+# Excel is limited to 1,048,576 rows and is far too slow beyond this
+XLSX_MAX_CHECKPOINTS = 100_000
+
+
+def synthetic_balance(n: int, seed: int = 42, initial_balance: float = 10000.0) -> np.ndarray:
+    """Random-walk balance history with mild positive drift."""
+    rng = np.random.default_rng(seed)
+    returns = rng.normal(0.0002, 0.01, n)
+    returns[0] = 0.0
+    return initial_balance * np.cumprod(1 + returns)
+
+
+def synthetic_frame(n: int, seed: int = 42) -> pd.DataFrame:
+    """
+    Checkpoint table shaped like training_stats.json checkpoints.
+
+    Args:
+        n: Number of checkpoints
+        seed: RNG seed
+
+    Returns:
+        DataFrame with timestep, balance and trade statistics
+    """
+    rng = np.random.default_rng(seed)
+    balance = synthetic_balance(n, seed)
+    total_trades = np.cumsum(rng.integers(0, 3, n))
+    winning = np.minimum(total_trades, np.cumsum(rng.integers(0, 2, n)))
+
+    return pd.DataFrame(
+        {
+            "timestep": np.arange(n, dtype=np.int64) * 1000,
+            "balance": balance.round(2),
+            "total_reward": (balance - balance[0]).round(2),
+            "total_trades": total_trades,
+            "winning_trades": winning,
+            "losing_trades": total_trades - winning,
+            "max_drawdown_pct": rng.uniform(0, 10, n).round(3),
+        }
+    )
+
+
+def encode_upload(df: pd.DataFrame, fmt: str) -> Tuple[str, str]:
+    """
+    Encode a checkpoint table as a dcc.Upload payload.
+
+    Args:
+        df: Checkpoint table
+        fmt: "zip" (training_stats.json inside), "json", "csv" or "xlsx"
+
+    Returns:
+        Tuple of (base64 data URL, filename)
+    """
+    if fmt in ("zip", "json"):
+        payload = json.dumps({"checkpoints": df.to_dict("records")}).encode("utf-8")
+        if fmt == "zip":
+            buffer = io.BytesIO()
+            with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zf:
+                zf.writestr("agent/training_stats.json", payload)
+            payload = buffer.getvalue()
+    elif fmt == "csv":
+        payload = df.to_csv(index=False).encode("utf-8")
+    elif fmt == "xlsx":
+        buffer = io.BytesIO()
+        df.to_excel(buffer, index=False)
+        payload = buffer.getvalue()
+    else:
+        raise ValueError(f"Unknown format: {fmt}")
+
+    encoded = base64.b64encode(payload).decode("ascii")
+    return f"data:application/octet-stream;base64,{encoded}", f"agent.{fmt}"
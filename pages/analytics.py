@@ -3,12 +3,18 @@
 Advanced analytics with detailed metrics breakdown
 """
 
-from dash import dcc, html
+import numpy as np
+from dash import dcc, html, Input, Output, callback
 import dash_bootstrap_components as dbc
 
+from utils.downsampling import DEFAULT_MAX_POINTS, downsample
+
 
 def layout():
     """Analytics page layout."""
+    # utils.rolling pulls in pandas and the metrics kernel: not needed at boot
+    from utils.rolling import DEFAULT_WINDOWS
+
     return dbc.Container(
         [
             dbc.Row(
@@ -38,7 +44,23 @@ def layout():
                                 dbc.CardBody(
                                     [
                                         html.P("Sharpe Ratio, Sortino, Calmar, VaR analysis"),
-                                        html.Div(id="risk-metrics-content"),
+                                        dbc.InputGroup(
+                                            [
+                                                dbc.InputGroupText("Rolling window"),
+                                                dbc.Select(
+                                                    id="rolling-window",
+                                                    options=[
+                                                        {"label": f"{w} checkpoints", "value": w}
+                                                        for w in DEFAULT_WINDOWS
+                                                    ],
+                                                    value=250,
+                                                    persistence=True,
+                                                ),
+                                            ],
+                                            size="sm",
+                                            className="mb-3",
+                                        ),
+                                        dcc.Loading(html.Div(id="risk-metrics-content"), type="circle"),
                                     ],
                                 ),
                             ],
@@ -70,7 +92,7 @@ def layout():
                         dbc.Card(
                             [
                                 dbc.CardHeader(html.H5("Returns Distribution", className="mb-0")),
-                                dbc.CardBody(html.Div(id="returns-distribution-chart")),
+                                dbc.CardBody(dcc.Loading(html.Div(id="returns-distribution-chart"), type="circle")),
                             ],
                             className="shadow-sm",
                         ),
@@ -82,3 +104,173 @@ def layout():
         ],
         fluid=True,
     )
+
+
+def _balance_of(frame):
+    """Balance series of a dataset frame (same rule as MetricsCalculator)."""
+    if "balance" in frame.columns:
+        return frame["balance"].to_numpy(dtype=np.float64)
+    if "total_reward" in frame.columns:
+        return 10000.0 + frame["total_reward"].to_numpy(dtype=np.float64)
+    return np.empty(0)
+
+
+def create_rolling_chart(table, window):
+    """Rolling risk metrics as three stacked panels (downsampled)."""
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+
+    fig = make_subplots(
+        rows=3,
+        cols=1,
+        shared_xaxes=True,
+        vertical_spacing=0.06,
+        subplot_titles=("Sharpe / Sortino", "Volatility / VaR / CVaR (%)", "Drawdown from window high (%)"),
+    )
+    panels = [
+        (1, "sharpe_ratio", "Sharpe", "#00d9ff"),
+        (1, "sortino_ratio", "Sortino", "#7b68ee"),
+        (2, "volatility_pct", "Volatility (ann.)", "#ffc107"),
+        (2, "var_pct", "VaR 95%", "#ff6b35"),
+        (2, "cvar_pct", "CVaR 95%", "#dc3545"),
+        (3, "drawdown_pct", "Drawdown", "#ff6b9d"),
+    ]
+
+    # Warm-up rows (incomplete windows) are NaN
+    valid = table.iloc[window - 1:]
+    x = valid.index.to_numpy()
+    for row, column, name, color in panels:
+        xs, ys = downsample(x, valid[column].to_numpy(), DEFAULT_MAX_POINTS)
+        fig.add_trace(go.Scatter(x=xs, y=ys, mode="lines", name=name, line=dict(color=color, width=1.5)), row=row, col=1)
+
+    fig.update_layout(
+        paper_bgcolor="rgba(0,0,0,0)",
+        plot_bgcolor="rgba(0,0,0,0)",
+        font=dict(color="#fff"),
+        hovermode="x unified",
+        height=650,
+        margin=dict(l=40, r=20, t=40, b=30),
+        legend=dict(orientation="h", y=-0.08),
+    )
+    fig.update_xaxes(title_text="Checkpoints", row=3, col=1)
+    return fig
+
+
+@callback(
+    Output("risk-metrics-content", "children"),
+    [Input("session-data", "data"), Input("rolling-window", "value")],
+)
+def update_rolling_metrics(session, window):
+    """Rolling risk metrics of the dataset opened on the Home page."""
+    from utils.library import load_dataset
+    from utils.rolling import rolling_risk_metrics
+
+    dataset_id = (session or {}).get("dataset_id")
+    if not dataset_id:
+        return html.P("Upload a dataset on the Home page to see rolling metrics.", className="text-muted mb-0")
+
+    dataset = load_dataset(dataset_id, columns=["balance", "total_reward"])
+    if dataset is None:
+        return dbc.Alert("The dataset is no longer cached. Upload it again.", color="warning")
+
+    window = int(window or 250)
+    balance = _balance_of(dataset.frame)
+    if len(balance) < window:
+        return html.P(f"Need at least {window} checkpoints (have {len(balance)}).", className="text-muted mb-0")
+
+    table = rolling_risk_metrics(balance, window)
+    return dcc.Graph(figure=create_rolling_chart(table, window), config={"displayModeBar": False})
+
+
+def create_distribution_chart(dist):
+    """Histogram + KDE of returns from pre-binned server-side data."""
+    import plotly.graph_objects as go
+
+    # Density -> expected count per bin (in-range checkpoints only)
+    scale = (dist["n"] - dist["outliers"]) * dist["bin_width"]
+    fig = go.Figure()
+    fig.add_trace(
+        go.Bar(
+            x=dist["bin_centers"],
+            y=dist["counts"],
+            width=dist["bin_width"],
+            name="Returns",
+            marker=dict(color="rgba(0, 217, 255, 0.55)"),
+        )
+    )
+    fig.add_trace(
+        go.Scatter(
+            x=dist["kde_x"],
+            y=[y * scale for y in dist["kde_y"]],
+            mode="lines",
+            name="KDE",
+            line=dict(color="#7b68ee", width=2),
+        )
+    )
+    level = int(dist["confidence"] * 100)
+    fig.add_vline(x=dist["var_pct"], line=dict(color="#ff6b35", dash="dash"), annotation_text=f"VaR {level}%")
+    fig.add_vline(x=dist["cvar_pct"], line=dict(color="#dc3545", dash="dot"), annotation_text=f"CVaR {level}%")
+
+    fig.update_layout(
+        paper_bgcolor="rgba(0,0,0,0)",
+        plot_bgcolor="rgba(0,0,0,0)",
+        font=dict(color="#fff"),
+        xaxis_title="Return per checkpoint (%)",
+        yaxis_title="Checkpoints",
+        bargap=0,
+        height=420,
+        margin=dict(l=40, r=20, t=30, b=40),
+        legend=dict(orientation="h", y=1.08),
+    )
+    return fig
+
+
+def _stat(label, value):
+    return dbc.Col(
+        [html.Small(label, className="text-muted d-block"), html.Strong(value)],
+        xs=6,
+        md=2,
+        className="mb-2",
+    )
+
+
+@callback(
+    Output("returns-distribution-chart", "children"),
+    Input("session-data", "data"),
+)
+def update_returns_distribution(session):
+    """Returns distribution and tail statistics of the dataset opened on Home."""
+    from utils.distribution import returns_distribution
+    from utils.library import load_dataset
+    from utils.metrics import MetricsKernel
+
+    dataset_id = (session or {}).get("dataset_id")
+    if not dataset_id:
+        return html.P("Upload a dataset on the Home page to see the returns distribution.", className="text-muted mb-0")
+
+    dataset = load_dataset(dataset_id, columns=["balance", "total_reward"])
+    if dataset is None:
+        return dbc.Alert("The dataset is no longer cached. Upload it again.", color="warning")
+
+    dist = returns_distribution(MetricsKernel(_balance_of(dataset.frame)))
+    if not dist:
+        return html.P("Not enough checkpoints for a distribution.", className="text-muted mb-0")
+
+    level = int(dist["confidence"] * 100)
+    stats_row = dbc.Row(
+        [
+            _stat("Mean", f"{dist['mean_pct']:.3f}%"),
+            _stat("Std dev", f"{dist['std_pct']:.3f}%"),
+            _stat("Skewness", f"{dist['skewness']:.2f}"),
+            _stat("Excess kurtosis", f"{dist['kurtosis']:.2f}"),
+            _stat(f"VaR {level}%", f"{dist['var_pct']:.3f}%"),
+            _stat(f"CVaR {level}%", f"{dist['cvar_pct']:.3f}%"),
+        ],
+        className="mb-2",
+    )
+    children = [stats_row, dcc.Graph(figure=create_distribution_chart(dist), config={"displayModeBar": False})]
+    if dist["outliers"]:
+        children.append(
+            html.Small(f"{dist['outliers']:,} extreme returns outside the plotted range.", className="text-muted")
+        )
+    return children
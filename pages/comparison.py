@@ -3,9 +3,55 @@
 Compare multiple agents/strategies side-by-side
 """
 
-from dash import dcc, html
+import numpy as np
+from dash import dcc, html, Input, Output, State, callback
 import dash_bootstrap_components as dbc
 
+from utils.downsampling import downsample
+from utils.jobs import background_callback
+from utils.profiling import instrument
+
+
+# Curves drawn on the overlay chart (best-ranked first)
+MAX_OVERLAY_AGENTS = 10
+OVERLAY_POINTS_PER_TRACE = 500
+
+TABLE_COLUMNS = {
+    "rank": "#",
+    "agent": "Agent",
+    "roi_percent": "ROI %",
+    "sharpe_ratio": "Sharpe",
+    "sortino_ratio": "Sortino",
+    "max_drawdown_pct": "Max DD %",
+    "calmar_ratio": "Calmar",
+    "profit_factor": "Profit Factor",
+    "var_95": "VaR 95%",
+    "cvar_95": "CVaR 95%",
+    "checkpoints": "Checkpoints",
+}
+
+# Library leaderboard: indexed catalog columns (higher is better for all)
+LEADERBOARD_SORTS = {
+    "sharpe_ratio": "Sharpe",
+    "sortino_ratio": "Sortino",
+    "roi_percent": "ROI %",
+    "calmar_ratio": "Calmar",
+    "max_drawdown_pct": "Max DD % (smallest)",
+}
+LEADERBOARD_COLUMNS = {
+    "rank": "#",
+    "agent_name": "Agent",
+    "algorithm": "Algorithm",
+    "roi_percent": "ROI %",
+    "sharpe_ratio": "Sharpe",
+    "sortino_ratio": "Sortino",
+    "max_drawdown_pct": "Max DD %",
+    "calmar_ratio": "Calmar",
+    "ftmo_compliant": "FTMO",
+    "rows": "Checkpoints",
+}
+LEADERBOARD_SIZE = 50
+
 
 def layout():
     """Comparison page layout."""
@@ -53,6 +99,15 @@ def layout():
                                             },
                                             multiple=True,
                                         ),
+                                        # Background job progress (parsing runs outside the web worker)
+                                        dbc.Progress(
+                                            id="comparison-progress",
+                                            value=0,
+                                            striped=True,
+                                            animated=True,
+                                            className="mt-3",
+                                            style={"display": "none"},
+                                        ),
                                     ],
                                 ),
                             ],
@@ -62,7 +117,158 @@ def layout():
                 ],
             ),
             # Comparison results
-            html.Div(id="comparison-results"),
+            dcc.Loading(html.Div(id="comparison-results"), type="circle"),
+            # Leaderboard over every agent stored in the local library
+            dbc.Card(
+                [
+                    dbc.CardHeader(html.H5("Library Leaderboard", className="mb-0")),
+                    dbc.CardBody(
+                        [
+                            dbc.Row(
+                                [
+                                    dbc.Col(
+                                        dcc.Dropdown(
+                                            id="leaderboard-sort",
+                                            options=[{"label": v, "value": k} for k, v in LEADERBOARD_SORTS.items()],
+                                            value="sharpe_ratio",
+                                            clearable=False,
+                                        ),
+                                        md=4,
+                                    ),
+                                    dbc.Col(
+                                        dbc.Input(id="leaderboard-search", placeholder="Filter by agent name", debounce=True),
+                                        md=5,
+                                    ),
+                                    dbc.Col(
+                                        dbc.Switch(id="leaderboard-ftmo", label="FTMO compliant only", value=False),
+                                        md=3,
+                                    ),
+                                ],
+                                className="mb-3 align-items-center",
+                            ),
+                            html.Div(id="leaderboard-table"),
+                        ],
+                    ),
+                ],
+                className="shadow-sm mt-3",
+            ),
         ],
         fluid=True,
     )
+
+
+def create_overlay_chart(names, balances, table):
+    """Overlay the equity curves of the best-ranked agents (downsampled)."""
+    import plotly.graph_objects as go
+
+    fig = go.Figure()
+    index = {name: i for i, name in enumerate(names)}
+
+    for name in table["agent"].head(MAX_OVERLAY_AGENTS):
+        balance = balances[index[name]]
+        x, y = downsample(np.arange(len(balance)), balance, OVERLAY_POINTS_PER_TRACE)
+        fig.add_trace(go.Scatter(x=x, y=y, mode="lines", name=name))
+
+    fig.update_layout(
+        title=f"Equity Curves (top {min(MAX_OVERLAY_AGENTS, len(table))})",
+        paper_bgcolor="rgba(0,0,0,0)",
+        plot_bgcolor="rgba(0,0,0,0)",
+        font=dict(color="#fff"),
+        xaxis_title="Checkpoints",
+        yaxis_title="Balance ($)",
+        hovermode="x unified",
+        height=500,
+    )
+    return fig
+
+
+@background_callback(
+    Output("comparison-results", "children"),
+    Input("upload-comparison", "contents"),
+    State("upload-comparison", "filename"),
+    progress=[Output("comparison-progress", "value"), Output("comparison-progress", "label")],
+    running=[
+        (Output("comparison-progress", "style"), {"display": "flex"}, {"display": "none"}),
+        (Output("upload-comparison", "disabled"), True, False),
+    ],
+    prevent_initial_call=True,
+)
+@instrument("update_comparison")
+def update_comparison(set_progress, contents_list, filenames):
+    """Parse all uploaded agents and render the ranked comparison (background job)."""
+    from utils.comparison import compare_metrics, parse_agents
+
+    if not contents_list:
+        return None
+
+    def report(parsed, total):
+        set_progress((int(90 * parsed / total), f"Parsed {parsed}/{total} agents"))
+
+    names, balances, errors = parse_agents(contents_list, filenames, progress=report)
+    set_progress((95, "Computing metrics..."))
+    children = []
+
+    if errors:
+        children.append(
+            dbc.Alert(
+                [html.Strong("Skipped: "), ", ".join(f"{f} ({e})" for f, e in errors.items())],
+                color="warning",
+            )
+        )
+    if not balances:
+        return children
+
+    # Same agent name uploaded twice: keep both, distinguish them
+    seen = {}
+    for i, name in enumerate(names):
+        seen[name] = seen.get(name, 0) + 1
+        if seen[name] > 1:
+            names[i] = f"{name} ({seen[name]})"
+
+    table = compare_metrics(names, balances)
+    display = table[list(TABLE_COLUMNS)].rename(columns=TABLE_COLUMNS).round(2)
+
+    children += [
+        dbc.Card(
+            dbc.CardBody(dcc.Graph(figure=create_overlay_chart(names, balances, table))),
+            className="shadow-sm mb-3",
+        ),
+        dbc.Card(
+            [
+                dbc.CardHeader(html.H5(f"Ranking ({len(table)} agents, by Sharpe)", className="mb-0")),
+                dbc.CardBody(
+                    dbc.Table.from_dataframe(display, striped=True, hover=True, responsive=True, size="sm"),
+                ),
+            ],
+            className="shadow-sm",
+        ),
+    ]
+    return children
+
+
+@callback(
+    Output("leaderboard-table", "children"),
+    [
+        Input("leaderboard-sort", "value"),
+        Input("leaderboard-search", "value"),
+        Input("leaderboard-ftmo", "value"),
+    ],
+)
+def update_leaderboard(sort_by, search, ftmo_only):
+    """Rank library agents from the precomputed summary index."""
+    import pandas as pd
+    from utils.library import get_library
+
+    entries = get_library().leaderboard(
+        order_by=sort_by or "sharpe_ratio",
+        limit=LEADERBOARD_SIZE,
+        search=search,
+        ftmo_only=bool(ftmo_only),
+    )
+    if not entries:
+        return html.P("No stored agents match these filters.", className="text-muted mb-0")
+
+    table = pd.DataFrame(entries)[list(LEADERBOARD_COLUMNS)]
+    table["ftmo_compliant"] = table["ftmo_compliant"].map({1: "✅", 0: "❌"}).fillna("—")
+    display = table.rename(columns=LEADERBOARD_COLUMNS).round(2)
+    return dbc.Table.from_dataframe(display, striped=True, hover=True, responsive=True, size="sm")
@@ -4,12 +4,19 @@ Design 2025 : Glassmorphism, Animations, Typographie Moderne
 100% Français | Inspired by Linear, Vercel, Stripe
 """
 
-from typing import Optional, List, Dict
-import pandas as pd
-import plotly.graph_objects as go
-from dash import dcc, html, Input, Output, State, callback
+from typing import TYPE_CHECKING, Optional, List, Dict
+from dash import dcc, html, Input, Output, State, MATCH, callback
 import dash_bootstrap_components as dbc
 
+from utils.downsampling import DEFAULT_MAX_POINTS, downsample
+from utils.jobs import background_callback
+from utils.profiling import instrument, timed
+
+if TYPE_CHECKING:
+    # pandas / plotly.graph_objects : importés à la première figure, pas au démarrage
+    import pandas as pd
+    import plotly.graph_objects as go
+
 # ============================================
 # 🎨 PALETTE MODERNE
 # ============================================
@@ -105,7 +112,8 @@ def layout():
                                                                 dbc.Badge("ZIP", pill=True, color="info", className="me-3 px-4 py-2", style={'fontSize': '1.1rem'}),
                                                                 dbc.Badge("JSON", pill=True, color="success", className="me-3 px-4 py-2", style={'fontSize': '1.1rem'}),
                                                                 dbc.Badge("CSV", pill=True, color="warning", className="me-3 px-4 py-2", style={'fontSize': '1.1rem'}),
-                                                                dbc.Badge("XLSX", pill=True, color="danger", className="px-4 py-2", style={'fontSize': '1.1rem'}),
+                                                                dbc.Badge("XLSX", pill=True, color="danger", className="me-3 px-4 py-2", style={'fontSize': '1.1rem'}),
+                                                                dbc.Badge("PARQUET", pill=True, color="primary", className="px-4 py-2", style={'fontSize': '1.1rem'}),
                                                             ],
                                                             className="d-flex justify-content-center flex-wrap mt-4",
                                                         ),
@@ -114,6 +122,15 @@ def layout():
                                                 ),
                                                 multiple=False,
                                             ),
+                                            # Avancement du traitement en arrière-plan
+                                            dbc.Progress(
+                                                id="upload-progress",
+                                                value=0,
+                                                striped=True,
+                                                animated=True,
+                                                className="mt-4",
+                                                style={'display': 'none', 'height': '1.5rem'},
+                                            ),
                                         ],
                                         className="p-5",
                                     ),
@@ -128,11 +145,58 @@ def layout():
                 ],
             ),
             # ============================================
+            # 📚 BIBLIOTHÈQUE LOCALE
+            # ============================================
+            dbc.Row(
+                [
+                    dbc.Col(
+                        [
+                            dbc.Card(
+                                [
+                                    dbc.CardHeader(
+                                        html.Div(
+                                            [
+                                                html.I(className="fas fa-book fa-lg me-3", style={'color': COLORS['violet']}),
+                                                html.Span("Bibliothèque d'Agents", style={'fontSize': '1.2rem', 'fontWeight': '800'}),
+                                            ],
+                                            className="d-flex align-items-center",
+                                        ),
+                                    ),
+                                    dbc.CardBody(
+                                        [
+                                            dbc.Input(
+                                                id="library-search",
+                                                placeholder="Filtrer par nom d'agent...",
+                                                type="text",
+                                                debounce=True,
+                                                className="mb-3",
+                                            ),
+                                            dcc.Dropdown(
+                                                id="library-select",
+                                                placeholder="Ouvrir un agent enregistré",
+                                                clearable=True,
+                                            ),
+                                        ],
+                                    ),
+                                ],
+                                className="glass-effect",
+                            ),
+                        ],
+                        lg=10,
+                        xl=8,
+                        className="mx-auto",
+                    ),
+                ],
+            ),
+            # ============================================
             # 🎯 CONTENU DYNAMIQUE
             # ============================================
             html.Div(id="dashboard-content", className="mt-5"),
             # Storage
             dcc.Store(id="stored-data"),
+            dcc.Store(id="analysis-data"),
+            # Ce que le mode live a déjà rendu (mises à jour partielles)
+            dcc.Store(id="live-render"),
         ],
     )
 
@@ -218,16 +282,27 @@ def create_metric_card(label, value, icon, color, description=""):
 # ============================================
 
 
-def create_modern_equity_chart(df: pd.DataFrame) -> go.Figure:
-    """Equity curve avec gradient et glassmorphism"""
-    fig = go.Figure()
-
+def _equity_points(df: "pd.DataFrame", x_range: Optional[tuple] = None, max_points: int = DEFAULT_MAX_POINTS):
+    """Points de la courbe d'équité (au plus ~max_points, extrêmes de drawdown conservés)"""
     balance_col = 'balance' if 'balance' in df.columns else 'total_reward'
+    return downsample(df.index.to_numpy(), df[balance_col].to_numpy(), max_points, x_range=x_range)
+
+
+def create_modern_equity_chart(
+    df: "pd.DataFrame",
+    x_range: Optional[tuple] = None,
+    max_points: int = DEFAULT_MAX_POINTS,
+) -> "go.Figure":
+    """Equity curve avec gradient et glassmorphism (sous-échantillonnée LTTB)"""
+    import plotly.graph_objects as go
+
+    fig = go.Figure()
+    x, y = _equity_points(df, x_range, max_points)
 
     fig.add_trace(
         go.Scatter(
-            x=df.index,
-            y=df[balance_col],
+            x=x,
+            y=y,
             mode='lines',
             name='Balance',
             line=dict(color=COLORS['cyan'], width=4),
@@ -268,8 +343,12 @@ def create_modern_equity_chart(df: pd.DataFrame) -> go.Figure:
         ),
         margin=dict(l=60, r=40, t=100, b=60),
         height=500,
+        uirevision='equity',
     )
 
+    if x_range is not None:
+        fig.update_xaxes(range=list(x_range))
+
     return fig
 
 
@@ -278,8 +357,17 @@ def create_modern_equity_chart(df: pd.DataFrame) -> go.Figure:
 # ============================================
 
 
-def create_winloss_donut(metrics: Dict) -> go.Figure:
+def _winrate_label(winning: int, losing: int) -> str:
+    """Texte central du donut"""
+    total_trades = winning + losing
+    win_rate = (winning / total_trades * 100) if total_trades > 0 else 0
+    return f"<b style='font-size:36px'>{win_rate:.1f}%</b><br><span style='font-size:16px;opacity:0.7'>Win Rate</span>"
+
+
+def create_winloss_donut(metrics: Dict) -> "go.Figure":
     """Donut chart moderne"""
+    import plotly.graph_objects as go
+
     winning = metrics.get("winning_trades", 0)
     losing = metrics.get("losing_trades", 0)
 
@@ -299,11 +387,8 @@ def create_winloss_donut(metrics: Dict) -> go.Figure:
         ]
     )
 
-    total_trades = winning + losing
-    win_rate = (winning / total_trades * 100) if total_trades > 0 else 0
-
     fig.add_annotation(
-        text=f"<b style='font-size:36px'>{win_rate:.1f}%</b><br><span style='font-size:16px;opacity:0.7'>Win Rate</span>",
+        text=_winrate_label(winning, losing),
         x=0.5,
         y=0.5,
         font=dict(size=18, family='Inter', color='#fff'),
@@ -336,298 +421,533 @@ def create_winloss_donut(metrics: Dict) -> go.Figure:
     return fig
 
 
+# ============================================
+# 🗃️ FIGURES EN CACHE
+# ============================================
+
+
+def cached_figure(dataset_id: str, kind: str, build, **level) -> Dict:
+    """
+    Figure sérialisée en cache (clé : dataset, type, niveau de sous-échantillonnage).
+
+    Un hit renvoie directement le dict JSON : aucun go.Figure n'est
+    reconstruit ni revalidé.
+    """
+    from utils.cache import FigureCache, get_figure_cache
+
+    return get_figure_cache().get_or_build(FigureCache.make_key(dataset_id, kind, **level), build)
+
+
+def cached_equity_chart(dataset_id: str, max_points: int = DEFAULT_MAX_POINTS) -> Optional[Dict]:
+    """Courbe d'équité complète en cache (dataset lu seulement au premier appel)"""
+    from utils.library import load_dataset
+
+    def build():
+        # Seules les colonnes du graphique sont lues (Parquet)
+        dataset = load_dataset(dataset_id, columns=["balance", "total_reward"])
+        if dataset is None:
+            raise LookupError(dataset_id)
+        return create_modern_equity_chart(dataset.frame, max_points=max_points)
+
+    try:
+        return cached_figure(dataset_id, "equity", build, max_points=max_points)
+    except LookupError:
+        return None
+
+
 # ============================================
 # 🎯 DASHBOARD COMPLET
 # ============================================
 
 
-def create_dashboard_content(metrics: Dict, df: pd.DataFrame):
-    """Contenu complet du dashboard moderne"""
+def _interval_subtitle(metrics: Dict, key: str, default: str, absolute: bool = False) -> str:
+    """Intervalle de confiance bootstrap sous la valeur (si calculé)"""
+    interval = metrics.get('confidence_intervals', {}).get(key)
+    if not interval:
+        return default
+    low, high = interval
+    if absolute:
+        low, high = sorted((abs(low), abs(high)))
+    unit = "%" if absolute else ""
+    return f"IC 95 % : {low:.2f}{unit} – {high:.2f}{unit}"
 
-    return html.Div(
+
+def _breach_probability(metrics: Dict, key: str):
+    """Probabilité de dépassement simulée (Monte Carlo), si calculée"""
+    simulation = metrics.get('ftmo_breach_probabilities') or {}
+    if key not in simulation:
+        return None
+    return html.P(
+        f"Risque simulé : {simulation[key] * 100:.1f} % ({simulation['paths']:,} trajectoires)",
+        className="mb-0 mt-2 small",
+        style={'opacity': '0.8'},
+    )
+
+
+# ============================================
+# 🌟 HERO METRICS (Top 3)
+# ============================================
+
+
+def create_hero_section(metrics: Dict):
+    """Cartes hero : rendement, Sharpe et drawdown (avec IC si calculés)"""
+    return dbc.Row(
         [
-            # ============================================
-            # 🌟 HERO METRICS (Top 3)
-            # ============================================
-            dbc.Row(
+            create_hero_metric(
+                icon="fas fa-chart-line",
+                label="Rendement Total",
+                value=f"{metrics.get('roi_percent', 0):+.2f}%",
+                subtitle=f"P&L: ${metrics.get('total_pnl', 0):,.2f}",
+                color=COLORS['cyan'],
+                glow_class="cyan",
+            ),
+            create_hero_metric(
+                icon="fas fa-trophy",
+                label="Sharpe Ratio",
+                value=f"{metrics.get('sharpe_ratio', 0):.2f}",
+                subtitle=_interval_subtitle(metrics, 'sharpe_ratio', "Performance / Risque"),
+                color=COLORS['orange'],
+                glow_class="orange",
+            ),
+            create_hero_metric(
+                icon="fas fa-shield-alt",
+                label="Max Drawdown",
+                value=f"{abs(metrics.get('max_drawdown_pct', 0)):.2f}%",
+                subtitle=_interval_subtitle(metrics, 'max_drawdown_pct', "Perte Maximale", absolute=True),
+                color=COLORS['violet'],
+                glow_class="violet",
+            ),
+        ],
+        className="mb-5",
+    )
+
+
+# ============================================
+# 📊 GRAPHIQUES PRINCIPAUX
+# ============================================
+
+
+def create_charts_section(equity_figure, donut_figure, dataset_id: Optional[str] = None):
+    """Courbe d'équité (zoomable) et donut gains/pertes (go.Figure ou dict en cache)"""
+    return dbc.Row(
+        [
+            dbc.Col(
                 [
-                    create_hero_metric(
-                        icon="fas fa-chart-line",
-                        label="Rendement Total",
-                        value=f"{metrics.get('roi_percent', 0):+.2f}%",
-                        subtitle=f"P&L: ${metrics.get('total_pnl', 0):,.2f}",
-                        color=COLORS['cyan'],
-                        glow_class="cyan",
-                    ),
-                    create_hero_metric(
-                        icon="fas fa-trophy",
-                        label="Sharpe Ratio",
-                        value=f"{metrics.get('sharpe_ratio', 0):.2f}",
-                        subtitle="Performance / Risque",
-                        color=COLORS['orange'],
-                        glow_class="orange",
-                    ),
-                    create_hero_metric(
-                        icon="fas fa-shield-alt",
-                        label="Max Drawdown",
-                        value=f"{abs(metrics.get('max_drawdown_pct', 0)):.2f}%",
-                        subtitle="Perte Maximale",
-                        color=COLORS['violet'],
-                        glow_class="violet",
+                    dbc.Card(
+                        dbc.CardBody(
+                            [
+                                dcc.Graph(
+                                    id="equity-graph",
+                                    figure=equity_figure,
+                                    config={'displayModeBar': False},
+                                ),
+                                # Source du zoom détaillé (None en mode live)
+                                dcc.Store(id="equity-source", data=dataset_id),
+                            ],
+                            className="p-4",
+                        ),
+                        className="glass-effect",
                     ),
                 ],
-                className="mb-5",
+                lg=8,
+                className="mb-4",
             ),
-            # ============================================
-            # 📊 GRAPHIQUES PRINCIPAUX
-            # ============================================
-            dbc.Row(
+            dbc.Col(
                 [
-                    dbc.Col(
-                        [
-                            dbc.Card(
-                                dbc.CardBody(
-                                    dcc.Graph(figure=create_modern_equity_chart(df), config={'displayModeBar': False}),
-                                    className="p-4",
-                                ),
-                                className="glass-effect",
-                            ),
-                        ],
-                        lg=8,
-                        className="mb-4",
-                    ),
-                    dbc.Col(
-                        [
-                            dbc.Card(
-                                dbc.CardBody(
-                                    dcc.Graph(figure=create_winloss_donut(metrics), config={'displayModeBar': False}),
-                                    className="p-4",
-                                ),
-                                className="glass-effect",
-                            ),
-                        ],
-                        lg=4,
-                        className="mb-4",
+                    dbc.Card(
+                        dbc.CardBody(
+                            [dcc.Graph(figure=donut_figure, config={'displayModeBar': False})],
+                            className="p-4",
+                        ),
+                        className="glass-effect",
                     ),
                 ],
+                lg=4,
+                className="mb-4",
             ),
-            # ============================================
-            # 💼 PERFORMANCE
-            # ============================================
-            html.Div(
+        ],
+    )
+
+
+# ============================================
+# 💼 PERFORMANCE
+# ============================================
+
+
+def create_performance_section(metrics: Dict):
+    """Section performance"""
+    return html.Div(
+        [
+            html.H3(
+                [html.I(className="fas fa-chart-bar me-3"), "Performance"],
+                className="mb-4 text-gradient-cyan",
+                style={'fontSize': '2.2rem', 'fontWeight': '900'},
+            ),
+            dbc.Row(
                 [
-                    html.H3(
-                        [html.I(className="fas fa-chart-bar me-3"), "Performance"],
-                        className="mb-4 text-gradient-cyan",
-                        style={'fontSize': '2.2rem', 'fontWeight': '900'},
-                    ),
-                    dbc.Row(
-                        [
-                            create_metric_card("Profit Factor", f"{metrics.get('profit_factor', 0):.2f}", "fas fa-balance-scale", COLORS['cyan'], "Gains / Pertes"),
-                            create_metric_card("Espérance", f"${metrics.get('expectancy', 0):.2f}", "fas fa-dollar-sign", COLORS['green'], "Profit par trade"),
-                            create_metric_card("CAGR", f"{metrics.get('cagr', 0):.2f}%", "fas fa-percent", COLORS['blue'], "Croissance annuelle"),
-                            create_metric_card("Balance Finale", f"${metrics.get('final_balance', 0):,.0f}", "fas fa-wallet", COLORS['orange'], "Solde actuel"),
-                        ],
-                    ),
+                    create_metric_card("Profit Factor", f"{metrics.get('profit_factor', 0):.2f}", "fas fa-balance-scale", COLORS['cyan'], "Gains / Pertes"),
+                    create_metric_card("Espérance", f"${metrics.get('expectancy', 0):.2f}", "fas fa-dollar-sign", COLORS['green'], "Profit par trade"),
+                    create_metric_card("CAGR", f"{metrics.get('cagr', 0):.2f}%", "fas fa-percent", COLORS['blue'], "Croissance annuelle"),
+                    create_metric_card("Balance Finale", f"${metrics.get('final_balance', 0):,.0f}", "fas fa-wallet", COLORS['orange'], "Solde actuel"),
                 ],
-                className="mb-5",
             ),
-            # ============================================
-            # 🛡️ GESTION DU RISQUE
-            # ============================================
-            html.Div(
+        ],
+        className="mb-5",
+    )
+
+
+# ============================================
+# 🛡️ GESTION DU RISQUE
+# ============================================
+
+
+def create_risk_section(metrics: Dict):
+    """Section gestion du risque"""
+    return html.Div(
+        [
+            html.H3(
+                [html.I(className="fas fa-shield-alt me-3"), "Gestion du Risque"],
+                className="mb-4 text-gradient-orange",
+                style={'fontSize': '2.2rem', 'fontWeight': '900'},
+            ),
+            dbc.Row(
                 [
-                    html.H3(
-                        [html.I(className="fas fa-shield-alt me-3"), "Gestion du Risque"],
-                        className="mb-4 text-gradient-orange",
-                        style={'fontSize': '2.2rem', 'fontWeight': '900'},
-                    ),
-                    dbc.Row(
-                        [
-                            create_metric_card("Sortino Ratio", f"{metrics.get('sortino_ratio', 0):.2f}", "fas fa-chart-area", COLORS['violet'], "Risque baissier"),
-                            create_metric_card("Calmar Ratio", f"{metrics.get('calmar_ratio', 0):.2f}", "fas fa-signal", COLORS['pink'], "CAGR / Max DD"),
-                            create_metric_card("VaR 95%", f"{metrics.get('var_95', 0):.2f}%", "fas fa-exclamation-triangle", COLORS['yellow'], "Value at Risk"),
-                            create_metric_card("CVaR 95%", f"{metrics.get('cvar_95', 0):.2f}%", "fas fa-shield-virus", COLORS['red'], "Risque de queue"),
-                        ],
-                    ),
+                    create_metric_card("Sortino Ratio", f"{metrics.get('sortino_ratio', 0):.2f}", "fas fa-chart-area", COLORS['violet'], "Risque baissier"),
+                    create_metric_card("Calmar Ratio", f"{metrics.get('calmar_ratio', 0):.2f}", "fas fa-signal", COLORS['pink'], "CAGR / Max DD"),
+                    create_metric_card("VaR 95%", f"{metrics.get('var_95', 0):.2f}%", "fas fa-exclamation-triangle", COLORS['yellow'], "Value at Risk"),
+                    create_metric_card("CVaR 95%", f"{metrics.get('cvar_95', 0):.2f}%", "fas fa-shield-virus", COLORS['red'], "Risque de queue"),
                 ],
-                className="mb-5",
             ),
-            # ============================================
-            # 📈 STATISTIQUES TRADING
-            # ============================================
-            html.Div(
+        ],
+        className="mb-5",
+    )
+
+
+# ============================================
+# 📈 STATISTIQUES TRADING
+# ============================================
+
+
+def create_trading_section(metrics: Dict):
+    """Section statistiques de trading"""
+    return html.Div(
+        [
+            html.H3(
+                [html.I(className="fas fa-exchange-alt me-3"), "Statistiques de Trading"],
+                className="mb-4 text-gradient-violet",
+                style={'fontSize': '2.2rem', 'fontWeight': '900'},
+            ),
+            dbc.Row(
                 [
-                    html.H3(
-                        [html.I(className="fas fa-exchange-alt me-3"), "Statistiques de Trading"],
-                        className="mb-4 text-gradient-violet",
-                        style={'fontSize': '2.2rem', 'fontWeight': '900'},
-                    ),
-                    dbc.Row(
-                        [
-                            create_metric_card("Total Trades", f"{metrics.get('total_trades', 0)}", "fas fa-list-ol", COLORS['cyan'], "Positions totales"),
-                            create_metric_card("Win Rate", f"{metrics.get('win_rate', 0):.1f}%", "fas fa-percentage", COLORS['green'], "Taux de réussite"),
-                            create_metric_card("Gain Moyen", f"${metrics.get('avg_win', 0):,.2f}", "fas fa-arrow-up", COLORS['green'], "Par trade gagnant"),
-                            create_metric_card("Perte Moyenne", f"${abs(metrics.get('avg_loss', 0)):,.2f}", "fas fa-arrow-down", COLORS['red'], "Par trade perdant"),
-                            create_metric_card("Meilleur Trade", f"${metrics.get('best_trade', 0):,.2f}", "fas fa-star", COLORS['yellow'], "Plus gros gain"),
-                            create_metric_card("Pire Trade", f"${abs(metrics.get('worst_trade', 0)):,.2f}", "fas fa-skull", COLORS['red'], "Plus grosse perte"),
-                            create_metric_card("Ratio W/L", f"{metrics.get('win_loss_ratio', 0):.2f}", "fas fa-divide", COLORS['blue'], "Gain / Perte"),
-                            create_metric_card("Durée Moy", f"{metrics.get('avg_trade_duration_hours', 0):.1f}h", "fas fa-clock", COLORS['violet'], "Par position"),
-                        ],
-                    ),
+                    create_metric_card("Total Trades", f"{metrics.get('total_trades', 0)}", "fas fa-list-ol", COLORS['cyan'], "Positions totales"),
+                    create_metric_card("Win Rate", f"{metrics.get('win_rate', 0):.1f}%", "fas fa-percentage", COLORS['green'], "Taux de réussite"),
+                    create_metric_card("Gain Moyen", f"${metrics.get('avg_win', 0):,.2f}", "fas fa-arrow-up", COLORS['green'], "Par trade gagnant"),
+                    create_metric_card("Perte Moyenne", f"${abs(metrics.get('avg_loss', 0)):,.2f}", "fas fa-arrow-down", COLORS['red'], "Par trade perdant"),
+                    create_metric_card("Meilleur Trade", f"${metrics.get('best_trade', 0):,.2f}", "fas fa-star", COLORS['yellow'], "Plus gros gain"),
+                    create_metric_card("Pire Trade", f"${abs(metrics.get('worst_trade', 0)):,.2f}", "fas fa-skull", COLORS['red'], "Plus grosse perte"),
+                    create_metric_card("Ratio W/L", f"{metrics.get('win_loss_ratio', 0):.2f}", "fas fa-divide", COLORS['blue'], "Gain / Perte"),
+                    create_metric_card("Durée Moy", f"{metrics.get('avg_trade_duration_hours', 0):.1f}h", "fas fa-clock", COLORS['violet'], "Par position"),
                 ],
-                className="mb-5",
             ),
-            # ============================================
-            # 💎 MÉTRIQUES AVANCÉES
-            # ============================================
-            html.Div(
+        ],
+        className="mb-5",
+    )
+
+
+# ============================================
+# 💎 MÉTRIQUES AVANCÉES
+# ============================================
+
+
+def create_advanced_section(metrics: Dict):
+    """Section métriques avancées"""
+    return html.Div(
+        [
+            html.H3(
+                [html.I(className="fas fa-gem me-3"), "Métriques Avancées"],
+                className="mb-4",
+                style={
+                    'fontSize': '2.2rem',
+                    'fontWeight': '900',
+                    'background': 'linear-gradient(135deg, #00d9ff, #ff6b35, #7b68ee)',
+                    '-webkit-background-clip': 'text',
+                    '-webkit-text-fill-color': 'transparent',
+                    'backgroundClip': 'text',
+                },
+            ),
+            dbc.Row(
                 [
-                    html.H3(
-                        [html.I(className="fas fa-gem me-3"), "Métriques Avancées"],
-                        className="mb-4",
-                        style={
-                            'fontSize': '2.2rem',
-                            'fontWeight': '900',
-                            'background': 'linear-gradient(135deg, #00d9ff, #ff6b35, #7b68ee)',
-                            '-webkit-background-clip': 'text',
-                            '-webkit-text-fill-color': 'transparent',
-                            'backgroundClip': 'text',
-                        },
-                    ),
-                    dbc.Row(
-                        [
-                            create_metric_card("Recovery Factor", f"{metrics.get('recovery_factor', 0):.2f}", "fas fa-heartbeat", COLORS['green'], "Profit / Max DD"),
-                            create_metric_card("Ulcer Index", f"{metrics.get('ulcer_index', 0):.2f}", "fas fa-wave-square", COLORS['orange'], "Volatilité DD"),
-                            create_metric_card("Pain Index", f"{metrics.get('pain_index', 0):.2f}", "fas fa-thermometer-half", COLORS['pink'], "Intensité DD"),
-                            create_metric_card("Kelly Criterion", f"{metrics.get('kelly_criterion', 0):.1f}%", "fas fa-bullseye", COLORS['cyan'], "Position optimale"),
-                        ],
-                    ),
+                    create_metric_card("Recovery Factor", f"{metrics.get('recovery_factor', 0):.2f}", "fas fa-heartbeat", COLORS['green'], "Profit / Max DD"),
+                    create_metric_card("Ulcer Index", f"{metrics.get('ulcer_index', 0):.2f}", "fas fa-wave-square", COLORS['orange'], "Volatilité DD"),
+                    create_metric_card("Pain Index", f"{metrics.get('pain_index', 0):.2f}", "fas fa-thermometer-half", COLORS['pink'], "Intensité DD"),
+                    create_metric_card("Kelly Criterion", f"{metrics.get('kelly_criterion', 0):.1f}%", "fas fa-bullseye", COLORS['cyan'], "Position optimale"),
                 ],
-                className="mb-5",
             ),
-            # ============================================
-            # ✅ FTMO COMPLIANCE
-            # ============================================
-            html.Div(
+        ],
+        className="mb-5",
+    )
+
+
+# ============================================
+# ✅ FTMO COMPLIANCE
+# ============================================
+
+
+def create_ftmo_section(metrics: Dict):
+    """Section conformité FTMO (avec risque simulé si calculé)"""
+    return html.Div(
+        [
+            html.H3(
+                [html.I(className="fas fa-check-circle me-3"), "Conformité FTMO"],
+                className="mb-4",
+                style={
+                    'fontSize': '2.2rem',
+                    'fontWeight': '900',
+                    'background': 'linear-gradient(135deg, #28a745, #20c997)',
+                    '-webkit-background-clip': 'text',
+                    '-webkit-text-fill-color': 'transparent',
+                    'backgroundClip': 'text',
+                },
+            ),
+            dbc.Row(
                 [
-                    html.H3(
-                        [html.I(className="fas fa-check-circle me-3"), "Conformité FTMO"],
-                        className="mb-4",
-                        style={
-                            'fontSize': '2.2rem',
-                            'fontWeight': '900',
-                            'background': 'linear-gradient(135deg, #28a745, #20c997)',
-                            '-webkit-background-clip': 'text',
-                            '-webkit-text-fill-color': 'transparent',
-                            'backgroundClip': 'text',
-                        },
-                    ),
-                    dbc.Row(
+                    dbc.Col(
                         [
-                            dbc.Col(
+                            dbc.Alert(
                                 [
-                                    dbc.Alert(
-                                        [
-                                            html.I(className="fas fa-check-circle fa-3x mb-3" if metrics.get('ftmo_max_dd_compliant', False) else "fas fa-times-circle fa-3x mb-3"),
-                                            html.H4("Max Drawdown < 10%", className="mb-3 fw-bold"),
-                                            html.H5(f"{abs(metrics.get('max_drawdown_pct', 0)):.2f}%", className="mb-2", style={'fontSize': '2.5rem', 'fontWeight': '900'}),
-                                            html.P("Limite FTMO", className="mb-0", style={'opacity': '0.8'}),
-                                        ],
-                                        color="success" if metrics.get('ftmo_max_dd_compliant', False) else "danger",
-                                        className="text-center glass-effect py-4",
-                                    ),
+                                    html.I(className="fas fa-check-circle fa-3x mb-3" if metrics.get('ftmo_max_dd_compliant', False) else "fas fa-times-circle fa-3x mb-3"),
+                                    html.H4("Max Drawdown < 10%", className="mb-3 fw-bold"),
+                                    html.H5(f"{abs(metrics.get('max_drawdown_pct', 0)):.2f}%", className="mb-2", style={'fontSize': '2.5rem', 'fontWeight': '900'}),
+                                    html.P("Limite FTMO", className="mb-0", style={'opacity': '0.8'}),
+                                    _breach_probability(metrics, 'max_dd_breach_prob'),
                                 ],
-                                lg=4,
-                                md=6,
-                                className="mb-4",
+                                color="success" if metrics.get('ftmo_max_dd_compliant', False) else "danger",
+                                className="text-center glass-effect py-4",
                             ),
-                            dbc.Col(
+                        ],
+                        lg=4,
+                        md=6,
+                        className="mb-4",
+                    ),
+                    dbc.Col(
+                        [
+                            dbc.Alert(
                                 [
-                                    dbc.Alert(
-                                        [
-                                            html.I(className="fas fa-calendar-day fa-3x mb-3" if metrics.get('ftmo_daily_loss_compliant', False) else "fas fa-exclamation-circle fa-3x mb-3"),
-                                            html.H4("Perte Journalière < 5%", className="mb-3 fw-bold"),
-                                            html.H5(f"{abs(metrics.get('max_daily_loss_pct', 0)):.2f}%", className="mb-2", style={'fontSize': '2.5rem', 'fontWeight': '900'}),
-                                            html.P("Limite FTMO", className="mb-0", style={'opacity': '0.8'}),
-                                        ],
-                                        color="success" if metrics.get('ftmo_daily_loss_compliant', False) else "danger",
-                                        className="text-center glass-effect py-4",
-                                    ),
+                                    html.I(className="fas fa-calendar-day fa-3x mb-3" if metrics.get('ftmo_daily_loss_compliant', False) else "fas fa-exclamation-circle fa-3x mb-3"),
+                                    html.H4("Perte Journalière < 5%", className="mb-3 fw-bold"),
+                                    html.H5(f"{abs(metrics.get('max_daily_loss_pct', 0)):.2f}%", className="mb-2", style={'fontSize': '2.5rem', 'fontWeight': '900'}),
+                                    html.P("Limite FTMO", className="mb-0", style={'opacity': '0.8'}),
+                                    _breach_probability(metrics, 'daily_loss_breach_prob'),
                                 ],
-                                lg=4,
-                                md=6,
-                                className="mb-4",
+                                color="success" if metrics.get('ftmo_daily_loss_compliant', False) else "danger",
+                                className="text-center glass-effect py-4",
                             ),
-                            dbc.Col(
+                        ],
+                        lg=4,
+                        md=6,
+                        className="mb-4",
+                    ),
+                    dbc.Col(
+                        [
+                            dbc.Alert(
                                 [
-                                    dbc.Alert(
-                                        [
-                                            html.I(className="fas fa-calendar-check fa-3x mb-3"),
-                                            html.H4("Jours de Trading", className="mb-3 fw-bold"),
-                                            html.H5(f"{metrics.get('trading_days', 0)}", className="mb-2", style={'fontSize': '2.5rem', 'fontWeight': '900'}),
-                                            html.P("Min: 4 jours", className="mb-0", style={'opacity': '0.8'}),
-                                        ],
-                                        color="info",
-                                        className="text-center glass-effect py-4",
-                                    ),
+                                    html.I(className="fas fa-calendar-check fa-3x mb-3"),
+                                    html.H4("Jours de Trading", className="mb-3 fw-bold"),
+                                    html.H5(f"{metrics.get('trading_days', 0)}", className="mb-2", style={'fontSize': '2.5rem', 'fontWeight': '900'}),
+                                    html.P("Min: 4 jours", className="mb-0", style={'opacity': '0.8'}),
                                 ],
-                                lg=4,
-                                md=12,
-                                className="mb-4",
+                                color="info",
+                                className="text-center glass-effect py-4",
                             ),
                         ],
+                        lg=4,
+                        md=12,
+                        className="mb-4",
                     ),
                 ],
-                className="mb-5",
             ),
-            # ============================================
-            # 📥 EXPORT
-            # ============================================
-            dbc.Row(
+        ],
+        className="mb-5",
+    )
+
+
+# ============================================
+# 📥 EXPORT
+# ============================================
+
+
+def create_export_section():
+    """Bouton d'export CSV"""
+    return dbc.Row(
+        [
+            dbc.Col(
                 [
-                    dbc.Col(
-                        [
-                            dbc.Button(
-                                [html.I(className="fas fa-download me-3"), "Télécharger les Données (CSV)"],
-                                id="download-csv-btn",
-                                size="lg",
-                                className="w-100 premium-border",
-                                style={
-                                    'background': f'linear-gradient(135deg, {COLORS["cyan"]}, {COLORS["violet"]})',
-                                    'border': 'none',
-                                    'fontSize': '1.2rem',
-                                    'fontWeight': '800',
-                                    'padding': '1.2rem',
-                                    'borderRadius': '16px',
-                                },
-                            ),
-                            dcc.Download(id="download-csv"),
-                        ],
-                        lg=6,
-                        xl=5,
-                        className="mx-auto",
+                    dbc.Button(
+                        [html.I(className="fas fa-download me-3"), "Télécharger les Données (CSV)"],
+                        id="download-csv-btn",
+                        size="lg",
+                        className="w-100 premium-border",
+                        style={
+                            'background': f'linear-gradient(135deg, {COLORS["cyan"]}, {COLORS["violet"]})',
+                            'border': 'none',
+                            'fontSize': '1.2rem',
+                            'fontWeight': '800',
+                            'padding': '1.2rem',
+                            'borderRadius': '16px',
+                        },
                     ),
+                    dcc.Download(id="download-csv"),
                 ],
-                className="text-center mt-4",
+                lg=6,
+                xl=5,
+                className="mx-auto",
             ),
+        ],
+        className="text-center mt-4",
+    )
+
+
+# Ordre des enfants de create_dashboard_content (chemins des Patch du mode live)
+CONTENT_SECTIONS = ["hero", "charts", "performance", "risk", "trading", "advanced", "ftmo", "export"]
+
+
+def create_dashboard_content(metrics: Dict, df: "pd.DataFrame", dataset_id: Optional[str] = None):
+    """Contenu complet du dashboard, construit d'un bloc (mode live, benchmarks)"""
+    return html.Div(
+        [
+            create_hero_section(metrics),
+            create_charts_section(create_modern_equity_chart(df), create_winloss_donut(metrics), dataset_id),
+            create_performance_section(metrics),
+            create_risk_section(metrics),
+            create_trading_section(metrics),
+            create_advanced_section(metrics),
+            create_ftmo_section(metrics),
+            create_export_section(),
         ]
     )
 
 
+# ============================================
+# 🧩 RENDU PAR SECTION
+# ============================================
+
+# Ordre d'affichage ; les sections sous la ligne de flottaison attendent
+# d'entrer dans le viewport (assets/lazy_sections.js)
+DASHBOARD_SECTIONS = ["hero", "charts", "performance", "risk", "trading", "advanced", "ftmo"]
+LAZY_SECTIONS = {"trading", "advanced", "ftmo"}
+
+# Hauteur réservée par le placeholder (évite les sauts de mise en page)
+SECTION_HEIGHTS = {
+    "charts": 520,
+    "performance": 180,
+    "risk": 180,
+    "trading": 180,
+    "advanced": 180,
+    "ftmo": 320,
+}
+
+SECTION_BUILDERS = {
+    "hero": create_hero_section,
+    "performance": create_performance_section,
+    "risk": create_risk_section,
+    "trading": create_trading_section,
+    "advanced": create_advanced_section,
+    "ftmo": create_ftmo_section,
+}
+
+
+def _section_placeholder(height: int):
+    """Emplacement réservé pendant le rendu d'une section"""
+    return html.Div(
+        dbc.Spinner(color="info"),
+        className="d-flex align-items-center justify-content-center glass-effect mb-5",
+        style={'minHeight': f'{height}px', 'borderRadius': '16px'},
+    )
+
+
+def create_dashboard_skeleton(metrics: Dict, dataset_id: str):
+    """
+    Squelette du dashboard : cartes hero immédiates, autres sections
+    remplies une à une par render_dashboard_section()
+    """
+    sections = []
+    for name in DASHBOARD_SECTIONS:
+        if name == "hero":
+            initial = create_hero_section(metrics)
+        else:
+            initial = _section_placeholder(SECTION_HEIGHTS[name])
+
+        lazy = name in LAZY_SECTIONS
+        sections.append(
+            html.Div(
+                [
+                    dcc.Store(id={"type": "section-source", "section": name}, data=dataset_id),
+                    # Cliqué par lazy_sections.js quand la section devient visible
+                    html.Button(
+                        id={"type": "section-trigger", "section": name},
+                        n_clicks=0,
+                        hidden=True,
+                        className="lazy-section-trigger" if lazy else None,
+                    ),
+                    html.Div(initial, id={"type": "dashboard-section", "section": name}),
+                ],
+                className="lazy-section" if lazy else None,
+                # Nœud DOM réutilisé d'un dataset à l'autre : le script compare cet attribut
+                **{"data-dataset": dataset_id},
+            )
+        )
+    sections.append(create_export_section())
+    return html.Div(sections)
+
+
+def _cached_metrics(dataset_id: str) -> Optional[Dict]:
+    """Métriques du dataset (cache SQLite, recalculées si expirées)"""
+    from utils.cache import MetricsCache, get_metrics_cache
+    from utils.library import load_dataset
+    from utils.metrics import MetricsCalculator
+
+    metrics_cache = get_metrics_cache()
+    key = MetricsCache.make_key(dataset_id, initial_balance=10000.0)
+    metrics = metrics_cache.get(key)
+    if metrics is None:
+        dataset = load_dataset(dataset_id)
+        if dataset is None:
+            return None
+        metrics = MetricsCalculator(dataset).get_all_metrics()
+        metrics_cache.put(key, metrics)
+    return metrics
+
+
 # ============================================
 # 🔄 CALLBACKS
 # ============================================
 
 
-@callback(
+@background_callback(
     [Output("dashboard-content", "children"), Output("stored-data", "data")],
-    Input("upload-data", "contents"),
+    [Input("upload-data", "contents"), Input("library-select", "value")],
     State("upload-data", "filename"),
+    progress=[Output("upload-progress", "value"), Output("upload-progress", "label")],
+    running=[
+        (Output("upload-progress", "style"), {'display': 'flex', 'height': '1.5rem'}, {'display': 'none'}),
+        (Output("upload-data", "disabled"), True, False),
+        (Output("library-select", "disabled"), True, False),
+    ],
 )
-def update_dashboard(contents, filename):
-    """Callback principal"""
-    if contents is None:
+@instrument("update_dashboard")
+def update_dashboard(set_progress, contents, library_id, filename):
+    """Callback principal (tâche d'arrière-plan : le worker web reste libre)"""
+    from dash import ctx
+
+    if ctx.triggered_id == "library-select":
+        contents = None
+        if library_id is None:
+            from dash import no_update
+            return no_update, no_update
+    else:
+        library_id = None
+
+    if contents is None and library_id is None:
         return html.Div(
             [
                 dbc.Alert(
@@ -646,23 +966,56 @@ def update_dashboard(contents, filename):
             ],
         ), None
 
+    from utils.cache import MetricsCache, content_hash, get_dataset_store, get_metrics_cache
     from utils.data_loader import DataLoader
+    from utils.library import get_library
     from utils.metrics import MetricsCalculator
 
     try:
-        loader = DataLoader()
-        data = loader.parse_upload(contents, filename)
+        if library_id is not None:
+            # Agent de la bibliothèque : fichier Arrow mappé en mémoire
+            set_progress((20, "Ouverture de l'agent..."))
+            dataset_id = library_id
+            dataset = get_library().open(dataset_id)
+            if dataset is None:
+                raise ValueError("Agent introuvable dans la bibliothèque.")
+        else:
+            # Dataset côté serveur : le navigateur ne garde que l'identifiant
+            store = get_dataset_store()
+            dataset_id = content_hash(contents)
+            dataset = store.get(dataset_id)
+
+            if dataset is None:
+                set_progress((10, "Décodage et lecture du fichier..."))
+                loader = DataLoader()
+                dataset = loader.parse_upload(contents, filename)
 
-        if data is None:
-            raise ValueError("Échec du parsing. Vérifiez le format du fichier.")
+                if dataset is None:
+                    raise ValueError("Échec du parsing. Vérifiez le format du fichier.")
 
-        df = pd.DataFrame(data)
-        calculator = MetricsCalculator(data)
-        metrics = calculator.get_all_metrics()
+                store.put(dataset_id, dataset)
 
-        content = create_dashboard_content(metrics, df)
+        # Métriques mémorisées entre workers (TTL = CACHE_TIMEOUT)
+        set_progress((50, "Calcul des métriques..."))
+        metrics_cache = get_metrics_cache()
+        metrics_key = MetricsCache.make_key(dataset_id, initial_balance=10000.0)
+        metrics = metrics_cache.get(metrics_key)
 
-        return content, data
+        if metrics is None:
+            with timed("metrics"):
+                metrics = MetricsCalculator(dataset).get_all_metrics()
+            metrics_cache.put(metrics_key, metrics)
+
+        if library_id is None:
+            # Résumé indexé écrit à l'ingestion (classements sans recalcul)
+            set_progress((80, "Enregistrement dans la bibliothèque..."))
+            _add_to_library(dataset_id, dataset, metrics)
+
+        # Cartes hero tout de suite ; graphiques et sections suivent
+        # (bootstrap et Monte Carlo : compute_uncertainty)
+        with timed("layout"):
+            content = create_dashboard_skeleton(metrics, dataset_id)
+        return content, dataset_id
 
     except Exception as e:
         return (
@@ -679,16 +1032,282 @@ def update_dashboard(contents, filename):
         )
 
 
+@background_callback(
+    Output("analysis-data", "data"),
+    Input("stored-data", "data"),
+    prevent_initial_call=True,
+)
+def compute_uncertainty(set_progress, dataset_id):
+    """Bootstrap et Monte Carlo hors du chemin critique du premier affichage"""
+    from dash import no_update
+    from utils.cache import MetricsCache, get_metrics_cache
+    from utils.library import load_dataset
+    from utils.metrics import MetricsCalculator
+
+    if not dataset_id:
+        return no_update
+
+    metrics_cache = get_metrics_cache()
+    key = MetricsCache.make_key(dataset_id, initial_balance=10000.0, analysis="uncertainty")
+    analysis = metrics_cache.get(key)
+
+    if analysis is None:
+        dataset = load_dataset(dataset_id, columns=["balance", "total_reward"])
+        if dataset is None:
+            return no_update
+        calculator = MetricsCalculator(dataset)
+        # Graine fixe : intervalles et probabilités stables d'un affichage à l'autre
+        analysis = {
+            'confidence_intervals': calculator.bootstrap_confidence_intervals(seed=0),
+            'ftmo_breach_probabilities': calculator.simulate_ftmo_breach(seed=0),
+        }
+        metrics_cache.put(key, analysis)
+
+    return {"dataset_id": dataset_id, **analysis}
+
+
+@callback(
+    Output({"type": "dashboard-section", "section": MATCH}, "children"),
+    [
+        Input({"type": "section-trigger", "section": MATCH}, "n_clicks"),
+        Input("analysis-data", "data"),
+    ],
+    [
+        State({"type": "section-source", "section": MATCH}, "data"),
+        State({"type": "section-source", "section": MATCH}, "id"),
+    ],
+)
+@instrument("render_dashboard_section")
+def render_dashboard_section(n_clicks, analysis, dataset_id, source_id):
+    """Rendu d'une section (au montage, ou à l'entrée dans le viewport)"""
+    from dash import ctx, no_update
+
+    section = source_id["section"]
+    if not dataset_id or (section in LAZY_SECTIONS and not n_clicks):
+        return no_update
+
+    uses_analysis = section in ("hero", "ftmo")
+    if ctx.triggered_id == "analysis-data" and not uses_analysis:
+        return no_update
+
+    metrics = _cached_metrics(dataset_id)
+    if metrics is None:
+        return dbc.Alert("Dataset introuvable (cache expiré).", color="warning", className="glass-effect mb-5")
+
+    if uses_analysis and analysis and analysis.get("dataset_id") == dataset_id:
+        metrics = {**metrics, **analysis}
+
+    if section == "charts":
+        equity = cached_equity_chart(dataset_id)
+        if equity is None:
+            return no_update
+        donut = cached_figure(dataset_id, "winloss", lambda: create_winloss_donut(metrics))
+        return create_charts_section(equity, donut, dataset_id)
+
+    return SECTION_BUILDERS[section](metrics)
+
+
+def _add_to_library(dataset_id: str, dataset, metrics: Optional[Dict] = None):
+    """Enregistre un upload dans la bibliothèque locale (une seule fois)"""
+    from utils.library import get_library
+
+    library = get_library()
+    if dataset_id in library:
+        return
+    try:
+        library.add(dataset_id, dataset, metrics=metrics)
+    except Exception as e:
+        # pyarrow absent ou colonnes non typables : le dashboard reste utilisable
+        print(f"Bibliothèque : ajout impossible ({dataset.source}) : {e}")
+
+
+@callback(
+    Output("session-data", "data"),
+    Input("stored-data", "data"),
+    State("session-data", "data"),
+    prevent_initial_call=True,
+)
+def share_dataset(dataset_id, session):
+    """Rend le dataset courant accessible aux autres pages (Analytics)"""
+    from dash import no_update
+
+    if not dataset_id:
+        return no_update
+    return {**(session or {}), "dataset_id": dataset_id}
+
+
+@callback(
+    Output("library-select", "options"),
+    [Input("library-search", "value"), Input("stored-data", "data")],
+)
+def update_library_options(search, dataset_id):
+    """Liste filtrée du catalogue (aucun dataset n'est chargé, data/ est scanné au démarrage)"""
+    from utils.library import get_library
+
+    entries = get_library().list(search=search, limit=500)
+    return [
+        {
+            "label": f"{e['agent_name']} • {e['algorithm'] or '—'} • {e['rows']:,} pts • ROI {e['roi_percent']:.1f}%",
+            "value": e["id"],
+        }
+        for e in entries
+    ]
+
+
 @callback(
     Output("download-csv", "data"),
     Input("download-csv-btn", "n_clicks"),
     State("stored-data", "data"),
     prevent_initial_call=True,
 )
-def download_csv(n_clicks, data):
+@instrument("download_csv")
+def download_csv(n_clicks, dataset_id):
     """Export CSV"""
-    if data is None:
+    from utils.library import load_dataset
+
+    dataset = load_dataset(dataset_id)
+    if dataset is None:
         return None
 
-    df = pd.DataFrame(data)
-    return dcc.send_data_frame(df.to_csv, "trading_analytics.csv", index=False)
+    return dcc.send_data_frame(dataset.to_csv, "trading_analytics.csv", index=False)
+
+
+def _chart_figure(content, column: int):
+    """Figure d'un dcc.Graph de la section graphiques (0 : équité, 1 : donut), dans un Patch"""
+    charts = content["props"]["children"][CONTENT_SECTIONS.index("charts")]
+    card = charts["props"]["children"][column]["props"]["children"][0]
+    return card["props"]["children"]["props"]["children"][0]["props"]["figure"]
+
+
+def _render_digest(component) -> str:
+    """Empreinte du JSON envoyé au navigateur pour un composant"""
+    import hashlib
+    import json
+
+    import plotly
+
+    payload = json.dumps(component, cls=plotly.utils.PlotlyJSONEncoder, sort_keys=True)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+@callback(
+    [
+        Output("dashboard-content", "children", allow_duplicate=True),
+        Output("live-render", "data"),
+    ],
+    Input("interval-component", "n_intervals"),
+    [State("user-preferences", "data"), State("live-render", "data")],
+    prevent_initial_call=True,
+)
+def refresh_live_dashboard(n_intervals, preferences, rendered):
+    """
+    Mode live : métriques incrémentales sur le log d'entraînement.
+
+    Actif seulement si le mode live est activé dans les paramètres : sans
+    cela le dashboard de l'upload n'est jamais écrasé. Le premier rendu
+    (ou après remplacement du log) construit tout le dashboard ; ensuite
+    un Patch ne renvoie que les sections dont le rendu a changé, la courbe
+    d'équité (enveloppe tenue à jour par la session) et le donut étant mis
+    à jour sans reconstruire de go.Figure.
+    """
+    from dash import Patch, no_update
+    from utils.streaming import get_live_session
+
+    preferences = preferences or {}
+    live_path = preferences.get("live_path")
+    if not preferences.get("live_enabled") or not live_path:
+        return no_update, no_update
+
+    try:
+        session = get_live_session(live_path)
+        frame, metrics = session.poll()
+        if len(frame) == 0:
+            return no_update, no_update
+
+        winloss = [metrics.get("winning_trades", 0), metrics.get("losing_trades", 0)]
+        sections = {name: SECTION_BUILDERS[name](metrics) for name in CONTENT_SECTIONS if name in SECTION_BUILDERS}
+        state = {
+            "path": live_path,
+            "generation": session.generation,
+            "rows": len(frame),
+            "winloss": winloss,
+            "sections": {name: _render_digest(section) for name, section in sections.items()},
+        }
+
+        previous = rendered or {}
+        if previous.get("path") != live_path or previous.get("generation") != session.generation:
+            return create_dashboard_content(metrics, frame), state
+        if previous.get("rows") == state["rows"]:
+            return no_update, no_update
+
+        content = Patch()
+        for name, section in sections.items():
+            if previous["sections"].get(name) != state["sections"][name]:
+                content["props"]["children"][CONTENT_SECTIONS.index(name)] = section
+
+        x, y = session.equity_points()
+        equity = _chart_figure(content, 0)
+        equity["data"][0]["x"] = x
+        equity["data"][0]["y"] = y
+
+        if previous.get("winloss") != winloss:
+            donut = _chart_figure(content, 1)
+            donut["data"][0]["values"] = winloss
+            donut["layout"]["annotations"][0]["text"] = _winrate_label(*winloss)
+        return content, state
+
+    except Exception as e:
+        return (
+            dbc.Alert(
+                [
+                    html.I(className="fas fa-exclamation-triangle fa-3x mb-4"),
+                    html.H3("Erreur Mode Live", className="mb-3 fw-bold"),
+                    html.P(f"Détails : {str(e)}", className="mb-0", style={'fontSize': '1rem'}),
+                ],
+                color="danger",
+                className="text-center glass-effect mt-5 py-5",
+            ),
+            None,
+        )
+
+
+@callback(
+    Output("live-render", "data", allow_duplicate=True),
+    Input("stored-data", "data"),
+    prevent_initial_call=True,
+)
+def forget_live_render(dataset_id):
+    """Un upload remplace le contenu : le prochain tick live repart d'un rendu complet"""
+    return None
+
+
+@callback(
+    Output("equity-graph", "figure"),
+    Input("equity-graph", "relayoutData"),
+    State("equity-source", "data"),
+    prevent_initial_call=True,
+)
+def zoom_equity_chart(relayout_data, dataset_id):
+    """Re-échantillonne la fenêtre zoomée à pleine résolution"""
+    from dash import no_update
+    from utils.library import load_dataset
+
+    if not relayout_data or not dataset_id:
+        return no_update
+
+    if relayout_data.get("xaxis.autorange"):
+        # Vue complète : même figure que le premier affichage
+        return cached_equity_chart(dataset_id) or no_update
+    elif "xaxis.range[0]" in relayout_data:
+        x_range = (relayout_data["xaxis.range[0]"], relayout_data["xaxis.range[1]"])
+    elif "xaxis.range" in relayout_data:
+        x_range = tuple(relayout_data["xaxis.range"])
+    else:
+        return no_update
+
+    # Seules les colonnes du graphique sont lues (Parquet)
+    dataset = load_dataset(dataset_id, columns=["balance", "total_reward"])
+    if dataset is None:
+        return no_update
+
+    return create_modern_equity_chart(dataset.frame, x_range=x_range)
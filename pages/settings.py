@@ -3,7 +3,7 @@
 User preferences and configuration
 """
 
-from dash import dcc, html, Input, Output, callback
+from dash import dcc, html, Input, Output, State, callback
 import dash_bootstrap_components as dbc
 
 
@@ -67,6 +67,8 @@ def layout():
                                                                     {"label": "5 minutes", "value": "300"},
                                                                 ],
                                                                 value="0",
+                                                                persistence=True,
+                                                                persistence_type="local",
                                                             ),
                                                         ],
                                                         md=6,
@@ -89,6 +91,38 @@ def layout():
                                 ],
                                 className="shadow-sm mb-3",
                             ),
+                            # Live mode settings
+                            dbc.Card(
+                                [
+                                    dbc.CardHeader(html.H5("Live Training Log", className="mb-0")),
+                                    dbc.CardBody(
+                                        [
+                                            dbc.Label("Log file (training_stats.json, .jsonl or .csv)"),
+                                            dbc.Input(
+                                                id="live-path",
+                                                type="text",
+                                                placeholder="agent7/training_stats.json",
+                                                debounce=True,
+                                                persistence=True,
+                                                persistence_type="local",
+                                            ),
+                                            dbc.FormText(
+                                                "Relative to LIVE_LOG_DIR. With live mode and Auto-Refresh enabled, "
+                                                "the home dashboard tails this file and updates metrics incrementally.",
+                                            ),
+                                            dbc.Switch(
+                                                id="live-enabled",
+                                                label="Live mode (replaces the uploaded dashboard)",
+                                                value=False,
+                                                persistence=True,
+                                                persistence_type="local",
+                                                className="mt-3",
+                                            ),
+                                        ],
+                                    ),
+                                ],
+                                className="shadow-sm mb-3",
+                            ),
                             # Export settings
                             dbc.Card(
                                 [
@@ -151,3 +185,19 @@ def layout():
         ],
         fluid=True,
     )
+
+
+@callback(
+    Output("user-preferences", "data"),
+    Input("refresh-select", "value"),
+    Input("live-path", "value"),
+    Input("live-enabled", "value"),
+    State("user-preferences", "data"),
+)
+def save_live_preferences(refresh_seconds, live_path, live_enabled, preferences):
+    """Persist auto-refresh interval, live log path and live mode toggle."""
+    preferences = dict(preferences or {})
+    preferences["refresh_seconds"] = int(refresh_seconds or 0)
+    preferences["live_path"] = (live_path or "").strip()
+    preferences["live_enabled"] = bool(live_enabled)
+    return preferences
@@ -0,0 +1,99 @@
+"""
+Shared fixtures: every cache, library and session file goes to a temp dir.
+
+The environment is set before any project module is imported, since
+several read their configuration at import time.
+"""
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pytest
+
+_TMP = tempfile.mkdtemp(prefix="tdp-tests-")
+os.environ.setdefault("DATASET_CACHE_DIR", os.path.join(_TMP, "cache"))
+os.environ.setdefault("LIBRARY_DIR", os.path.join(_TMP, "library"))
+os.environ.setdefault("SESSION_DB_PATH", os.path.join(_TMP, "sessions.sqlite"))
+os.environ.setdefault("PROFILING_DB", os.path.join(_TMP, "profiling.sqlite"))
+# Small simulations: the tests check plumbing, not statistics
+os.environ.setdefault("BOOTSTRAP_RESAMPLES", "50")
+os.environ.setdefault("MONTE_CARLO_PATHS", "200")
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+def run_callback(app, output: str, inputs, state=(), timeout: float = 60.0):
+    """
+    Run one callback through the Flask test client, polling background jobs.
+
+    Args:
+        app: dash.Dash instance
+        output: "<component id>.<property>", or the multi-output key
+            "..<id>.<property>...<id>.<property>.." (with the "@<hash>"
+            suffix of allow_duplicate outputs)
+        inputs: [(id, property, value), ...]
+        state: [(id, property, value), ...]
+        timeout: Seconds to wait for a background job
+
+    Returns:
+        The "response" part of the final callback reply
+    """
+    targets = [target.rsplit(".", 1) for target in output.strip(".").split("...")]
+    outputs = [{"id": component, "property": prop.split("@")[0]} for component, prop in targets]
+    payload = {
+        "output": output,
+        "outputs": outputs if output.startswith("..") else outputs[0],
+        "inputs": [{"id": i, "property": p, "value": v} for i, p, v in inputs],
+        "changedPropIds": [f"{i}.{p}" for i, p, _ in inputs],
+        "state": [{"id": i, "property": p, "value": v} for i, p, v in state],
+    }
+    client = app.server.test_client()
+
+    reply = client.post("/_dash-update-component", json=payload)
+    assert reply.status_code < 400, reply.get_data(as_text=True)
+    data = reply.get_json() or {}
+
+    deadline = time.time() + timeout
+    while "response" not in data:
+        assert "cacheKey" in data, data
+        assert time.time() < deadline, "background job did not finish"
+        time.sleep(0.2)
+        reply = client.post(
+            f"/_dash-update-component?cacheKey={data['cacheKey']}&job={data['job']}",
+            json=payload,
+        )
+        assert reply.status_code < 400, reply.get_data(as_text=True)
+        polled = reply.get_json() or {}
+        data = {**data, **polled} if "response" not in polled else polled
+
+    return data["response"]
+
+
+@pytest.fixture
+def tmp_cache(tmp_path, monkeypatch):
+    """Fresh DATASET_CACHE_DIR for tests that create their own caches."""
+    monkeypatch.setenv("DATASET_CACHE_DIR", str(tmp_path))
+    return tmp_path
+
+
+@pytest.fixture(scope="session")
+def pages_app():
+    """
+    Dash app serving the home and comparison page callbacks.
+
+    Dash hands the globally registered callbacks to the first app that
+    starts, so every test driving a page's callbacks shares this one.
+    """
+    dash = pytest.importorskip("dash")
+    from dash import html
+
+    from pages import comparison, home  # noqa: F401  (register the callbacks)
+    from utils.jobs import get_background_manager
+
+    app = dash.Dash(__name__, background_callback_manager=get_background_manager(), suppress_callback_exceptions=True)
+    app.layout = html.Div()
+    app.server.test_client().get("/")  # Claims the callbacks now
+    return app
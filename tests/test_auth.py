@@ -0,0 +1,188 @@
+"""Sessions, license tokens and login throttling."""
+
+import json
+import threading
+import time
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+pytest.importorskip("bcrypt")
+
+from utils.auth import MemorySessionBackend, SessionManager, SQLiteSessionBackend  # noqa: E402
+from utils.auth import time as auth_time  # noqa: E402
+
+
+class StrictRedis:
+    """Fake Redis enforcing SETEX's integer-seconds argument like a real server."""
+
+    def __init__(self):
+        self.values = {}
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def setex(self, key, seconds, value):
+        if isinstance(seconds, timedelta):
+            seconds = int(seconds.total_seconds())
+        # redis-py sends str(seconds); the server rejects "86400.0"
+        if not str(seconds).isdigit():
+            raise ValueError("value is not an integer or out of range")
+        self.values[key] = value.encode("utf-8") if isinstance(value, str) else value
+        return True
+
+    def delete(self, key):
+        return 1 if self.values.pop(key, None) is not None else 0
+
+
+@pytest.mark.parametrize("backend", ["redis", "memory", "sqlite"])
+def test_session_round_trip(backend, tmp_path):
+    backend = {
+        "redis": StrictRedis,
+        "memory": MemorySessionBackend,
+        "sqlite": lambda: SQLiteSessionBackend(tmp_path / "sessions.sqlite"),
+    }[backend]
+    manager = SessionManager(backend(), ttl=timedelta(hours=24))
+
+    token = manager.create_session("alice", {"plan": "pro"})
+    session = manager.validate_session(token)
+    assert session["user_id"] == "alice"
+    assert session["plan"] == "pro"
+
+    assert manager.destroy_session(token)
+    assert manager.validate_session(token) is None
+
+
+def test_rate_limiter_blocks_then_stays_bounded(monkeypatch):
+    from utils.auth import LoginRateLimiter
+
+    clock = [1000.0]
+    monkeypatch.setattr(auth_time, "monotonic", lambda: clock[0])
+    limiter = LoginRateLimiter(limit=3, window=60, max_keys=100)
+
+    for _ in range(3):
+        limiter.record_failure("user:alice", "ip:1.2.3.4")
+    assert limiter.retry_after("user:alice") == pytest.approx(60)
+    assert limiter.retry_after("user:bob") == 0
+
+    # Credential stuffing: every attempt uses a new username
+    for i in range(1_000):
+        limiter.record_failure(f"user:{i}")
+    assert len(limiter._failures) <= 100
+
+    # Once the window has passed, idle keys go at the next failure
+    clock[0] += 61
+    limiter.record_failure("user:late")
+    assert list(limiter._failures) == ["user:late"]
+
+
+def test_license_cache_keeps_valid_keys_only_up_to_the_cap(monkeypatch):
+    from utils.auth import AuthManager
+
+    monkeypatch.delenv("LICENSE_VALIDATION_URL", raising=False)
+    manager = AuthManager(cache_max_keys=3)
+
+    for i in range(1_000):
+        assert manager.validate_license(f"junk-{i}")[0] is False
+    assert len(manager._license_cache) == 0
+
+    for key in ("PRO-1", "PRO-2", "PRO-3"):
+        assert manager.validate_license(key)[0] is True
+    manager.validate_license("PRO-1")  # Most recently checked again
+    manager.validate_license("PRO-4")
+    assert list(manager._license_cache) == ["PRO-3", "PRO-1", "PRO-4"]
+
+
+class LicenseServer:
+    """Stub license server on 127.0.0.1: every key is valid unless revoked."""
+
+    def __init__(self):
+        self.revoked = set()
+        self.requests = 0
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                key = json.loads(self.rfile.read(int(self.headers["Content-Length"])))["license_key"]
+                server.requests += 1
+                body = json.dumps({"valid": key not in server.revoked, "type": "pro"}).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}/validate"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def license_server(monkeypatch):
+    server = LicenseServer()
+    monkeypatch.setenv("LICENSE_VALIDATION_URL", server.url)
+    monkeypatch.setenv("APP_SECRET_KEY", "test-secret")
+    yield server
+    server.stop()
+
+
+def _wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def test_license_server_accept_is_cached(license_server):
+    from utils.auth import AuthManager
+
+    manager = AuthManager()
+    token = manager.issue_license_token("a@example.com")
+
+    assert manager.validate_license(token)[0] is True
+    assert manager.validate_license(token)[0] is True
+    assert license_server.requests == 1
+
+
+def test_license_server_revoke_is_picked_up_in_background(license_server):
+    from utils.auth import AuthManager
+
+    manager = AuthManager(cache_ttl=0)  # Every cached result is already stale
+    token = manager.issue_license_token("a@example.com")
+    assert manager.validate_license(token)[0] is True
+
+    license_server.revoked.add(token)
+    # Served from the cache while the background check runs
+    assert manager.validate_license(token)[0] is True
+    _wait_for(lambda: token not in manager._license_cache)
+    assert manager.validate_license(token)[0] is False
+
+
+def test_license_server_down_caches_the_signature_check(license_server):
+    from utils.auth import AuthManager
+
+    license_server.stop()
+    manager = AuthManager()
+    token = manager.issue_license_token("a@example.com")
+
+    assert manager.validate_license(token)[0] is True  # Valid signature, offline
+    assert token in manager._license_cache
+
+    calls = []
+
+    def network(key):
+        calls.append(key)
+        raise OSError("license server down")
+
+    manager._check_license = network
+    for _ in range(3):
+        assert manager.validate_license(token)[0] is True
+    assert calls == []  # No request waits on the dead server again
@@ -0,0 +1,54 @@
+"""Bootstrap intervals: seeded, worker-count independent, around the estimate."""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from utils import bootstrap  # noqa: E402
+from utils.bootstrap import bootstrap_confidence_intervals, resampled_statistics  # noqa: E402
+from utils.metrics import TRADING_DAYS_PER_YEAR, MetricsKernel  # noqa: E402
+
+
+@pytest.fixture
+def kernel():
+    rng = np.random.default_rng(7)
+    return MetricsKernel(10000.0 * np.cumprod(1 + rng.normal(0.0008, 0.012, 750)))
+
+
+def test_statistics_of_the_original_series_match_metrics_kernel(kernel):
+    point = resampled_statistics(kernel.returns[None, :], 0.02 / TRADING_DAYS_PER_YEAR)
+    assert point["sharpe_ratio"][0] == pytest.approx(kernel.sharpe_ratio(), rel=1e-9)
+    assert point["sortino_ratio"][0] == pytest.approx(kernel.sortino_ratio(), rel=1e-9)
+    assert point["max_drawdown_pct"][0] == pytest.approx(kernel.max_drawdown_pct, rel=1e-9)
+
+
+def test_intervals_are_reproducible_and_bracket_the_estimate(kernel):
+    first = bootstrap_confidence_intervals(kernel.returns, n_resamples=400, seed=42, max_workers=1)
+    again = bootstrap_confidence_intervals(kernel.returns, n_resamples=400, seed=42, max_workers=1)
+    other = bootstrap_confidence_intervals(kernel.returns, n_resamples=400, seed=43, max_workers=1)
+    assert first == again
+    assert first != other
+
+    estimates = {
+        "sharpe_ratio": kernel.sharpe_ratio(),
+        "sortino_ratio": kernel.sortino_ratio(),
+        "max_drawdown_pct": kernel.max_drawdown_pct,
+    }
+    for key, estimate in estimates.items():
+        low, high = first[key]
+        assert low < estimate < high, key
+
+
+def test_pool_and_single_process_give_the_same_intervals(kernel, monkeypatch):
+    # Several small chunks, and the pool even for a small job
+    monkeypatch.setattr(bootstrap, "MAX_MATRIX_CELLS", 50 * len(kernel.returns))
+    monkeypatch.setattr(bootstrap, "PARALLEL_MIN_CELLS", 0)
+
+    single = bootstrap_confidence_intervals(kernel.returns, n_resamples=300, seed=5, max_workers=1)
+    pooled = bootstrap_confidence_intervals(kernel.returns, n_resamples=300, seed=5, max_workers=2)
+    assert pooled == single
+
+
+def test_short_series_has_empty_intervals():
+    intervals = bootstrap_confidence_intervals(np.array([0.01]), seed=0)
+    assert set(intervals.values()) == {(0.0, 0.0)}
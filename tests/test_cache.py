@@ -0,0 +1,50 @@
+"""SQLite caches: expired rows are purged by put(), not left to pile up."""
+
+import sqlite3
+
+from utils import cache
+from utils.cache import FigureCache, MetricsCache
+
+
+def _rows(db_path, table):
+    with sqlite3.connect(db_path) as conn:
+        return conn.execute(f"SELECT key FROM {table} ORDER BY key").fetchall()
+
+
+def test_metrics_put_purges_expired(tmp_cache, monkeypatch):
+    clock = [1_000.0]
+    monkeypatch.setattr(cache.time, "time", lambda: clock[0])
+    metrics = MetricsCache(ttl=60)
+
+    metrics.put("old", {"sharpe": 1.0})
+    clock[0] += 30
+    metrics.put("recent", {"sharpe": 2.0})
+    assert _rows(metrics.db_path, "metrics") == [("old",), ("recent",)]
+
+    # Past the TTL: the next put deletes what expired, keeps the rest
+    clock[0] += 40
+    metrics.put("new", {"sharpe": 3.0})
+    assert _rows(metrics.db_path, "metrics") == [("new",), ("recent",)]
+    assert metrics.get("recent") == {"sharpe": 2.0}
+
+
+def test_metrics_first_put_purges_previous_runs(tmp_cache, monkeypatch):
+    clock = [1_000.0]
+    monkeypatch.setattr(cache.time, "time", lambda: clock[0])
+    MetricsCache(ttl=60).put("stale", {})
+
+    clock[0] += 3_600
+    restarted = MetricsCache(ttl=60)
+    restarted.put("fresh", {})
+    assert _rows(restarted.db_path, "metrics") == [("fresh",)]
+
+
+def test_figure_put_purges_expired(tmp_cache, monkeypatch):
+    clock = [1_000.0]
+    monkeypatch.setattr(cache.time, "time", lambda: clock[0])
+    figures = FigureCache(ttl=60)
+
+    figures.put("old", '{"data": [], "layout": {}}')
+    clock[0] += 61
+    figures.put("new", '{"data": [], "layout": {}}')
+    assert _rows(figures.db_path, "figures") == [("new",)]
@@ -0,0 +1,76 @@
+"""Comparison engine: vectorized matrix metrics and the background job."""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("pandas")
+
+from benchmarks.generators import encode_upload, synthetic_balance, synthetic_frame  # noqa: E402
+from utils import comparison  # noqa: E402
+from utils.comparison import compare_metrics, parse_agents  # noqa: E402
+from utils.metrics import MetricsKernel  # noqa: E402
+
+
+def _kernel_metrics(kernel: MetricsKernel):
+    return {
+        "checkpoints": kernel.n,
+        "final_balance": kernel.final_balance,
+        "roi_percent": (kernel.final_balance - kernel.initial_balance) / kernel.initial_balance * 100,
+        "sharpe_ratio": kernel.sharpe_ratio(),
+        "sortino_ratio": kernel.sortino_ratio(),
+        "max_drawdown_pct": kernel.max_drawdown_pct,
+        "calmar_ratio": kernel.calmar_ratio,
+        "var_95": kernel.var(),
+        "cvar_95": kernel.cvar(),
+        "profit_factor": kernel.profit_factor,
+        "recovery_factor": kernel.recovery_factor,
+        "ulcer_index": kernel.ulcer_index,
+        "pain_index": kernel.pain_index,
+        "cagr": kernel.cagr,
+    }
+
+
+def test_matrix_metrics_match_metrics_kernel(monkeypatch):
+    # Small budget: several padded chunks of ragged lengths
+    monkeypatch.setattr(comparison, "MAX_MATRIX_CELLS", 5_000)
+    lengths = [50, 700, 1_200, 1_200, 3_000, 2]
+    names = [f"agent-{i}" for i in range(len(lengths))]
+    balances = [synthetic_balance(n, seed=i) for i, n in enumerate(lengths)]
+
+    table = compare_metrics(names, balances).set_index("agent")
+
+    assert table["rank"].tolist() == list(range(1, len(names) + 1))
+    for name, balance in zip(names, balances):
+        expected = _kernel_metrics(MetricsKernel(balance))
+        for column, value in expected.items():
+            assert table.loc[name, column] == pytest.approx(value, rel=1e-9, abs=1e-12), (name, column)
+
+
+def test_parse_agents_reports_progress_and_errors():
+    uploads = [encode_upload(synthetic_frame(300, seed=i), "csv") for i in range(3)]
+    contents = [c for c, _ in uploads] + ["data:text/csv;base64,bm90LGEsbG9n"]
+    filenames = ["a.csv", "b.csv", "c.csv", "broken.csv"]
+    seen = []
+
+    names, balances, errors = parse_agents(contents, filenames, max_workers=2, progress=lambda *p: seen.append(p))
+
+    assert len(names) == len(balances) == 3
+    assert list(errors) == ["broken.csv"]
+    assert seen == [(1, 4), (2, 4), (3, 4), (4, 4)]
+
+
+def test_update_comparison_runs_as_background_job(pages_app):
+    pytest.importorskip("diskcache")
+    pytest.importorskip("multiprocess")
+    from tests.conftest import run_callback
+
+    uploads = [encode_upload(synthetic_frame(300, seed=i), "csv") for i in range(2)]
+    response = run_callback(
+        pages_app,
+        "comparison-results.children",
+        [("upload-comparison", "contents", [c for c, _ in uploads])],
+        state=[("upload-comparison", "filename", ["a.csv", "b.csv"])],
+    )
+
+    cards = response["comparison-results"]["children"]
+    assert "Ranking (2 agents" in str(cards)
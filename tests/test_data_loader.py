@@ -0,0 +1,64 @@
+"""JSON uploads: checkpoints are streamed into columns, not held as dicts."""
+
+import io
+import json
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+pytest.importorskip("ijson")
+
+from utils import data_loader  # noqa: E402
+from utils.data_loader import DataLoader  # noqa: E402
+
+
+def _checkpoints(n: int):
+    return [{"timestep": i, "balance": 10000.0 + i, "trades": {"won": i % 3}} for i in range(n)]
+
+
+def _expected(records):
+    return pd.DataFrame.from_records(records)
+
+
+@pytest.mark.parametrize("batch_rows", [4, 1_000])
+def test_checkpoints_are_read_in_batches(monkeypatch, batch_rows):
+    monkeypatch.setattr(data_loader, "JSON_BATCH_ROWS", batch_rows)
+    records = _checkpoints(10)
+    document = {"agent_name": "a7", "checkpoints": records, "algorithm": "ppo"}
+
+    data = DataLoader._load_json_stream(io.BytesIO(json.dumps(document).encode()))
+
+    assert list(data) == ["checkpoints"]
+    pd.testing.assert_frame_equal(
+        DataLoader()._normalize_json(data), _expected(records), check_dtype=False
+    )
+
+
+def test_checkpoints_token_split_across_chunks():
+    raw = io.BytesIO(b'{"a": 1, "checkpoints": []}')
+    assert DataLoader._mentions(raw, b'"checkpoints"', chunk_size=12)
+    assert raw.tell() == 0
+    assert not DataLoader._mentions(io.BytesIO(b'{"checkpoint": []}'), b'"checkpoints"', chunk_size=4)
+
+
+def test_streamed_json_matches_json_load(monkeypatch):
+    monkeypatch.setattr(data_loader, "JSON_BATCH_ROWS", 3)
+    records = _checkpoints(7)
+    raw = json.dumps(records).encode()
+    streamed = DataLoader()._normalize_json(DataLoader._load_json_stream(io.BytesIO(raw)))
+
+    monkeypatch.setattr(data_loader, "ijson", None)
+    loaded = DataLoader()._normalize_json(DataLoader._load_json_stream(io.BytesIO(raw)))
+    pd.testing.assert_frame_equal(streamed, pd.DataFrame.from_records(loaded), check_dtype=False)
+
+
+def test_columnar_training_stats_still_become_arrays():
+    # Mentions "checkpoints" without a checkpoints array: read key by key
+    document = {"balance": [100.0, 101.0, 102.0], "roi_percent": [1.0, 2.0], "agent_name": "checkpoints"}
+    data = DataLoader._load_json_stream(io.BytesIO(json.dumps(document).encode()))
+
+    assert isinstance(data["balance"], np.ndarray)
+    frame = DataLoader()._normalize_json(data)
+    assert frame["balance"].tolist() == [100.0, 101.0, 102.0]
+    assert np.isnan(frame["roi_percent"].iloc[0])
@@ -0,0 +1,28 @@
+"""Dataset compaction: columns are narrowed only when no value changes."""
+
+import warnings
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+
+from utils.dataset import compact_dtypes  # noqa: E402
+
+
+def test_compact_dtypes_keeps_values_out_of_float32_range_silently():
+    df = pd.DataFrame({
+        "balance": [10000.0, 10000.5, np.nan],
+        "huge": [1e300, 1.0, 2.0],
+        "steps": np.array([1, 2, 3], dtype=np.int64),
+        "ids": np.array([1, 2**40, 3], dtype=np.int64),
+    })
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        compact_dtypes(df)
+
+    assert df["balance"].dtype == np.float32
+    assert df["huge"].dtype == np.float64 and df["huge"].iloc[0] == 1e300
+    assert df["steps"].dtype == np.int32
+    assert df["ids"].dtype == np.int64
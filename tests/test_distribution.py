@@ -0,0 +1,48 @@
+"""Returns distribution: bounded payload, consistent counts, density and tails."""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from utils.distribution import returns_distribution  # noqa: E402
+from utils.metrics import MetricsKernel  # noqa: E402
+
+
+@pytest.fixture
+def kernel():
+    # Fat tails, so some returns fall outside the plotted range
+    rng = np.random.default_rng(2)
+    return MetricsKernel(10000.0 * np.cumprod(1 + rng.standard_t(4, 20_000) * 0.005))
+
+
+def test_every_return_is_binned_or_an_outlier(kernel):
+    distribution = returns_distribution(kernel, bins=40, grid_points=256)
+    assert len(distribution["counts"]) == len(distribution["bin_centers"]) == 40
+    assert len(distribution["kde_x"]) == len(distribution["kde_y"]) == 256
+    assert distribution["outliers"] > 0
+    assert sum(distribution["counts"]) + distribution["outliers"] == distribution["n"] == kernel.n
+
+
+def test_kde_integrates_to_one_over_the_grid(kernel):
+    distribution = returns_distribution(kernel)
+    kde_x, kde_y = np.asarray(distribution["kde_x"]), np.asarray(distribution["kde_y"])
+    assert np.all(kde_y >= 0)
+    assert np.sum(kde_y) * (kde_x[1] - kde_x[0]) == pytest.approx(1.0, abs=0.01)
+
+
+@pytest.mark.parametrize("confidence", [0.95, 0.99])
+def test_tail_statistics_match_metrics_kernel(kernel, confidence):
+    distribution = returns_distribution(kernel, confidence=confidence)
+    assert distribution["var_pct"] == kernel.var(confidence)
+    assert distribution["cvar_pct"] == kernel.cvar(confidence)
+
+    threshold = np.percentile(kernel.returns, (1 - confidence) * 100)
+    assert distribution["var_pct"] == pytest.approx(threshold * 100, rel=1e-12)
+    tail = kernel.returns[kernel.returns <= threshold]
+    assert distribution["cvar_pct"] == pytest.approx(tail.mean() * 100, rel=1e-9)
+    assert distribution["mean_pct"] == pytest.approx(kernel.returns.mean() * 100)
+    assert distribution["std_pct"] == pytest.approx(kernel.returns.std() * 100)
+
+
+def test_short_history_has_no_distribution():
+    assert returns_distribution(MetricsKernel(np.array([10000.0]))) == {}
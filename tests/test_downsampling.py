@@ -0,0 +1,83 @@
+"""Chart downsampling: fewer points, same story (ends, extremes, worst drawdown)."""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from utils.downsampling import (  # noqa: E402
+    downsample,
+    drawdown_extreme_indices,
+    lttb_indices,
+    minmax_indices,
+)
+
+
+def _equity(n: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return 10000.0 * np.cumprod(1 + rng.normal(0.0003, 0.01, n))
+
+
+def _max_drawdown_points(y: np.ndarray):
+    running_max = np.maximum.accumulate(y)
+    trough = int(np.argmin((y - running_max) / running_max))
+    return int(np.argmax(y[:trough + 1])), trough
+
+
+@pytest.mark.parametrize("method", ["lttb", "minmax"])
+@pytest.mark.parametrize("max_points", [50, 500, 2000])
+def test_downsample_keeps_ends_and_extremes_within_budget(method, max_points):
+    y = _equity(20_000, seed=max_points)
+    x = np.arange(len(y))
+
+    dx, dy = downsample(x, y, max_points, method=method)
+
+    assert len(dx) <= max_points
+    assert np.all(np.diff(dx) > 0)
+    np.testing.assert_array_equal(dy, y[dx])
+    kept = set(dx.tolist())
+    peak, trough = _max_drawdown_points(y)
+    assert {0, len(y) - 1, int(y.argmax()), int(y.argmin()), peak, trough} <= kept
+
+
+def test_downsample_leaves_short_series_alone():
+    y = _equity(100)
+    x, dy = downsample(np.arange(100), y, 500)
+    assert len(x) == 100 and np.array_equal(dy, y)
+
+
+def test_downsample_zoom_keeps_one_point_beyond_each_edge():
+    y = _equity(50_000)
+    x = np.arange(len(y))
+    dx, _ = downsample(x, y, 200, x_range=(10_000, 20_000))
+    assert len(dx) <= 200
+    assert dx[0] == 9_999 and dx[-1] == 20_001
+
+
+def test_lttb_selects_exactly_n_out_sorted_points():
+    y = _equity(10_000)
+    indices = lttb_indices(np.arange(len(y)), y, 300)
+    assert len(indices) == 300
+    assert indices[0] == 0 and indices[-1] == len(y) - 1
+    assert np.all(np.diff(indices) > 0)
+
+
+def test_minmax_keeps_every_bucket_extreme():
+    y = _equity(10_000)
+    indices = minmax_indices(y, 100)
+    assert len(indices) <= 100
+    assert int(y.argmax()) in indices and int(y.argmin()) in indices
+    # Each of the 50 buckets contributes its own min and max
+    edges = np.linspace(0, len(y), 51).astype(np.int64)
+    for start, end in zip(edges[:-1], edges[1:]):
+        assert start + int(y[start:end].argmin()) in indices
+        assert start + int(y[start:end].argmax()) in indices
+
+
+def test_drawdown_extremes_find_peak_and_trough():
+    y = np.array([100.0, 120.0, 90.0, 130.0, 110.0, 140.0, 80.0, 150.0])
+    # Worst drawdown: 140 -> 80; global min 80 and max 150
+    assert drawdown_extreme_indices(y).tolist() == [5, 6, 7]
+
+    with_nan = np.array([np.nan, 100.0, 50.0, np.nan, 120.0])
+    assert set(drawdown_extreme_indices(with_nan).tolist()) == {1, 2, 4}
+    assert drawdown_extreme_indices(np.empty(0)).tolist() == []
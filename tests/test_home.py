@@ -0,0 +1,28 @@
+"""Home dashboard callbacks that run as background jobs."""
+
+import pytest
+
+pytest.importorskip("dash")
+pytest.importorskip("diskcache")
+pytest.importorskip("multiprocess")
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+
+from tests.conftest import run_callback  # noqa: E402
+from utils.cache import get_dataset_store  # noqa: E402
+from utils.dataset import TrainingDataset  # noqa: E402
+
+
+def test_compute_uncertainty_runs_as_diskcache_job(pages_app):
+    rng = np.random.default_rng(0)
+    balance = 10000.0 * np.cumprod(1 + rng.normal(0.0005, 0.01, 300))
+    dataset_id = "test-uncertainty"
+    get_dataset_store().put(dataset_id, TrainingDataset.from_parsed(pd.DataFrame({"balance": balance})))
+
+    response = run_callback(pages_app, "analysis-data.data", [("stored-data", "data", dataset_id)])
+    analysis = response["analysis-data"]["data"]
+
+    assert analysis["dataset_id"] == dataset_id
+    low, high = analysis["confidence_intervals"]["sharpe_ratio"]
+    assert low <= high
+    assert 0.0 <= analysis["ftmo_breach_probabilities"]["any_breach_prob"] <= 1.0
@@ -0,0 +1,67 @@
+"""background_callback: same set_progress contract with and without diskcache."""
+
+import pytest
+
+dash = pytest.importorskip("dash")
+pytest.importorskip("diskcache")
+pytest.importorskip("multiprocess")
+
+from dash import Input, Output, html  # noqa: E402
+
+from tests.conftest import run_callback  # noqa: E402
+from utils import jobs  # noqa: E402
+
+
+def _app():
+    manager = jobs.get_background_manager()
+    assert manager is not None
+    app = dash.Dash(__name__, background_callback_manager=manager, suppress_callback_exceptions=True)
+    app.layout = html.Div()
+    return app
+
+
+def test_without_progress_still_receives_set_progress():
+    @jobs.background_callback(
+        Output("jobs-out-plain", "children"),
+        Input("jobs-in-plain", "value"),
+        prevent_initial_call=True,
+    )
+    def double(set_progress, value):
+        set_progress("ignored")
+        return value * 2
+
+    response = run_callback(_app(), "jobs-out-plain.children", [("jobs-in-plain", "value", 21)])
+    assert response["jobs-out-plain"]["children"] == 42
+
+
+def test_with_progress_receives_dash_set_progress():
+    @jobs.background_callback(
+        Output("jobs-out-progress", "children"),
+        Input("jobs-in-progress", "value"),
+        progress=Output("jobs-progress", "children"),
+        prevent_initial_call=True,
+    )
+    def double(set_progress, value):
+        set_progress("half way")
+        return value * 2
+
+    response = run_callback(_app(), "jobs-out-progress.children", [("jobs-in-progress", "value", 5)])
+    assert response["jobs-out-progress"]["children"] == 10
+
+
+def test_synchronous_fallback(monkeypatch):
+    monkeypatch.setattr(jobs, "get_background_manager", lambda: None)
+
+    @jobs.background_callback(
+        Output("jobs-out-sync", "children"),
+        Input("jobs-in-sync", "value"),
+        prevent_initial_call=True,
+    )
+    def double(set_progress, value):
+        set_progress("ignored")
+        return value * 2
+
+    app = dash.Dash(__name__, suppress_callback_exceptions=True)
+    app.layout = html.Div()
+    response = run_callback(app, "jobs-out-sync.children", [("jobs-in-sync", "value", 4)])
+    assert response["jobs-out-sync"]["children"] == 8
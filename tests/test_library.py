@@ -0,0 +1,52 @@
+"""Dataset library: the Arrow files stay within their byte budget."""
+
+import os
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+pytest.importorskip("pyarrow")
+
+from utils.dataset import TrainingDataset  # noqa: E402
+from utils.library import DatasetLibrary  # noqa: E402
+
+
+def _dataset(seed: int) -> TrainingDataset:
+    rng = np.random.default_rng(seed)
+    balance = 10000.0 * np.cumprod(1 + rng.normal(0.0005, 0.01, 2_000))
+    return TrainingDataset.from_parsed(pd.DataFrame({"balance": balance}))
+
+
+def _age(library: DatasetLibrary, dataset_id: str, seconds: float):
+    path = library._path(dataset_id)
+    mtime = path.stat().st_mtime - seconds
+    os.utime(path, (mtime, mtime))
+
+
+def test_add_evicts_least_recently_used_uploads(tmp_path):
+    library = DatasetLibrary(tmp_path)
+    library.add("a", _dataset(0))
+    size = library.total_bytes()
+    library.max_bytes = int(2.5 * size)
+
+    library.add("b", _dataset(1))
+    _age(library, "a", 20)
+    _age(library, "b", 10)
+    assert library.open("a") is not None  # "a" becomes the most recent
+
+    library.add("c", _dataset(2))
+    assert "b" not in library and library.entry("b") is None
+    assert "a" in library and "c" in library
+    assert library.total_bytes() <= library.max_bytes
+
+
+def test_uploads_are_evicted_before_scanned_files(tmp_path):
+    library = DatasetLibrary(tmp_path)
+    library.add("scanned", _dataset(0), source_mtime=123.0)
+    library.max_bytes = int(2.5 * library.total_bytes())
+    _age(library, "scanned", 60)
+
+    library.add("upload", _dataset(1))
+    library.add("new", _dataset(2))
+    assert [e["id"] for e in library.list(order_by="added_at", descending=False)] == ["scanned", "new"]
@@ -0,0 +1,51 @@
+"""Monte Carlo breach odds: seeded, and the same with or without the pool."""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from utils import monte_carlo  # noqa: E402
+from utils.monte_carlo import (  # noqa: E402
+    DAILY_LOSS,
+    FINAL_RETURN,
+    MAX_DD,
+    ftmo_breach_probabilities,
+    run_simulation,
+    simulate_paths,
+)
+
+
+@pytest.fixture
+def returns():
+    return np.random.default_rng(3).normal(0.0002, 0.004, 2_000)
+
+
+def test_constant_losses_give_exact_outcomes():
+    results = simulate_paths(np.array([-0.01]), np.random.default_rng(0), 2, 120, steps_per_day=50)
+    assert results[:, MAX_DD] == pytest.approx((1 - 0.99 ** 120) * 100)
+    # Every full day loses the same share of its opening balance
+    assert results[:, DAILY_LOSS] == pytest.approx((1 - 0.99 ** 50) * 100)
+    assert results[:, FINAL_RETURN] == pytest.approx((0.99 ** 120 - 1) * 100)
+
+
+def test_breach_probabilities_are_reproducible_probabilities(returns):
+    first = ftmo_breach_probabilities(returns, 10.0, 6.0, n_paths=500, seed=11, max_workers=1)
+    again = ftmo_breach_probabilities(returns, 10.0, 6.0, n_paths=500, seed=11, max_workers=1)
+    assert first == again
+
+    for key in ("max_dd_breach_prob", "daily_loss_breach_prob", "any_breach_prob"):
+        assert 0.0 <= first[key] <= 1.0, key
+    # Limits chosen so that some paths breach and some do not
+    assert 0.0 < first["any_breach_prob"] < 1.0
+    assert first["any_breach_prob"] >= max(first["max_dd_breach_prob"], first["daily_loss_breach_prob"])
+    assert first["final_return_p5"] <= first["final_return_p50"] <= first["final_return_p95"]
+
+
+def test_shared_memory_pool_matches_single_process(returns, monkeypatch):
+    # Several chunks, and the pool even for a small job
+    monkeypatch.setattr(monte_carlo, "MAX_CHUNK_CELLS", 100 * len(returns))
+    monkeypatch.setattr(monte_carlo, "PARALLEL_MIN_CELLS", 0)
+
+    single = run_simulation(returns, n_paths=450, seed=9, max_workers=1)
+    pooled = run_simulation(returns, n_paths=450, seed=9, max_workers=2)
+    np.testing.assert_array_equal(pooled, single)
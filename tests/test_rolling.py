@@ -0,0 +1,54 @@
+"""O(n) rolling risk metrics vs the naive pandas reference."""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("pandas")
+
+from benchmarks.bench_rolling import flat_stretch, naive_rolling  # noqa: E402
+from benchmarks.generators import synthetic_balance  # noqa: E402
+from utils.rolling import rolling_flat, rolling_mean_std, rolling_risk_metrics  # noqa: E402
+
+
+WINDOW = 50
+
+
+def test_matches_naive_including_flat_windows():
+    balance = flat_stretch(synthetic_balance(2_000), 700, 3 * WINDOW)
+    fast = rolling_risk_metrics(balance, WINDOW)
+    naive = naive_rolling(balance, WINDOW)
+
+    for column in naive.columns:
+        np.testing.assert_allclose(
+            fast[column].to_numpy()[WINDOW - 1:],
+            naive[column].to_numpy()[WINDOW - 1:],
+            rtol=1e-6,
+            atol=1e-9,
+            err_msg=column,
+        )
+
+
+def test_flat_windows_give_zero_ratios():
+    # Idle agent: many zero returns, like RL agents holding no position
+    balance = np.full(1_000, 10_123.456789)
+    balance[:200] = synthetic_balance(200, initial_balance=10_123.456789)
+    balance[200:] = balance[199]
+
+    table = rolling_risk_metrics(balance, WINDOW)
+    flat = table.iloc[200 + WINDOW:]
+    assert (flat["sharpe_ratio"] == 0).all()
+    assert (flat["sortino_ratio"] == 0).all()
+    assert (flat["volatility_pct"] == 0).all()
+
+
+def test_rolling_std_is_exactly_zero_on_constant_windows():
+    values = np.concatenate([np.random.default_rng(1).normal(0, 1, 100), np.full(100, 0.3)])
+    _, std = rolling_mean_std(values, 10)
+    assert (std[110:] == 0).all()
+    assert (std[9:100] > 0).all()
+
+
+def test_rolling_flat_ignores_nan():
+    values = np.array([1.0, np.nan, 1.0, 2.0, np.nan, np.nan])
+    flat = rolling_flat(values, 3)
+    assert flat.tolist() == [False, False, True, False, False, True]
@@ -0,0 +1,159 @@
+"""Live mode: logs are tailed incrementally and the dashboard is patched."""
+
+import json
+import os
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("pandas")
+
+from utils.downsampling import StreamingEnvelope, drawdown_extreme_indices  # noqa: E402
+from utils.streaming import LogTailer  # noqa: E402
+
+
+def _jsonl(balances):
+    return "".join(json.dumps({"timestep": i, "balance": b}) + "\n" for i, b in enumerate(balances))
+
+
+@pytest.mark.parametrize("name", ["log.jsonl", "training_stats.json"])
+def test_json_lines_are_read_from_the_last_offset(tmp_path, name):
+    path = tmp_path / name
+    path.write_text(_jsonl([100.0, 101.0]))
+    tailer = LogTailer(path)
+
+    balances, reset = tailer.read_new()
+    assert balances.tolist() == [100.0, 101.0] and not reset
+
+    # Partial last line: left for the next call
+    with open(path, "a") as f:
+        f.write(json.dumps({"timestep": 2, "balance": 102.0}) + "\n" + '{"timestep": 3, "bal')
+    balances, reset = tailer.read_new()
+    assert balances.tolist() == [102.0] and not reset
+    assert tailer.rows_seen == 3
+
+    with open(path, "a") as f:
+        f.write('ance": 103.0}\n')
+    assert tailer.read_new()[0].tolist() == [103.0]
+
+
+def test_json_document_is_still_read_whole(tmp_path):
+    path = tmp_path / "training_stats.json"
+    path.write_text(json.dumps([{"balance": 100.0}, {"balance": 99.0}], indent=2))
+    tailer = LogTailer(path)
+    assert tailer.read_new()[0].tolist() == [100.0, 99.0]
+
+    path.write_text(json.dumps([{"balance": 100.0}, {"balance": 99.0}, {"balance": 98.0}], indent=2))
+    os.utime(path, (1, 1))  # mtime change on coarse clocks
+    assert tailer.read_new()[0].tolist() == [98.0]
+
+
+def test_csv_replaced_by_a_file_as_large_is_a_reset(tmp_path):
+    path = tmp_path / "log.csv"
+    path.write_text("balance\n100.0\n101.0\n")
+    tailer = LogTailer(path)
+    assert tailer.read_new()[0].tolist() == [100.0, 101.0]
+
+    # New run: same size, new inode (the trainer writes a new file and renames it)
+    replacement = tmp_path / "log.csv.new"
+    replacement.write_text("balance\n200.0\n201.0\n")
+    keep = tmp_path / "old.csv"
+    os.link(path, keep)  # Holds the old inode so it cannot be reused
+    os.replace(replacement, path)
+
+    balances, reset = tailer.read_new()
+    assert reset
+    assert balances.tolist() == [200.0, 201.0]
+
+
+def test_json_lines_log_replaced_by_a_json_document(tmp_path):
+    path = tmp_path / "training_stats.json"
+    path.write_text(_jsonl([100.0, 101.0]))
+    tailer = LogTailer(path)
+    assert tailer.read_new()[0].tolist() == [100.0, 101.0]
+
+    # Same name, new format: sniffed again instead of parsed as JSON lines
+    replacement = tmp_path / "replacement.json"
+    replacement.write_text(json.dumps([{"balance": 200.0}, {"balance": 201.0}, {"balance": 202.0}], indent=2))
+    keep = tmp_path / "old.json"
+    os.link(path, keep)
+    os.replace(replacement, path)
+
+    balances, reset = tailer.read_new()
+    assert reset
+    assert balances.tolist() == [200.0, 201.0, 202.0]
+
+
+def test_streaming_envelope_keeps_extremes_within_budget():
+    rng = np.random.default_rng(1)
+    y = 10000.0 * np.cumprod(1 + rng.normal(0.0002, 0.01, 50_000))
+    envelope = StreamingEnvelope(max_points=300)
+
+    start = 0
+    for size in rng.integers(1, 2_000, 100):
+        envelope.extend(y[start:start + size])
+        start += size
+        if start >= len(y):
+            break
+    y = y[:start]
+
+    x, values = envelope.points()
+    assert len(x) <= 300
+    assert np.all(np.diff(x) > 0)
+    np.testing.assert_array_equal(values, y[x])
+    kept = set(x.tolist())
+    assert {0, len(y) - 1, int(y.argmin()), int(y.argmax())} <= kept
+    assert set(drawdown_extreme_indices(y).tolist()) <= kept
+
+
+def _patched_paths(patch):
+    return [operation["location"] for operation in patch["operations"]]
+
+
+def test_live_dashboard_patches_only_what_changed(pages_app, tmp_path, monkeypatch):
+    from tests.conftest import run_callback
+
+    monkeypatch.setenv("LIVE_LOG_DIR", str(tmp_path))
+    path = tmp_path / "live.jsonl"
+    rng = np.random.default_rng(0)
+    balances = 10000.0 * np.cumprod(1 + rng.normal(0.0005, 0.01, 500))
+    path.write_text(_jsonl(balances[:400]))
+
+    output = next(key for key in pages_app.callback_map if "live-render.data" in key and "dashboard-content" in key)
+    preferences = {"live_path": "live.jsonl", "live_enabled": True}
+
+    def tick(rendered):
+        return run_callback(
+            pages_app,
+            output,
+            [("interval-component", "n_intervals", 1)],
+            state=[("user-preferences", "data", preferences), ("live-render", "data", rendered)],
+        )
+
+    def unpack(response):
+        return response["dashboard-content"]["children"], response["live-render"]["data"]
+
+    content, rendered = unpack(tick(None))
+    assert content["type"] == "Div"  # Full render
+    assert rendered["rows"] == 400
+
+    with open(path, "a") as f:
+        f.write(_jsonl(balances[400:]))
+    patch, rendered = unpack(tick(rendered))
+    assert "__dash_patch_update" in patch
+    locations = _patched_paths(patch)
+    equity = ["props", "children", 1, "props", "children", 0, "props", "children", 0,
+              "props", "children", "props", "children", 0, "props", "figure", "data", 0]
+    assert equity + ["x"] in locations and equity + ["y"] in locations
+    # The export section never changes
+    assert not any(location[:3] == ["props", "children", 7] for location in locations)
+    assert rendered["rows"] == 500
+
+    # Nothing appended: nothing sent
+    assert tick(rendered) == {}
+
+    # Live mode off: the uploaded dashboard is left alone
+    preferences["live_enabled"] = False
+    with open(path, "a") as f:
+        f.write(_jsonl(balances[:10]))
+    assert tick(rendered) == {}
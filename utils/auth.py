@@ -4,12 +4,274 @@ License validation and user management for commercial distribution
 """
 
 import os
+import base64
 import hashlib
+import heapq
+import hmac
+import json
 import secrets
-from typing import Optional, Dict, Tuple
+import sqlite3
+import threading
+import time
+import urllib.request
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Deque, Optional, Dict, Iterator, List, Tuple, Union
 from datetime import datetime, timedelta
 import bcrypt
 
+try:
+    import redis
+except ImportError:
+    redis = None
+
+
+DEFAULT_SESSION_DB = Path(__file__).resolve().parent.parent / "data" / "sessions.sqlite"
+
+# Seconds between bulk deletions of expired sessions
+SESSION_SWEEP_INTERVAL = float(os.getenv("SESSION_SWEEP_INTERVAL", "300"))
+
+# Seconds a license validation result is served from memory before revalidation
+LICENSE_CACHE_TTL = float(os.getenv("LICENSE_CACHE_TTL", "3600"))
+# Valid license keys remembered per process (least recently checked dropped first)
+LICENSE_CACHE_MAX_KEYS = int(os.getenv("LICENSE_CACHE_MAX_KEYS", "10000"))
+LICENSE_SERVER_TIMEOUT = float(os.getenv("LICENSE_SERVER_TIMEOUT", "5"))
+# While the license server is down, seconds before a background retry
+LICENSE_RETRY_TTL = float(os.getenv("LICENSE_RETRY_TTL", "60"))
+
+
+# bcrypt cost factor for new hashes (each +1 doubles verification time)
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+
+# Concurrent bcrypt checks per process; extra logins wait at most PASSWORD_QUEUE_TIMEOUT
+PASSWORD_WORKERS = int(os.getenv("PASSWORD_WORKERS", "2"))
+PASSWORD_QUEUE_TIMEOUT = float(os.getenv("PASSWORD_QUEUE_TIMEOUT", "2"))
+
+# Failed logins allowed per username and per client IP within the window
+LOGIN_RATE_LIMIT = int(os.getenv("LOGIN_RATE_LIMIT", "5"))
+LOGIN_RATE_WINDOW = float(os.getenv("LOGIN_RATE_WINDOW", "300"))
+
+# Upper bound on usernames/IPs tracked per process (oldest dropped beyond)
+LOGIN_RATE_MAX_KEYS = int(os.getenv("LOGIN_RATE_MAX_KEYS", "100000"))
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(text: str) -> bytes:
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+
+# ============================================
+# PASSWORD VERIFICATION
+# ============================================
+
+
+class PasswordVerifier:
+    """
+    bcrypt checks on a bounded thread pool.
+
+    bcrypt releases the GIL, so checks run in parallel on the pool while a
+    semaphore caps how many are queued or running. When the cap is reached,
+    a login waits at most queue_timeout seconds and is then refused, so a
+    login storm cannot occupy every request thread. Latencies of the last
+    `history` checks are kept for stats().
+    """
+
+    def __init__(
+        self,
+        max_workers: int = PASSWORD_WORKERS,
+        queue_timeout: float = PASSWORD_QUEUE_TIMEOUT,
+        history: int = 1000,
+    ):
+        """
+        Initialize the verifier.
+
+        Args:
+            max_workers: Concurrent bcrypt checks
+            queue_timeout: Seconds a check may wait for a free slot
+            history: Number of latencies kept for stats()
+        """
+        self.max_workers = max(1, max_workers)
+        self.queue_timeout = queue_timeout
+        self._pool = ThreadPoolExecutor(self.max_workers, thread_name_prefix="bcrypt")
+        # Running + queued checks; beyond this, callers are refused
+        self._slots = threading.BoundedSemaphore(self.max_workers * 2)
+        self._latencies: Deque[float] = deque(maxlen=history)
+        self._counts = {"verified": 0, "rejected": 0}
+        self._lock = threading.Lock()
+
+    def verify(self, password: str, hashed: str) -> Optional[bool]:
+        """
+        Check a password against a bcrypt hash.
+
+        Args:
+            password: Plain text password
+            hashed: Hashed password
+
+        Returns:
+            True/False, or None if the verifier is saturated
+        """
+        start = time.perf_counter()
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            with self._lock:
+                self._counts["rejected"] += 1
+            return None
+        try:
+            future = self._pool.submit(bcrypt.checkpw, password.encode("utf-8"), hashed.encode("utf-8"))
+            result = future.result()
+        finally:
+            self._slots.release()
+
+        with self._lock:
+            self._counts["verified"] += 1
+            self._latencies.append(time.perf_counter() - start)
+        return result
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Verification counters and latency percentiles (queue wait included).
+
+        Returns:
+            Dictionary with verified, rejected, p50_ms, p95_ms and max_ms
+        """
+        with self._lock:
+            latencies = sorted(self._latencies)
+            counts = dict(self._counts)
+
+        def percentile(q: float) -> float:
+            if not latencies:
+                return 0.0
+            return latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000
+
+        return {
+            **counts,
+            "workers": self.max_workers,
+            "p50_ms": percentile(0.50),
+            "p95_ms": percentile(0.95),
+            "max_ms": latencies[-1] * 1000 if latencies else 0.0,
+        }
+
+
+class LoginRateLimiter:
+    """
+    Sliding-window limit on failed logins, per key (username or client IP).
+
+    Timestamps of recent failures are kept per key and pruned on access.
+    record_failure() drops idle keys once per window (prune()) and, if a
+    storm of distinct usernames/IPs still exceeds max_keys, forgets the
+    oldest keys, so memory stays bounded.
+    """
+
+    def __init__(
+        self,
+        limit: int = LOGIN_RATE_LIMIT,
+        window: float = LOGIN_RATE_WINDOW,
+        max_keys: int = LOGIN_RATE_MAX_KEYS,
+    ):
+        """
+        Initialize the limiter.
+
+        Args:
+            limit: Failures allowed within the window
+            window: Window length in seconds
+            max_keys: Keys tracked at most
+        """
+        self.limit = limit
+        self.window = window
+        self.max_keys = max_keys
+        self._failures: Dict[str, Deque[float]] = {}
+        self._lock = threading.Lock()
+        self._last_prune = time.monotonic()
+
+    def _recent(self, key: str, now: float) -> Deque[float]:
+        failures = self._failures.get(key)
+        if failures is None:
+            return deque()
+        while failures and failures[0] <= now - self.window:
+            failures.popleft()
+        return failures
+
+    def retry_after(self, *keys: str) -> float:
+        """
+        Seconds until any of the keys may try again (0 if allowed now).
+
+        Args:
+            *keys: Keys to check (e.g. "user:alice", "ip:10.0.0.1")
+
+        Returns:
+            Wait time in seconds
+        """
+        now = time.monotonic()
+        wait = 0.0
+        with self._lock:
+            for key in keys:
+                failures = self._recent(key, now)
+                if len(failures) >= self.limit:
+                    wait = max(wait, failures[0] + self.window - now)
+        return wait
+
+    def record_failure(self, *keys: str):
+        """Count one failed attempt against every key."""
+        now = time.monotonic()
+        with self._lock:
+            for key in keys:
+                # Re-inserted so the dict stays ordered by last failure
+                failures = self._failures.pop(key, None) or deque()
+                self._failures[key] = failures
+                failures.append(now)
+                # Only the last `limit` failures matter for the window
+                while len(failures) > self.limit:
+                    failures.popleft()
+
+            if now - self._last_prune >= self.window or len(self._failures) > self.max_keys:
+                self._prune(now)
+            while len(self._failures) > self.max_keys:
+                # Storm of distinct keys: forget the least recently failing ones
+                del self._failures[next(iter(self._failures))]
+
+    def reset(self, *keys: str):
+        """Forget the failures of keys (after a successful login)."""
+        with self._lock:
+            for key in keys:
+                self._failures.pop(key, None)
+
+    def _prune(self, now: float) -> int:
+        # Caller holds the lock
+        self._last_prune = now
+        idle = [key for key in self._failures if not self._recent(key, now)]
+        for key in idle:
+            del self._failures[key]
+        return len(idle)
+
+    def prune(self) -> int:
+        """Drop keys with no failure left in the window. Returns the number removed."""
+        with self._lock:
+            return self._prune(time.monotonic())
+
+
+_password_verifier: Optional[PasswordVerifier] = None
+_login_rate_limiter: Optional[LoginRateLimiter] = None
+
+
+def get_password_verifier() -> PasswordVerifier:
+    """Process-wide PasswordVerifier."""
+    global _password_verifier
+    if _password_verifier is None:
+        _password_verifier = PasswordVerifier()
+    return _password_verifier
+
+
+def get_login_rate_limiter() -> LoginRateLimiter:
+    """Process-wide LoginRateLimiter."""
+    global _login_rate_limiter
+    if _login_rate_limiter is None:
+        _login_rate_limiter = LoginRateLimiter()
+    return _login_rate_limiter
+
 
 class AuthManager:
     """
@@ -22,9 +284,23 @@ class AuthManager:
     - Trial period tracking
     """
 
-    def __init__(self):
+    def __init__(self, cache_ttl: Optional[float] = None, cache_max_keys: Optional[int] = None):
+        """
+        Initialize the manager.
+
+        Args:
+            cache_ttl: License result lifetime in seconds (default: LICENSE_CACHE_TTL env or 3600)
+            cache_max_keys: Cached licenses (default: LICENSE_CACHE_MAX_KEYS env or 10000)
+        """
         self.secret_key = os.getenv("APP_SECRET_KEY", self._generate_secret_key())
         self.license_url = os.getenv("LICENSE_VALIDATION_URL", None)
+        self.cache_ttl = LICENSE_CACHE_TTL if cache_ttl is None else cache_ttl
+        self.cache_max_keys = LICENSE_CACHE_MAX_KEYS if cache_max_keys is None else cache_max_keys
+
+        # license_key -> (stale_at, is_valid, info), least recently checked first
+        self._license_cache: "OrderedDict[str, Tuple[float, bool, Dict]]" = OrderedDict()
+        self._revalidating = set()
+        self._license_lock = threading.Lock()
 
     @staticmethod
     def _generate_secret_key() -> str:
@@ -32,61 +308,239 @@ class AuthManager:
         return secrets.token_urlsafe(32)
 
     @staticmethod
-    def hash_password(password: str) -> str:
+    def hash_password(password: str, rounds: Optional[int] = None) -> str:
         """
         Hash password using bcrypt.
 
         Args:
             password: Plain text password
+            rounds: Cost factor (default: BCRYPT_ROUNDS env or 12)
 
         Returns:
             Hashed password
         """
-        salt = bcrypt.gensalt()
+        salt = bcrypt.gensalt(rounds=BCRYPT_ROUNDS if rounds is None else rounds)
         hashed = bcrypt.hashpw(password.encode("utf-8"), salt)
         return hashed.decode("utf-8")
 
+    @staticmethod
+    def needs_rehash(hashed: str) -> bool:
+        """True if a hash was made with another cost factor than BCRYPT_ROUNDS."""
+        try:
+            return int(hashed.split("$")[2]) != BCRYPT_ROUNDS
+        except (IndexError, ValueError):
+            return True
+
     @staticmethod
     def verify_password(password: str, hashed: str) -> bool:
         """
-        Verify password against hash.
+        Verify password against hash (on the bounded bcrypt pool).
 
         Args:
             password: Plain text password
             hashed: Hashed password
 
         Returns:
-            True if match, False otherwise
+            True if match, False otherwise (or if the verifier is saturated)
+        """
+        return bool(get_password_verifier().verify(password, hashed))
+
+    def authenticate(self, username: str, password: str, hashed: str, client_ip: Optional[str] = None) -> Tuple[bool, Dict]:
+        """
+        Rate-limited login check.
+
+        Failed attempts are counted per username and per client IP; once
+        either exceeds LOGIN_RATE_LIMIT within LOGIN_RATE_WINDOW, the
+        password is not even checked until the window moves on.
+
+        Args:
+            username: Login name
+            password: Plain text password
+            hashed: Stored bcrypt hash for the user
+            client_ip: Remote address, if known
+
+        Returns:
+            Tuple of (is_authenticated, info); info has "error" and, when
+            throttled, "retry_after" in seconds
+        """
+        limiter = get_login_rate_limiter()
+        keys = [f"user:{username}"] + ([f"ip:{client_ip}"] if client_ip else [])
+
+        wait = limiter.retry_after(*keys)
+        if wait > 0:
+            return False, {"error": "Too many failed attempts", "retry_after": round(wait, 1)}
+
+        result = get_password_verifier().verify(password, hashed)
+        if result is None:
+            return False, {"error": "Server busy, try again", "retry_after": 1.0}
+        if not result:
+            limiter.record_failure(*keys)
+            return False, {"error": "Invalid credentials"}
+
+        # The IP keeps its count: one valid account must not unlock guessing others
+        limiter.reset(keys[0])
+        return True, {"username": username, "rehash": self.needs_rehash(hashed)}
+
+    def _sign(self, payload: bytes) -> str:
+        return _b64encode(hmac.new(self.secret_key.encode("utf-8"), payload, hashlib.sha256).digest())
+
+    def issue_license_token(
+        self,
+        user_email: str,
+        product_type: str = "PRO",
+        days: int = 365,
+        features: Optional[List[str]] = None,
+    ) -> str:
+        """
+        Issue a signed license token, verifiable offline with APP_SECRET_KEY.
+
+        Args:
+            user_email: User's email
+            product_type: Product tier (PRO, ENTERPRISE, etc.)
+            days: Validity in days
+            features: Enabled features (default: all)
+
+        Returns:
+            Token "<TIER>.<payload>.<signature>" (base64url, HMAC-SHA256)
+        """
+        payload = json.dumps(
+            {
+                "email": user_email,
+                "type": product_type.lower(),
+                "expires": (datetime.now() + timedelta(days=days)).isoformat(),
+                "features": features or ["all"],
+            },
+            separators=(",", ":"),
+        ).encode("utf-8")
+        body = f"{product_type}.{_b64encode(payload)}"
+        return f"{body}.{self._sign(body.encode('utf-8'))}"
+
+    def verify_license_token(self, token: str) -> Tuple[bool, Dict]:
+        """
+        Check a token from issue_license_token() locally (no network).
+
+        Args:
+            token: Signed license token
+
+        Returns:
+            Tuple of (is_valid, license_info)
         """
-        return bcrypt.checkpw(password.encode("utf-8"), hashed.encode("utf-8"))
+        body, _, signature = token.rpartition(".")
+        expected = self._sign(body.encode("utf-8"))
+        if not body or not hmac.compare_digest(signature.encode("utf-8"), expected.encode("ascii")):
+            return False, {"error": "Invalid license signature"}
+
+        try:
+            info = json.loads(_b64decode(body.split(".", 1)[1]))
+            expires = datetime.fromisoformat(info["expires"])
+        except (ValueError, KeyError, IndexError) as e:
+            return False, {"error": f"Malformed license token: {e}"}
+
+        if datetime.now() > expires:
+            return False, {"error": "License expired", **info}
+        return True, {"valid": True, **info}
+
+    def _check_license(self, license_key: str) -> Tuple[bool, Dict]:
+        """Uncached check: signature first, then the license server if configured."""
+        if license_key.count(".") == 2:
+            is_valid, info = self.verify_license_token(license_key)
+            if not is_valid or not self.license_url:
+                return is_valid, info
+        elif not self.license_url:
+            # Demo: Accept any key starting with "PRO-"
+            if license_key.startswith("PRO-"):
+                return True, {
+                    "valid": True,
+                    "type": "professional",
+                    "expires": (datetime.now() + timedelta(days=365)).isoformat(),
+                    "features": ["all"],
+                }
+            return False, {"error": "Invalid license key"}
+
+        # License server (revocations, seat limits): POST {"license_key": ...}
+        request = urllib.request.Request(
+            self.license_url,
+            data=json.dumps({"license_key": license_key}).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+        )
+        with urllib.request.urlopen(request, timeout=LICENSE_SERVER_TIMEOUT) as response:
+            info = json.loads(response.read())
+        return bool(info.get("valid")), info
+
+    def _remember(self, license_key: str, is_valid: bool, info: Dict, ttl: Optional[float] = None):
+        """Cache a valid result (LRU); forget the key otherwise. Caller holds the lock."""
+        if not is_valid:
+            # Not cached: arbitrary rejected strings must not fill memory
+            self._license_cache.pop(license_key, None)
+            return
+        ttl = self.cache_ttl if ttl is None else ttl
+        self._license_cache[license_key] = (time.monotonic() + ttl, is_valid, info)
+        self._license_cache.move_to_end(license_key)
+        while len(self._license_cache) > self.cache_max_keys:
+            self._license_cache.popitem(last=False)
+
+    def _revalidate(self, license_key: str):
+        """Refresh one cached result (background thread)."""
+        try:
+            is_valid, info = self._check_license(license_key)
+            with self._license_lock:
+                self._remember(license_key, is_valid, info)
+        except Exception as e:
+            # Server unreachable: keep serving the last known result, retry later
+            print(f"License revalidation failed: {e}")
+            with self._license_lock:
+                cached = self._license_cache.get(license_key)
+                if cached is not None:
+                    self._remember(license_key, cached[1], cached[2], ttl=LICENSE_RETRY_TTL)
+        finally:
+            with self._license_lock:
+                self._revalidating.discard(license_key)
 
     def validate_license(self, license_key: str) -> Tuple[bool, Dict]:
         """
         Validate license key.
 
+        Valid results are cached in memory for cache_ttl seconds, for at
+        most cache_max_keys keys. An expired entry is still returned
+        immediately while a background thread revalidates it, so only the
+        first check of a key can wait on the license server. If the server
+        is down then, a signed token is verified locally and that result is
+        cached for LICENSE_RETRY_TTL seconds, after which the server is asked
+        again in the background. Rejected keys are not cached.
+
         Args:
-            license_key: User's license key
+            license_key: User's license key or signed token
 
         Returns:
             Tuple of (is_valid, license_info)
         """
-        # TODO: Implement actual license validation
-        # This could connect to your license server API
-
-        # For now, simple hash-based validation (DEMO)
         if not license_key:
             return False, {"error": "No license key provided"}
 
-        # Demo: Accept any key starting with "PRO-"
-        if license_key.startswith("PRO-"):
-            return True, {
-                "valid": True,
-                "type": "professional",
-                "expires": (datetime.now() + timedelta(days=365)).isoformat(),
-                "features": ["all"],
-            }
+        with self._license_lock:
+            cached = self._license_cache.get(license_key)
+            if cached is not None:
+                self._license_cache.move_to_end(license_key)
+                stale_at, is_valid, info = cached
+                if time.monotonic() >= stale_at and license_key not in self._revalidating:
+                    self._revalidating.add(license_key)
+                    threading.Thread(target=self._revalidate, args=(license_key,), daemon=True).start()
+                return is_valid, info
 
-        return False, {"error": "Invalid license key"}
+        try:
+            is_valid, info = self._check_license(license_key)
+        except Exception as e:
+            # Offline: a valid signature is enough until the server answers
+            if license_key.count(".") == 2:
+                is_valid, info = self.verify_license_token(license_key)
+                with self._license_lock:
+                    self._remember(license_key, is_valid, info, ttl=LICENSE_RETRY_TTL)
+                return is_valid, info
+            return False, {"error": f"License server unreachable: {e}"}
+
+        with self._license_lock:
+            self._remember(license_key, is_valid, info)
+        return is_valid, info
 
     def generate_license_key(self, user_email: str, product_type: str = "PRO") -> str:
         """
@@ -135,11 +589,171 @@ class AuthManager:
             return {"error": str(e), "expired": True}
 
 
-class SessionManager:
-    """Manage user sessions (for multi-user deployments)."""
+# ============================================
+# SESSION BACKENDS
+# ============================================
+
+
+class MemorySessionBackend:
+    """
+    In-process session store with a Redis-style interface (get/setex/delete).
+
+    Only suitable for a single worker. Expiry is tracked in a min-heap, so a
+    sweep pops expired tokens without scanning live sessions.
+    """
 
     def __init__(self):
-        self.sessions: Dict[str, Dict] = {}
+        self._values: Dict[str, Tuple[bytes, float]] = {}
+        self._expiry: List[Tuple[float, str]] = []
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            item = self._values.get(key)
+            if item is None or item[1] <= time.time():
+                return None
+            return item[0]
+
+    def setex(self, key: str, seconds: float, value: Union[str, bytes]):
+        if isinstance(value, str):
+            value = value.encode("utf-8")
+        expires_at = time.time() + seconds
+        with self._lock:
+            self._values[key] = (value, expires_at)
+            heapq.heappush(self._expiry, (expires_at, key))
+
+    def delete(self, key: str) -> int:
+        with self._lock:
+            return 1 if self._values.pop(key, None) is not None else 0
+
+    def sweep(self) -> int:
+        """Delete expired sessions. Returns the number removed."""
+        now, removed = time.time(), 0
+        with self._lock:
+            while self._expiry and self._expiry[0][0] <= now:
+                expires_at, key = heapq.heappop(self._expiry)
+                item = self._values.get(key)
+                # Stale heap entry if the session was deleted or re-set since
+                if item is not None and item[1] == expires_at:
+                    del self._values[key]
+                    removed += 1
+        return removed
+
+
+class SQLiteSessionBackend:
+    """
+    Session store shared by all gunicorn workers (one SQLite file).
+
+    Same Redis-style interface as MemorySessionBackend. Lookups go through
+    the primary key; an index on expires_at lets sweep() delete expired
+    rows in one range scan.
+    """
+
+    def __init__(self, db_path: Optional[Union[str, Path]] = None):
+        """
+        Initialize the store.
+
+        Args:
+            db_path: SQLite file (default: SESSION_DB_PATH env or data/sessions.sqlite)
+        """
+        self.db_path = Path(db_path or os.getenv("SESSION_DB_PATH", DEFAULT_SESSION_DB))
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS sessions ("
+                "token TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_sessions_expires ON sessions (expires_at)")
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # One short-lived connection per call: safe across forked workers
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT value FROM sessions WHERE token = ? AND expires_at > ?",
+                (key, time.time()),
+            ).fetchone()
+        return row[0] if row else None
+
+    def setex(self, key: str, seconds: float, value: Union[str, bytes]):
+        if isinstance(value, str):
+            value = value.encode("utf-8")
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO sessions VALUES (?, ?, ?)",
+                (key, value, time.time() + seconds),
+            )
+
+    def delete(self, key: str) -> int:
+        with self._connect() as conn:
+            return conn.execute("DELETE FROM sessions WHERE token = ?", (key,)).rowcount
+
+    def sweep(self) -> int:
+        """Delete expired sessions. Returns the number removed."""
+        with self._connect() as conn:
+            return conn.execute("DELETE FROM sessions WHERE expires_at <= ?", (time.time(),)).rowcount
+
+
+def get_session_backend():
+    """
+    Session backend from SESSION_BACKEND (sqlite, memory or redis).
+
+    redis uses REDIS_URL and needs the redis package; it expires keys
+    itself, so the other backends only emulate its interface.
+    """
+    name = os.getenv("SESSION_BACKEND", "sqlite").lower()
+    if name == "redis":
+        if redis is None:
+            raise ImportError("SESSION_BACKEND=redis requires the redis package")
+        return redis.Redis.from_url(os.getenv("REDIS_URL", "redis://localhost:6379/0"))
+    if name == "memory":
+        return MemorySessionBackend()
+    return SQLiteSessionBackend()
+
+
+class SessionManager:
+    """
+    Manage user sessions (for multi-user deployments).
+
+    Sessions live in a pluggable backend (see get_session_backend()), so a
+    login handled by one worker is valid in all of them. Expired sessions
+    are never returned and are deleted in bulk every sweep_interval
+    seconds, piggybacked on session writes.
+    """
+
+    def __init__(self, backend=None, ttl: timedelta = timedelta(hours=24), sweep_interval: Optional[float] = None):
+        """
+        Initialize the manager.
+
+        Args:
+            backend: Object with get/setex/delete (default: get_session_backend())
+            ttl: Session lifetime
+            sweep_interval: Seconds between sweeps (default: SESSION_SWEEP_INTERVAL env or 300)
+        """
+        self.backend = backend if backend is not None else get_session_backend()
+        self.ttl = ttl
+        self.sweep_interval = SESSION_SWEEP_INTERVAL if sweep_interval is None else sweep_interval
+        self._last_sweep = time.monotonic()
+
+    def _maybe_sweep(self):
+        sweep = getattr(self.backend, "sweep", None)  # Redis expires keys itself
+        if sweep is None or time.monotonic() - self._last_sweep < self.sweep_interval:
+            return
+        self._last_sweep = time.monotonic()
+        try:
+            sweep()
+        except sqlite3.Error as e:
+            print(f"Error sweeping sessions: {e}")
 
     def create_session(self, user_id: str, user_data: Dict) -> str:
         """
@@ -147,19 +761,23 @@ class SessionManager:
 
         Args:
             user_id: Unique user identifier
-            user_data: User information
+            user_data: User information (JSON-serializable)
 
         Returns:
             Session token
         """
         session_token = secrets.token_urlsafe(32)
+        now = datetime.now()
 
-        self.sessions[session_token] = {
+        session = {
             "user_id": user_id,
-            "created_at": datetime.now(),
-            "expires_at": datetime.now() + timedelta(hours=24),
+            "created_at": now.isoformat(),
+            "expires_at": (now + self.ttl).isoformat(),
             **user_data,
         }
+        # Redis' SETEX only takes whole seconds
+        self.backend.setex(session_token, int(self.ttl.total_seconds()), json.dumps(session, default=str))
+        self._maybe_sweep()
 
         return session_token
 
@@ -171,18 +789,18 @@ class SessionManager:
             session_token: Session token
 
         Returns:
-            Session data or None if invalid
+            Session data or None if invalid or expired
         """
-        if session_token not in self.sessions:
+        if not session_token:
             return None
 
-        session = self.sessions[session_token]
-
-        # Check expiration
-        if datetime.now() > session["expires_at"]:
-            del self.sessions[session_token]
+        value = self.backend.get(session_token)
+        if value is None:
             return None
 
+        session = json.loads(value)
+        session["created_at"] = datetime.fromisoformat(session["created_at"])
+        session["expires_at"] = datetime.fromisoformat(session["expires_at"])
         return session
 
     def destroy_session(self, session_token: str) -> bool:
@@ -195,18 +813,15 @@ class SessionManager:
         Returns:
             True if successful
         """
-        if session_token in self.sessions:
-            del self.sessions[session_token]
-            return True
-        return False
+        return bool(self.backend.delete(session_token))
 
 
 # Example usage for generating license keys
 if __name__ == "__main__":
     auth = AuthManager()
 
-    # Generate demo license
-    demo_license = auth.generate_license_key("demo@example.com", "PRO")
+    # Generate demo license (signed, verifiable offline)
+    demo_license = auth.issue_license_token("demo@example.com", "PRO")
     print(f"Demo License Key: {demo_license}")
 
     # Validate
@@ -0,0 +1,173 @@
+"""
+🎲 BOOTSTRAP - Trading Dashboard Pro
+Confidence intervals for Sharpe, Sortino and max drawdown by batch resampling
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from utils.metrics import TRADING_DAYS_PER_YEAR
+
+
+# Upper bound on cells (resamples x returns) in one resampled matrix; a
+# chunk holds ~6 temporaries of this size (indices, samples, paths, ...)
+MAX_MATRIX_CELLS = 5_000_000
+
+# Below this many cells in total, a process pool costs more than it saves
+PARALLEL_MIN_CELLS = 50_000_000
+
+DEFAULT_RESAMPLES = int(os.getenv("BOOTSTRAP_RESAMPLES", "500"))
+
+
+def default_block_size(n: int) -> int:
+    """Block length for the moving-block bootstrap (n^(1/3) rule)."""
+    return max(1, int(round(n ** (1 / 3))))
+
+
+def resample_indices(rng: np.random.Generator, n: int, size: int, block_size: int = 1) -> np.ndarray:
+    """
+    (size x n) matrix of resampled positions.
+
+    block_size 1 is the iid bootstrap; larger blocks (circular moving-block
+    bootstrap) keep short-range autocorrelation such as volatility clusters.
+
+    Args:
+        rng: Random generator
+        n: Length of the series
+        size: Number of resamples (rows)
+        block_size: Consecutive returns drawn together
+
+    Returns:
+        Integer index matrix
+    """
+    if block_size <= 1:
+        return rng.integers(0, n, size=(size, n))
+
+    n_blocks = -(-n // block_size)
+    starts = rng.integers(0, n, size=(size, n_blocks, 1))
+    indices = (starts + np.arange(block_size)) % n
+    return indices.reshape(size, -1)[:, :n]
+
+
+def resampled_statistics(samples: np.ndarray, daily_rf: float) -> Dict[str, np.ndarray]:
+    """
+    Sharpe, Sortino and max drawdown of every row of a returns matrix.
+
+    Same definitions as MetricsKernel (population std, downside set is
+    returns below the risk-free rate, drawdown in percent of the peak).
+
+    Args:
+        samples: (B x n) resampled returns
+        daily_rf: Per-period risk-free rate
+
+    Returns:
+        Dictionary of length-B arrays
+    """
+    annualize = np.sqrt(TRADING_DAYS_PER_YEAR)
+    mean = samples.mean(axis=1)
+    std = samples.std(axis=1)
+
+    below = samples < daily_rf
+    count = below.sum(axis=1)
+    downside = np.where(below, samples, 0.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        down_mean = downside.sum(axis=1) / count
+        down_var = (downside * downside).sum(axis=1) / count - down_mean * down_mean
+        down_std = np.sqrt(np.maximum(down_var, 0.0))
+
+        sharpe = np.where(std > 0, (mean - daily_rf) / std * annualize, 0.0)
+        sortino = np.where((count > 0) & (down_std > 0), (mean - daily_rf) / down_std * annualize, 0.0)
+
+    # Equity path relative to its start; the starting balance is a peak too
+    wealth = np.cumprod(1 + samples, axis=1)
+    peak = np.maximum(np.maximum.accumulate(wealth, axis=1), 1.0)
+    max_drawdown = ((wealth - peak) / peak).min(axis=1) * 100
+
+    return {"sharpe_ratio": sharpe, "sortino_ratio": sortino, "max_drawdown_pct": max_drawdown}
+
+
+# Returns shared with pool workers once, not pickled per chunk
+_worker_returns: Optional[np.ndarray] = None
+
+
+def _init_worker(returns: np.ndarray):
+    global _worker_returns
+    _worker_returns = returns
+
+
+def _bootstrap_chunk(
+    job: Tuple[np.random.SeedSequence, int, int, float],
+    returns: Optional[np.ndarray] = None,
+) -> Dict[str, np.ndarray]:
+    """Resample and evaluate one chunk of rows (in a worker unless returns is given)."""
+    seed, size, block_size, daily_rf = job
+    if returns is None:
+        returns = _worker_returns
+    rng = np.random.default_rng(seed)
+    samples = returns[resample_indices(rng, len(returns), size, block_size)]
+    return resampled_statistics(samples, daily_rf)
+
+
+def bootstrap_confidence_intervals(
+    returns: np.ndarray,
+    n_resamples: int = DEFAULT_RESAMPLES,
+    confidence: float = 0.95,
+    block_size: Optional[int] = None,
+    risk_free_rate: float = 0.02,
+    seed: Optional[int] = None,
+    max_workers: Optional[int] = None,
+) -> Dict[str, Tuple[float, float]]:
+    """
+    Percentile bootstrap intervals for Sharpe, Sortino and max drawdown.
+
+    Resamples are drawn as (rows x n) matrices in chunks of at most
+    MAX_MATRIX_CELLS cells. Each chunk has its own child of one
+    SeedSequence, so a given seed gives the same intervals whatever the
+    number of workers. Large jobs are spread over a process pool.
+
+    Args:
+        returns: Period returns (e.g. MetricsKernel.returns)
+        n_resamples: Number of bootstrap resamples (B)
+        confidence: Interval coverage
+        block_size: Moving-block length (default: n^(1/3); 1 = iid)
+        risk_free_rate: Annual risk-free rate
+        seed: RNG seed for reproducible intervals
+        max_workers: Pool size (default: BOOTSTRAP_WORKERS env or CPU count)
+
+    Returns:
+        Dictionary of (low, high) per metric
+    """
+    returns = np.asarray(returns, dtype=np.float64)
+    n = len(returns)
+    if n < 2 or n_resamples < 1:
+        return {key: (0.0, 0.0) for key in ("sharpe_ratio", "sortino_ratio", "max_drawdown_pct")}
+
+    if block_size is None:
+        block_size = default_block_size(n)
+    daily_rf = risk_free_rate / TRADING_DAYS_PER_YEAR
+
+    rows = max(1, MAX_MATRIX_CELLS // n)
+    sizes = [min(rows, n_resamples - start) for start in range(0, n_resamples, rows)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    jobs = [(s, size, block_size, daily_rf) for s, size in zip(seeds, sizes)]
+
+    if max_workers is None:
+        max_workers = int(os.getenv("BOOTSTRAP_WORKERS", os.cpu_count() or 1))
+    max_workers = max(1, min(max_workers, len(jobs)))
+
+    if max_workers == 1 or n * n_resamples < PARALLEL_MIN_CELLS:
+        results = [_bootstrap_chunk(job, returns) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers, initializer=_init_worker, initargs=(returns,)) as pool:
+            results = list(pool.map(_bootstrap_chunk, jobs))
+
+    tail = (1 - confidence) / 2 * 100
+    intervals = {}
+    for key in results[0]:
+        values = np.concatenate([r[key] for r in results])
+        low, high = np.percentile(values, [tail, 100 - tail])
+        intervals[key] = (float(low), float(high))
+    return intervals
@@ -0,0 +1,496 @@
+"""
+🗄️ CACHE - Trading Dashboard Pro
+Server-side, disk-backed caches shared by all gunicorn workers
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import sqlite3
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Union
+
+
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parent.parent / "data" / "cache"
+
+
+def content_hash(contents: Union[str, bytes]) -> str:
+    """
+    Content-addressed key for an upload.
+
+    Args:
+        contents: Raw upload contents (data URL string or bytes)
+
+    Returns:
+        Hex digest used as dataset id
+    """
+    if isinstance(contents, str):
+        contents = contents.encode("utf-8")
+    return hashlib.sha256(contents).hexdigest()[:32]
+
+
+class DatasetStore:
+    """
+    Disk-backed LRU store for parsed datasets.
+
+    TrainingDatasets are converted once to Parquet under
+    `<cache_dir>/datasets/<id>.parquet` so later reads can load only the
+    columns they need; anything else (or any dataset when pyarrow is not
+    installed) is pickled to `<id>.pkl`. Writes are atomic (temp file +
+    rename) so concurrent workers never read a partial file; file mtime is
+    the LRU clock and the oldest entries are evicted once the directory
+    exceeds `max_bytes`.
+    """
+
+    FORMATS = (".parquet", ".pkl")
+
+    def __init__(self, cache_dir: Optional[Union[str, Path]] = None, max_bytes: Optional[int] = None):
+        """
+        Initialize the store.
+
+        Args:
+            cache_dir: Root cache directory (default: DATASET_CACHE_DIR env or data/cache)
+            max_bytes: Size budget (default: DATASET_CACHE_MAX_MB env or 512 MB)
+        """
+        root = Path(cache_dir or os.getenv("DATASET_CACHE_DIR", DEFAULT_CACHE_DIR))
+        self.directory = root / "datasets"
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        if max_bytes is None:
+            max_bytes = int(float(os.getenv("DATASET_CACHE_MAX_MB", "512")) * 1024 * 1024)
+        self.max_bytes = max_bytes
+
+    def _path(self, dataset_id: str, suffix: str = ".pkl") -> Path:
+        return self.directory / f"{dataset_id}{suffix}"
+
+    def _find(self, dataset_id: str) -> Optional[Path]:
+        for suffix in self.FORMATS:
+            path = self._path(dataset_id, suffix)
+            if path.exists():
+                return path
+        return None
+
+    def __contains__(self, dataset_id: str) -> bool:
+        return bool(dataset_id) and self._find(dataset_id) is not None
+
+    def get(self, dataset_id: Optional[str], columns: Optional[List[str]] = None) -> Optional[Any]:
+        """
+        Load a dataset and mark it as recently used.
+
+        Args:
+            dataset_id: Id returned by put()
+            columns: Columns to load (Parquet entries only; others load fully)
+
+        Returns:
+            Stored dataset or None if missing/evicted
+        """
+        if not dataset_id:
+            return None
+
+        path = self._find(dataset_id)
+        if path is None:
+            return None
+
+        try:
+            if path.suffix == ".parquet":
+                from utils.dataset import TrainingDataset
+
+                data = TrainingDataset.read_parquet(path, columns=columns)
+            else:
+                with open(path, "rb") as f:
+                    data = pickle.load(f)
+            os.utime(path)  # Touch for LRU
+            return data
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"Error reading cached dataset {dataset_id}: {e}")
+            return None
+
+    def put(self, dataset_id: str, data: Any) -> str:
+        """
+        Store a dataset, then evict least recently used entries if over budget.
+
+        Args:
+            dataset_id: Content hash of the upload
+            data: Parsed dataset
+
+        Returns:
+            The dataset id
+        """
+        # Imported here: utils.jobs needs this module at boot, pandas/pyarrow are not
+        from utils.dataset import TrainingDataset, pa
+
+        path = None
+        if pa is not None and isinstance(data, TrainingDataset):
+            try:
+                path = self._write(dataset_id, ".parquet", data.to_parquet)
+            except Exception as e:
+                # e.g. object columns Arrow cannot type; pickle still works
+                print(f"Parquet write failed for {dataset_id}, pickling instead: {e}")
+
+        if path is None:
+            path = self._write(
+                dataset_id,
+                ".pkl",
+                lambda f: pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL),
+            )
+
+        self._evict(keep=path)
+        return dataset_id
+
+    def _write(self, dataset_id: str, suffix: str, writer) -> Path:
+        """Atomically write `<id><suffix>` with writer(file) and drop other formats."""
+        path = self._path(dataset_id, suffix)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                writer(f)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        for other in self.FORMATS:
+            if other != suffix:
+                self._path(dataset_id, other).unlink(missing_ok=True)
+        return path
+
+    def delete(self, dataset_id: str) -> bool:
+        """Remove a dataset. Returns True if it existed."""
+        removed = False
+        for suffix in self.FORMATS:
+            try:
+                self._path(dataset_id, suffix).unlink()
+                removed = True
+            except FileNotFoundError:
+                pass
+        return removed
+
+    def total_bytes(self) -> int:
+        """Current on-disk size of all stored datasets."""
+        return sum(size for _, _, size in self._entries())
+
+    def _entries(self):
+        """(mtime, path, size) for every stored dataset."""
+        entries = []
+        for path in self.directory.iterdir():
+            if path.suffix not in self.FORMATS:
+                continue
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue  # Evicted by another worker
+            entries.append((stat.st_mtime, path, stat.st_size))
+        return entries
+
+    def _evict(self, keep: Optional[Path] = None):
+        """Delete oldest entries until the store fits in max_bytes."""
+        entries = sorted(self._entries(), key=lambda e: e[0])
+        total = sum(size for _, _, size in entries)
+
+        for _, path, size in entries:
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            total -= size
+
+
+class MetricsCache:
+    """
+    SQLite-backed cache of computed metrics dictionaries.
+
+    Keys are content-addressed (dataset id + calculation parameters), so a
+    repeated upload or a second user opening the same agent is served from
+    the cache by whichever worker receives the request. Entries expire after
+    `ttl` seconds (CACHE_TIMEOUT) and put() deletes expired rows at most
+    once per `ttl`; hit/miss counters live in the same database so stats()
+    reflects all workers.
+    """
+
+    def __init__(self, cache_dir: Optional[Union[str, Path]] = None, ttl: Optional[float] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Root cache directory (default: DATASET_CACHE_DIR env or data/cache)
+            ttl: Entry lifetime in seconds (default: CACHE_TIMEOUT env or 300)
+        """
+        root = Path(cache_dir or os.getenv("DATASET_CACHE_DIR", DEFAULT_CACHE_DIR))
+        root.mkdir(parents=True, exist_ok=True)
+        self.db_path = root / "metrics.sqlite"
+        self.ttl = float(os.getenv("CACHE_TIMEOUT", "300")) if ttl is None else ttl
+        self._last_purge = 0.0  # First put() purges what earlier runs left behind
+
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS metrics ("
+                "key TEXT PRIMARY KEY, value BLOB NOT NULL, created_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_metrics_created ON metrics (created_at)")
+            conn.execute("CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+            conn.execute("INSERT OR IGNORE INTO counters VALUES ('hits', 0), ('misses', 0)")
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # One short-lived connection per call: safe across forked workers
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            with conn:  # Commit on success, rollback on error
+                yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def make_key(dataset_id: str, **params) -> str:
+        """
+        Build a cache key from a dataset id and calculation parameters.
+
+        Args:
+            dataset_id: Content hash of the dataset
+            **params: Parameters that change the result (e.g. initial_balance)
+
+        Returns:
+            Cache key
+        """
+        suffix = ",".join(f"{k}={params[k]}" for k in sorted(params))
+        return f"{dataset_id}:{suffix}" if suffix else dataset_id
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Return cached metrics, or None on miss/expiry.
+
+        Args:
+            key: Cache key from make_key()
+
+        Returns:
+            Metrics dictionary or None
+        """
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT value FROM metrics WHERE key = ? AND created_at >= ?",
+                    (key, time.time() - self.ttl),
+                ).fetchone()
+                counter = "hits" if row else "misses"
+                conn.execute("UPDATE counters SET value = value + 1 WHERE name = ?", (counter,))
+        except sqlite3.Error as e:
+            print(f"Error reading metrics cache: {e}")
+            return None
+
+        return pickle.loads(row[0]) if row else None
+
+    def put(self, key: str, metrics: Dict[str, Any]):
+        """
+        Store a metrics dictionary.
+
+        Args:
+            key: Cache key from make_key()
+            metrics: Result of MetricsCalculator.get_all_metrics()
+        """
+        blob = pickle.dumps(metrics, protocol=pickle.HIGHEST_PROTOCOL)
+        now = time.time()
+        try:
+            with self._connect() as conn:
+                conn.execute("INSERT OR REPLACE INTO metrics VALUES (?, ?, ?)", (key, blob, now))
+                if now - self._last_purge >= self.ttl:
+                    self._purge(conn, now)
+        except sqlite3.Error as e:
+            print(f"Error writing metrics cache: {e}")
+
+    def _purge(self, conn: sqlite3.Connection, now: float) -> int:
+        self._last_purge = now
+        return conn.execute("DELETE FROM metrics WHERE created_at < ?", (now - self.ttl,)).rowcount
+
+    def purge_expired(self) -> int:
+        """Delete expired entries. Returns the number removed."""
+        with self._connect() as conn:
+            return self._purge(conn, time.time())
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Hit/miss counters aggregated across all workers.
+
+        Returns:
+            Dictionary with hits, misses, hit_rate and live entries
+        """
+        with self._connect() as conn:
+            counters = dict(conn.execute("SELECT name, value FROM counters").fetchall())
+            entries = conn.execute(
+                "SELECT COUNT(*) FROM metrics WHERE created_at >= ?",
+                (time.time() - self.ttl,),
+            ).fetchone()[0]
+
+        hits, misses = counters.get("hits", 0), counters.get("misses", 0)
+        total = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / total if total else 0.0,
+            "entries": entries,
+            "ttl_seconds": self.ttl,
+        }
+
+
+class FigureCache:
+    """
+    SQLite-backed cache of serialized Plotly figures.
+
+    Entries are keyed by (dataset id, figure kind, downsampling level) and
+    hold the figure JSON produced on the first build. A hit is returned as
+    a plain dict, which dcc.Graph accepts as-is: no go.Figure is created,
+    so Plotly's property validation only runs on the cold build. As in
+    MetricsCache, put() deletes expired rows at most once per `ttl`.
+    """
+
+    def __init__(self, cache_dir: Optional[Union[str, Path]] = None, ttl: Optional[float] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Root cache directory (default: DATASET_CACHE_DIR env or data/cache)
+            ttl: Entry lifetime in seconds (default: FIGURE_CACHE_TTL env or 3600)
+        """
+        root = Path(cache_dir or os.getenv("DATASET_CACHE_DIR", DEFAULT_CACHE_DIR))
+        root.mkdir(parents=True, exist_ok=True)
+        self.db_path = root / "figures.sqlite"
+        self.ttl = float(os.getenv("FIGURE_CACHE_TTL", "3600")) if ttl is None else ttl
+        self._last_purge = 0.0
+
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS figures ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_figures_created ON figures (created_at)")
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def make_key(dataset_id: str, kind: str, **level) -> str:
+        """
+        Build a cache key.
+
+        Args:
+            dataset_id: Content hash of the dataset
+            kind: Figure kind (e.g. "equity", "winloss")
+            **level: Parameters that change the figure (e.g. max_points)
+
+        Returns:
+            Cache key
+        """
+        return MetricsCache.make_key(dataset_id, kind=kind, **level)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Return a cached figure dict, or None on miss/expiry.
+
+        Args:
+            key: Cache key from make_key()
+
+        Returns:
+            Figure as a {"data": ..., "layout": ...} dict or None
+        """
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT value FROM figures WHERE key = ? AND created_at >= ?",
+                    (key, time.time() - self.ttl),
+                ).fetchone()
+        except sqlite3.Error as e:
+            print(f"Error reading figure cache: {e}")
+            return None
+
+        return json.loads(row[0]) if row else None
+
+    def put(self, key: str, figure_json: str):
+        """
+        Store a serialized figure.
+
+        Args:
+            key: Cache key from make_key()
+            figure_json: Output of go.Figure.to_json()
+        """
+        now = time.time()
+        try:
+            with self._connect() as conn:
+                conn.execute("INSERT OR REPLACE INTO figures VALUES (?, ?, ?)", (key, figure_json, now))
+                if now - self._last_purge >= self.ttl:
+                    self._purge(conn, now)
+        except sqlite3.Error as e:
+            print(f"Error writing figure cache: {e}")
+
+    def get_or_build(self, key: str, build: Callable[[], Any]) -> Dict[str, Any]:
+        """
+        Cached figure dict, building and serializing it once on a miss.
+
+        Args:
+            key: Cache key from make_key()
+            build: Zero-argument callable returning a go.Figure
+
+        Returns:
+            Figure dict (same content as build().to_plotly_json())
+        """
+        figure = self.get(key)
+        if figure is None:
+            figure_json = build().to_json()
+            self.put(key, figure_json)
+            figure = json.loads(figure_json)
+        return figure
+
+    def _purge(self, conn: sqlite3.Connection, now: float) -> int:
+        self._last_purge = now
+        return conn.execute("DELETE FROM figures WHERE created_at < ?", (now - self.ttl,)).rowcount
+
+    def purge_expired(self) -> int:
+        """Delete expired entries. Returns the number removed."""
+        with self._connect() as conn:
+            return self._purge(conn, time.time())
+
+
+_dataset_store: Optional[DatasetStore] = None
+_metrics_cache: Optional[MetricsCache] = None
+_figure_cache: Optional[FigureCache] = None
+
+
+def get_dataset_store() -> DatasetStore:
+    """Process-wide DatasetStore (all workers share the same directory)."""
+    global _dataset_store
+    if _dataset_store is None:
+        _dataset_store = DatasetStore()
+    return _dataset_store
+
+
+def get_metrics_cache() -> MetricsCache:
+    """Process-wide MetricsCache (all workers share the same SQLite file)."""
+    global _metrics_cache
+    if _metrics_cache is None:
+        _metrics_cache = MetricsCache()
+    return _metrics_cache
+
+
+def get_figure_cache() -> FigureCache:
+    """Process-wide FigureCache (all workers share the same SQLite file)."""
+    global _figure_cache
+    if _figure_cache is None:
+        _figure_cache = FigureCache()
+    return _figure_cache
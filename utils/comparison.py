@@ -0,0 +1,265 @@
+"""
+🔀 COMPARISON ENGINE - Trading Dashboard Pro
+Parse many agents in parallel and compute their metrics in one vectorized pass
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from utils.metrics import TRADING_DAYS_PER_YEAR
+
+
+# Upper bound on cells (agents x checkpoints) held in one padded matrix
+MAX_MATRIX_CELLS = 20_000_000
+
+
+# ============================================
+# PARALLEL PARSING
+# ============================================
+
+
+def _parse_agent(job: Tuple[str, str, float]) -> Tuple[str, Optional[np.ndarray], Optional[str]]:
+    """
+    Parse one upload into (name, balance, error). Runs in a worker process.
+
+    Parsed datasets go through the shared on-disk DatasetStore, so an agent
+    already uploaded on the home page is not parsed again.
+    """
+    from utils.cache import content_hash, get_dataset_store
+    from utils.data_loader import DataLoader
+
+    contents, filename, initial_balance = job
+    name = Path(filename).stem
+
+    try:
+        store = get_dataset_store()
+        dataset_id = content_hash(contents)
+        dataset = store.get(dataset_id)
+        if dataset is None:
+            dataset = DataLoader().parse_upload(contents, filename)
+            if dataset is None:
+                return name, None, "parse failed"
+            store.put(dataset_id, dataset)
+
+        name = dataset.metadata.get("agent_name", name)
+        frame = dataset.frame
+        if "balance" in frame.columns:
+            balance = frame["balance"].to_numpy(dtype=np.float64)
+        elif "total_reward" in frame.columns:
+            balance = initial_balance + frame["total_reward"].to_numpy(dtype=np.float64)
+        else:
+            return name, None, "no balance column"
+
+        return name, balance, None
+
+    except Exception as e:
+        return name, None, str(e)
+
+
+def parse_agents(
+    contents_list: List[str],
+    filenames: List[str],
+    initial_balance: float = 10000.0,
+    max_workers: Optional[int] = None,
+    progress: Optional[Callable[[int, int], None]] = None,
+) -> Tuple[List[str], List[np.ndarray], Dict[str, str]]:
+    """
+    Parse N agent uploads, in a process pool when there is more than one.
+
+    Meant to run in a background job (see pages/comparison.py), not in a
+    web worker: the pool forks and parsing 100+ uploads takes minutes.
+
+    Args:
+        contents_list: Base64 data URLs
+        filenames: Original filenames
+        initial_balance: Balance used when only total_reward is present
+        max_workers: Pool size (default: COMPARISON_WORKERS env or CPU count)
+        progress: Called as progress(parsed, total) after each upload
+
+    Returns:
+        Tuple of (names, balance arrays, errors by filename)
+    """
+    jobs = [(c, f, initial_balance) for c, f in zip(contents_list, filenames)]
+    if max_workers is None:
+        max_workers = int(os.getenv("COMPARISON_WORKERS", os.cpu_count() or 1))
+    max_workers = max(1, min(max_workers, len(jobs)))
+
+    results = []
+
+    def collect(parsed):
+        for result in parsed:
+            results.append(result)
+            if progress is not None:
+                progress(len(results), len(jobs))
+
+    if max_workers == 1:
+        collect(map(_parse_agent, jobs))
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            collect(pool.map(_parse_agent, jobs))
+
+    names, balances, errors = [], [], {}
+    for filename, (name, balance, error) in zip(filenames, results):
+        if error or balance is None or len(balance) == 0:
+            errors[filename] = error or "empty dataset"
+            continue
+        names.append(name)
+        balances.append(balance)
+
+    return names, balances, errors
+
+
+# ============================================
+# VECTORIZED METRICS
+# ============================================
+
+
+def _padded_matrix(balances: List[np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+    """Stack ragged balance arrays into an (agents x max_len) NaN-padded matrix."""
+    lengths = np.array([len(b) for b in balances], dtype=np.int64)
+    matrix = np.full((len(balances), int(lengths.max())), np.nan)
+    for row, balance in enumerate(balances):
+        matrix[row, :len(balance)] = balance
+    return matrix, lengths
+
+
+def _matrix_metrics(
+    matrix: np.ndarray,
+    lengths: np.ndarray,
+    initial_balance: float,
+    risk_free_rate: float,
+) -> Dict[str, np.ndarray]:
+    """
+    Whole-history metrics for every row of a padded balance matrix.
+
+    Same definitions as MetricsKernel; padding is NaN and is ignored by
+    the nan-aware reductions.
+    """
+    rows = np.arange(len(lengths))
+    daily_rf = risk_free_rate / TRADING_DAYS_PER_YEAR
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns = np.empty_like(matrix)
+        returns[:, 0] = 0.0
+        returns[:, 1:] = matrix[:, 1:] / matrix[:, :-1] - 1
+        pnl = np.empty_like(matrix)
+        pnl[:, 0] = 0.0
+        pnl[:, 1:] = np.diff(matrix, axis=1)
+
+        running_max = np.fmax.accumulate(matrix, axis=1)
+        drawdown_dollars = matrix - running_max
+        drawdown_pct = drawdown_dollars / running_max * 100
+
+        final_balance = matrix[rows, lengths - 1]
+
+        mean = np.nanmean(returns, axis=1)
+        std = np.nanstd(returns, axis=1)
+        sharpe = np.where((lengths >= 2) & (std > 0), (mean - daily_rf) / std * np.sqrt(TRADING_DAYS_PER_YEAR), 0.0)
+
+        downside = np.where(returns < daily_rf, returns, np.nan)
+        has_downside = np.any(returns < daily_rf, axis=1)
+        downside_std = np.full(len(lengths), np.nan)
+        if has_downside.any():
+            downside_std[has_downside] = np.nanstd(downside[has_downside], axis=1)
+        sortino = np.where(
+            (lengths >= 2) & has_downside & (downside_std > 0),
+            (mean - daily_rf) / downside_std * np.sqrt(TRADING_DAYS_PER_YEAR),
+            0.0,
+        )
+
+        max_dd = np.nanmin(drawdown_pct, axis=1)
+        max_dd_dollars = np.nanmin(drawdown_dollars, axis=1)
+        ulcer = np.sqrt(np.nanmean(drawdown_pct ** 2, axis=1))
+        pain = np.nanmean(np.abs(drawdown_pct), axis=1)
+
+        var = np.nanpercentile(returns, 5, axis=1)
+        tail = np.where(returns <= var[:, None], returns, np.nan)
+        cvar = np.nanmean(tail, axis=1)
+
+        gains = np.nansum(np.where(pnl > 0, pnl, 0.0), axis=1)
+        losses = -np.nansum(np.where(pnl < 0, pnl, 0.0), axis=1)
+        profit_factor = np.where(losses > 0, gains / losses, np.where(gains > 0, gains, 0.0))
+
+        years = np.maximum(0.1, lengths / 1000)
+        cagr = ((final_balance / initial_balance) ** (1 / years) - 1) * 100
+        calmar = np.where(max_dd != 0, cagr / np.abs(max_dd), 0.0)
+
+        net_profit = final_balance - initial_balance
+        recovery = np.where(
+            max_dd_dollars != 0,
+            np.abs(net_profit / max_dd_dollars),
+            np.where(net_profit > 0, net_profit, 0.0),
+        )
+
+    short = lengths < 2
+    var = np.where(short, 0.0, var * 100)
+    cvar = np.where(short, 0.0, cvar * 100)
+
+    return {
+        "checkpoints": lengths,
+        "final_balance": final_balance,
+        "roi_percent": net_profit / initial_balance * 100,
+        "sharpe_ratio": sharpe,
+        "sortino_ratio": sortino,
+        "max_drawdown_pct": max_dd,
+        "calmar_ratio": calmar,
+        "var_95": var,
+        "cvar_95": cvar,
+        "profit_factor": profit_factor,
+        "recovery_factor": recovery,
+        "ulcer_index": ulcer,
+        "pain_index": pain,
+        "cagr": cagr,
+    }
+
+
+def compare_metrics(
+    names: List[str],
+    balances: List[np.ndarray],
+    initial_balance: float = 10000.0,
+    risk_free_rate: float = 0.02,
+    sort_by: str = "sharpe_ratio",
+) -> pd.DataFrame:
+    """
+    Ranked metrics table for many agents.
+
+    Agents are grouped by history length (to limit padding) into chunks of
+    at most MAX_MATRIX_CELLS cells; each chunk is one vectorized pass.
+
+    Args:
+        names: Agent names
+        balances: Balance array per agent
+        initial_balance: Starting account balance
+        risk_free_rate: Annual risk-free rate
+        sort_by: Ranking column (descending)
+
+    Returns:
+        DataFrame with one row per agent and a 1-based `rank` column
+    """
+    if not balances:
+        return pd.DataFrame()
+
+    order = np.argsort([len(b) for b in balances])
+    frames = []
+    start = 0
+    while start < len(order):
+        # Grow the chunk while the padded matrix fits the budget
+        end = start + 1
+        while end < len(order) and (end + 1 - start) * len(balances[order[end]]) <= MAX_MATRIX_CELLS:
+            end += 1
+        chunk = order[start:end]
+
+        matrix, lengths = _padded_matrix([balances[i] for i in chunk])
+        metrics = _matrix_metrics(matrix, lengths, initial_balance, risk_free_rate)
+        frames.append(pd.DataFrame({"agent": [names[i] for i in chunk], **metrics}))
+        start = end
+
+    table = pd.concat(frames, ignore_index=True)
+    table = table.sort_values(sort_by, ascending=False, ignore_index=True)
+    table.insert(0, "rank", np.arange(1, len(table) + 1))
+    return table
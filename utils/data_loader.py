@@ -6,12 +6,30 @@ Handles loading and parsing of trading data from various sources
 import base64
 import io
 import json
+import os
+import tempfile
 import zipfile
 from pathlib import Path
-from typing import Optional, List, Dict, Union
+from typing import Any, BinaryIO, Optional, List, Dict, Union
 
+import numpy as np
 import pandas as pd
 
+from utils.dataset import TrainingDataset
+from utils.profiling import observe_size, timed
+
+try:
+    import ijson  # Incremental JSON parser (optional)
+except ImportError:
+    ijson = None
+
+
+# Streaming ingestion tuning
+B64_CHUNK_CHARS = 4 * 1024 * 1024  # Multiple of 4: decodes to 3 MB per chunk
+SPOOL_MAX_BYTES = 8 * 1024 * 1024  # Spill decoded uploads to disk beyond this
+CSV_CHUNK_ROWS = 100_000
+JSON_BATCH_ROWS = 50_000  # Checkpoint dicts held at once while streaming JSON
+
 
 class DataLoader:
     """
@@ -22,14 +40,14 @@ class DataLoader:
     - Direct JSON files
     - CSV files
     - Excel files
+    - Parquet and Arrow IPC (Feather) files
     """
 
     def __init__(self):
-        self.supported_formats = [".zip", ".json", ".csv", ".xlsx"]
+        self.supported_formats = [".zip", ".json", ".csv", ".xlsx", ".parquet", ".feather", ".arrow"]
+        self.max_upload_bytes = int(float(os.getenv("MAX_UPLOAD_SIZE_MB", "50")) * 1024 * 1024)
 
-    def parse_upload(
-        self, contents: str, filename: str
-    ) -> Optional[Union[List[Dict], pd.DataFrame]]:
+    def parse_upload(self, contents: str, filename: str) -> Optional[TrainingDataset]:
         """
         Parse uploaded file contents.
 
@@ -38,47 +56,252 @@ class DataLoader:
             filename: Original filename
 
         Returns:
-            Parsed data or None if error
+            TrainingDataset or None if error
         """
         try:
-            # Decode base64
-            content_type, content_string = contents.split(",")
-            decoded = base64.b64decode(content_string)
-
             # Get file extension
             file_ext = Path(filename).suffix.lower()
-
-            if file_ext == ".zip":
-                return self._parse_zip(decoded)
-            elif file_ext == ".json":
-                return self._parse_json(decoded)
-            elif file_ext == ".csv":
-                return self._parse_csv(decoded)
-            elif file_ext == ".xlsx":
-                return self._parse_excel(decoded)
-            else:
+            if file_ext not in self.supported_formats:
                 raise ValueError(f"Unsupported file format: {file_ext}")
 
+            observe_size("upload", len(contents))
+
+            # Decode base64 in chunks into a spooled temp file
+            with timed("base64_decode"):
+                spool = self._decode_to_spool(contents)
+            with spool as decoded, timed("parse"):
+                if file_ext == ".zip":
+                    return self._parse_zip(decoded)
+                elif file_ext == ".json":
+                    return self._parse_json(decoded)
+                elif file_ext == ".csv":
+                    return self._parse_csv(decoded)
+                elif file_ext == ".xlsx":
+                    return self._parse_excel(decoded)
+                elif file_ext == ".parquet":
+                    return self._parse_parquet(decoded)
+                elif file_ext in (".feather", ".arrow"):
+                    return self._parse_feather(decoded)
+
         except Exception as e:
             print(f"Error parsing upload: {e}")
             return None
 
-    def _parse_zip(self, data: bytes) -> Optional[List[Dict]]:
+    def _decode_to_spool(self, contents: str) -> BinaryIO:
+        """
+        Decode a base64 data URL without materializing the full payload.
+
+        Decoded chunks go to a SpooledTemporaryFile that stays in memory up
+        to SPOOL_MAX_BYTES and spills to disk beyond, so peak memory does
+        not grow with archive size.
+
+        Args:
+            contents: Data URL ("data:<type>;base64,<payload>")
+
+        Returns:
+            Seekable binary file positioned at the start
+        """
+        start = contents.index(",") + 1
+        spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES)
+        written = 0
+
+        try:
+            for offset in range(start, len(contents), B64_CHUNK_CHARS):
+                chunk = base64.b64decode(contents[offset:offset + B64_CHUNK_CHARS])
+                written += len(chunk)
+                if written > self.max_upload_bytes:
+                    raise ValueError(
+                        f"Upload exceeds {self.max_upload_bytes // (1024 * 1024)} MB limit"
+                    )
+                spool.write(chunk)
+        except Exception:
+            spool.close()
+            raise
+
+        spool.seek(0)
+        return spool
+
+    @staticmethod
+    def _as_file(data: Union[bytes, BinaryIO]) -> BinaryIO:
+        """Accept raw bytes or an open binary file."""
+        return io.BytesIO(data) if isinstance(data, (bytes, bytearray)) else data
+
+    @classmethod
+    def _load_json_stream(cls, fileobj: BinaryIO) -> Any:
+        """
+        Parse a JSON document incrementally.
+
+        With ijson, top-level arrays and `checkpoints` arrays are consumed
+        item by item and turned into a DataFrame every JSON_BATCH_ROWS rows,
+        so neither the raw text nor the full list of checkpoint dicts is
+        ever held. Other top-level objects are parsed key by key. Falls back
+        to json.load when ijson is not installed.
+
+        Top-level lists of scalars (columnar training_stats) are converted
+        to NumPy arrays as soon as each key is parsed.
+
+        Args:
+            fileobj: Binary file positioned at the start of the document
+
+        Returns:
+            Parsed document (columnar lists as NumPy arrays)
+        """
+        if ijson is None:
+            data = json.load(io.TextIOWrapper(fileobj, encoding="utf-8"))
+            if isinstance(data, dict):
+                data = {key: cls._to_column(value) for key, value in data.items()}
+            return data
+
+        # Peek at the first significant byte to pick the iteration prefix
+        head = fileobj.read(64).lstrip(b"\xef\xbb\xbf \t\r\n")
+        fileobj.seek(0)
+
+        if head.startswith(b"["):
+            return cls._records_frame(ijson.items(fileobj, "item", use_float=True))
+        if head.startswith(b"{"):
+            return cls._load_json_object(fileobj)
+        return json.load(io.TextIOWrapper(fileobj, encoding="utf-8"))
+
+    @classmethod
+    def _load_json_object(cls, fileobj: BinaryIO) -> Dict[str, Any]:
+        """
+        Parse a top-level JSON object with ijson.
+
+        A `checkpoints` array is iterated item by item (only the checkpoints
+        are kept, as _normalize_json would do); any other object is read
+        key by key, columnar lists becoming NumPy arrays.
+        """
+        if cls._mentions(fileobj, b'"checkpoints"'):
+            checkpoints = cls._records_frame(ijson.items(fileobj, "checkpoints.item", use_float=True))
+            fileobj.seek(0)
+            if len(checkpoints):
+                return {"checkpoints": checkpoints}
+
+        return {key: cls._to_column(value) for key, value in ijson.kvitems(fileobj, "", use_float=True)}
+
+    @staticmethod
+    def _mentions(fileobj: BinaryIO, token: bytes, chunk_size: int = 1024 * 1024) -> bool:
+        """Whether the raw bytes contain token (cheap pre-scan, rewinds the file)."""
+        tail = b""
+        try:
+            while True:
+                chunk = fileobj.read(chunk_size)
+                if not chunk:
+                    return False
+                if token in tail + chunk:
+                    return True
+                tail = chunk[-(len(token) - 1):]
+        finally:
+            fileobj.seek(0)
+
+    @staticmethod
+    def _records_frame(items) -> pd.DataFrame:
+        """Build checkpoint rows from an iterable of dicts, JSON_BATCH_ROWS at a time."""
+        frames = []
+        batch: List[Dict] = []
+        for item in items:
+            batch.append(item)
+            if len(batch) == JSON_BATCH_ROWS:
+                frames.append(pd.DataFrame.from_records(batch))
+                batch = []
+        if batch or not frames:
+            frames.append(pd.DataFrame.from_records(batch))
+        return pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+
+    @staticmethod
+    def _to_column(value: Any) -> Any:
+        """Convert a list of numbers to a NumPy array; leave anything else as is."""
+        if not isinstance(value, list) or len(value) < 2 or isinstance(value[0], (dict, list)):
+            return value
+
+        try:
+            column = np.asarray(value)
+            if column.dtype.kind == "O":
+                # Numbers mixed with nulls
+                column = np.asarray(value, dtype=np.float64)
+        except (TypeError, ValueError):
+            return value
+
+        return column if column.dtype.kind in "biuf" else value
+
+    @staticmethod
+    def _columnar_frame(data: Dict[str, Any]) -> Optional[pd.DataFrame]:
+        """
+        Build a DataFrame from a dict-of-lists payload.
+
+        Columns shorter than the longest one are right-aligned (metrics such
+        as `roi_percent` usually start one checkpoint late) and padded with
+        NaN. Scalar fields (agent_name, algorithm, ...) go to `df.attrs`.
+
+        Args:
+            data: Parsed JSON object with NumPy array columns
+
+        Returns:
+            DataFrame, or None if the payload is not columnar
+        """
+        columns = {key: value for key, value in data.items() if isinstance(value, np.ndarray)}
+        if len(columns) < 2:
+            return None
+
+        n_rows = max(len(column) for column in columns.values())
+        for key, column in columns.items():
+            if len(column) < n_rows:
+                padded = np.full(n_rows, np.nan)
+                padded[n_rows - len(column):] = column
+                columns[key] = padded
+
+        df = pd.DataFrame(columns, copy=False)
+        df.attrs["metadata"] = {key: value for key, value in data.items() if key not in columns}
+        return df
+
+    def _normalize_json(self, data: Any) -> Union[List[Dict], pd.DataFrame]:
+        """
+        Normalize a parsed JSON document to checkpoint rows.
+
+        Handles:
+        - List of checkpoints (already a DataFrame when streamed)
+        - Dict with a 'checkpoints' key
+        - Columnar dict of lists (training_stats format)
+        - Single checkpoint dict
+        """
+        if isinstance(data, dict):
+            if "checkpoints" in data:
+                data = data["checkpoints"]
+            else:
+                frame = self._columnar_frame(data)
+                if frame is not None:
+                    return frame
+                # If dict, convert to list with single item
+                data = [data]
+
+        if isinstance(data, pd.DataFrame):
+            return data
+        if not isinstance(data, list):
+            raise ValueError("Data must be a list of checkpoints or dict with 'checkpoints' key")
+
+        return data
+
+    @staticmethod
+    def _read_csv_chunked(fileobj: BinaryIO) -> pd.DataFrame:
+        """Read CSV in row chunks so the raw text is never held at once."""
+        chunks = pd.read_csv(fileobj, chunksize=CSV_CHUNK_ROWS)
+        return pd.concat(chunks, ignore_index=True)
+
+    def _parse_zip(self, data: Union[bytes, BinaryIO]) -> Optional[TrainingDataset]:
         """
         Parse ZIP file - ACCEPTS ALL ZIPS with trading data.
 
         Tries in order:
         1. training_stats.json (preferred)
         2. Any .json file
-        3. Any .csv file
-        4. Any .xlsx file
+        3. Any .parquet/.feather/.arrow file
+        4. Any .csv file
+        5. Any .xlsx file
 
         Works with nested folders too!
         """
         try:
-            zip_bytes = io.BytesIO(data)
-
-            with zipfile.ZipFile(zip_bytes, "r") as zip_ref:
+            with zipfile.ZipFile(self._as_file(data), "r") as zip_ref:
                 all_files = [f for f in zip_ref.namelist() if not f.endswith('/')]
 
                 # Priority 1: training_stats.json (exact match)
@@ -95,90 +318,109 @@ class DataLoader:
                         target_file = json_files[0]
                         print(f"📄 Found JSON file: {target_file}")
 
-                # Priority 3: ANY .csv file
+                # Priority 3: ANY columnar (Parquet / Arrow IPC) file
+                if not target_file:
+                    columnar_files = [f for f in all_files if f.lower().endswith((".parquet", ".feather", ".arrow"))]
+                    if columnar_files:
+                        target_file = columnar_files[0]
+                        print(f"🧱 Found columnar file: {target_file}")
+                        with zip_ref.open(target_file) as columnar_file:
+                            if target_file.lower().endswith(".parquet"):
+                                dataset = TrainingDataset.read_parquet(columnar_file)
+                            else:
+                                dataset = TrainingDataset.read_feather(columnar_file)
+                        dataset.source = target_file
+                        return dataset
+
+                # Priority 4: ANY .csv file
                 if not target_file:
                     csv_files = [f for f in all_files if f.lower().endswith(".csv")]
                     if csv_files:
                         target_file = csv_files[0]
                         print(f"📊 Found CSV file: {target_file}")
-                        # Parse CSV and convert to list of dicts
                         with zip_ref.open(target_file) as csv_file:
-                            df = pd.read_csv(csv_file)
-                            return df.to_dict('records')
+                            df = self._read_csv_chunked(csv_file)
+                            return TrainingDataset.from_parsed(df, source=target_file)
 
-                # Priority 4: ANY .xlsx file
+                # Priority 5: ANY .xlsx file
                 if not target_file:
                     excel_files = [f for f in all_files if f.lower().endswith((".xlsx", ".xls"))]
                     if excel_files:
                         target_file = excel_files[0]
                         print(f"📈 Found Excel file: {target_file}")
-                        # Parse Excel and convert to list of dicts
                         with zip_ref.open(target_file) as excel_file:
                             df = pd.read_excel(excel_file)
-                            return df.to_dict('records')
+                            return TrainingDataset.from_parsed(df, source=target_file)
 
                 if not target_file:
                     raise ValueError(
                         f"❌ No data file found in ZIP.\n"
                         f"📦 ZIP contains: {', '.join(all_files[:5])}\n"
-                        f"✅ Supported: .json, .csv, .xlsx"
+                        f"✅ Supported: .json, .parquet, .feather, .csv, .xlsx"
                     )
 
                 # Parse JSON file
                 print(f"✅ Loading: {target_file}")
                 with zip_ref.open(target_file) as json_file:
-                    data = json.load(json_file)
-
-                    # Handle both list and dict formats
-                    if isinstance(data, dict):
-                        # If dict, convert to list with single item
-                        if "checkpoints" in data:
-                            data = data["checkpoints"]
-                        else:
-                            data = [data]
-
-                    if not isinstance(data, list):
-                        raise ValueError("Data must be a list of checkpoints or dict with 'checkpoints' key")
-
-                    return data
+                    data = self._normalize_json(self._load_json_stream(json_file))
+                    return TrainingDataset.from_parsed(data, source=target_file)
 
         except Exception as e:
             print(f"❌ Error parsing ZIP: {e}")
             return None
 
-    def _parse_json(self, data: bytes) -> Optional[List[Dict]]:
+    def _parse_json(self, data: Union[bytes, BinaryIO]) -> Optional[TrainingDataset]:
         """Parse JSON file."""
         try:
-            json_data = json.loads(data.decode("utf-8"))
-            return json_data
+            json_data = self._load_json_stream(self._as_file(data))
+            return TrainingDataset.from_parsed(self._normalize_json(json_data))
         except Exception as e:
             print(f"Error parsing JSON: {e}")
             return None
 
-    def _parse_csv(self, data: bytes) -> Optional[pd.DataFrame]:
+    def _parse_csv(self, data: Union[bytes, BinaryIO]) -> Optional[TrainingDataset]:
         """Parse CSV file."""
         try:
-            df = pd.read_csv(io.BytesIO(data))
-            return df
+            df = self._read_csv_chunked(self._as_file(data))
+            return TrainingDataset.from_parsed(df)
         except Exception as e:
             print(f"Error parsing CSV: {e}")
             return None
 
-    def _parse_excel(self, data: bytes) -> Optional[pd.DataFrame]:
+    def _parse_excel(self, data: Union[bytes, BinaryIO]) -> Optional[TrainingDataset]:
         """Parse Excel file."""
         try:
-            df = pd.read_excel(io.BytesIO(data))
-            return df
+            df = pd.read_excel(self._as_file(data))
+            return TrainingDataset.from_parsed(df)
         except Exception as e:
             print(f"Error parsing Excel: {e}")
             return None
 
-    def load_local_file(self, filepath: Union[str, Path]) -> Optional[Union[List[Dict], pd.DataFrame]]:
+    def _parse_parquet(self, data: Union[bytes, BinaryIO]) -> Optional[TrainingDataset]:
+        """Parse Parquet file."""
+        try:
+            return TrainingDataset.read_parquet(self._as_file(data))
+        except Exception as e:
+            print(f"Error parsing Parquet: {e}")
+            return None
+
+    def _parse_feather(self, data: Union[bytes, BinaryIO]) -> Optional[TrainingDataset]:
+        """Parse Arrow IPC (Feather) file."""
+        try:
+            return TrainingDataset.read_feather(self._as_file(data))
+        except Exception as e:
+            print(f"Error parsing Arrow file: {e}")
+            return None
+
+    def load_local_file(
+        self, filepath: Union[str, Path], columns: Optional[List[str]] = None
+    ) -> Optional[TrainingDataset]:
         """
         Load data from local file.
 
         Args:
             filepath: Path to file
+            columns: Columns to load (Parquet/Arrow only; memory-mapped reads)
 
         Returns:
             Parsed data or None
@@ -191,12 +433,17 @@ class DataLoader:
 
         try:
             if filepath.suffix == ".json":
-                with open(filepath, "r", encoding="utf-8") as f:
-                    return json.load(f)
+                with open(filepath, "rb") as f:
+                    data = self._normalize_json(self._load_json_stream(f))
+                return TrainingDataset.from_parsed(data, source=str(filepath))
             elif filepath.suffix == ".csv":
-                return pd.read_csv(filepath)
+                return TrainingDataset.from_parsed(pd.read_csv(filepath), source=str(filepath))
             elif filepath.suffix == ".xlsx":
-                return pd.read_excel(filepath)
+                return TrainingDataset.from_parsed(pd.read_excel(filepath), source=str(filepath))
+            elif filepath.suffix == ".parquet":
+                return TrainingDataset.read_parquet(filepath, columns=columns)
+            elif filepath.suffix in (".feather", ".arrow"):
+                return TrainingDataset.read_feather(filepath, columns=columns)
             else:
                 raise ValueError(f"Unsupported format: {filepath.suffix}")
 
@@ -0,0 +1,203 @@
+"""
+🧱 DATASET - Trading Dashboard Pro
+Typed in-memory container for one parsed training log
+"""
+
+import json
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from utils.profiling import timed
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+
+INT32_MIN, INT32_MAX = np.iinfo(np.int32).min, np.iinfo(np.int32).max
+
+# Arrow schema metadata key holding TrainingDataset.metadata/source
+ARROW_METADATA_KEY = b"trading_dashboard"
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise ImportError("pyarrow is required for Parquet/Arrow support (pip install pyarrow)")
+
+
+def compact_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Downcast numeric columns in place where no value changes.
+
+    - float64 -> float32 if every value round-trips exactly
+    - int64 -> int32 if every value fits
+
+    Args:
+        df: DataFrame to compact
+
+    Returns:
+        The same DataFrame
+    """
+    for column in df.columns:
+        values = df[column].to_numpy()
+
+        if values.dtype == np.float64:
+            # Out-of-range values overflow to inf and fail the round-trip check
+            with np.errstate(over="ignore"):
+                narrowed = values.astype(np.float32)
+            if np.array_equal(narrowed.astype(np.float64), values, equal_nan=True):
+                df[column] = narrowed
+        elif values.dtype == np.int64 and len(values):
+            if values.min() >= INT32_MIN and values.max() <= INT32_MAX:
+                df[column] = values.astype(np.int32)
+
+    return df
+
+
+class TrainingDataset:
+    """
+    One uploaded training log, materialized exactly once.
+
+    DataLoader returns this object; MetricsCalculator, the chart builders
+    and the dataset store all share the same `frame` by reference instead
+    of rebuilding DataFrames from lists of records.
+    """
+
+    def __init__(self, frame: pd.DataFrame, metadata: Optional[Dict[str, Any]] = None, source: str = ""):
+        """
+        Wrap an already-built DataFrame.
+
+        Args:
+            frame: One row per checkpoint
+            metadata: Scalar fields (agent_name, algorithm, ...)
+            source: File the data came from
+        """
+        self.frame = frame
+        self.metadata = metadata if metadata is not None else frame.attrs.pop("metadata", {})
+        self.source = source
+
+    @classmethod
+    def from_parsed(
+        cls,
+        data: Union["TrainingDataset", pd.DataFrame, List[Dict]],
+        source: str = "",
+        compact: bool = True,
+    ) -> "TrainingDataset":
+        """
+        Build a dataset from any parser output.
+
+        Args:
+            data: DataFrame, list of checkpoint dicts, or an existing dataset
+            source: File the data came from
+            compact: Downcast numeric columns where lossless
+
+        Returns:
+            TrainingDataset
+        """
+        if isinstance(data, cls):
+            return data
+
+        with timed("dataframe_build"):
+            frame = data if isinstance(data, pd.DataFrame) else pd.DataFrame.from_records(data)
+            if compact:
+                compact_dtypes(frame)
+        return cls(frame, source=source)
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self.frame.columns)
+
+    @property
+    def nbytes(self) -> int:
+        """In-memory size of the numeric columns."""
+        return int(self.frame.memory_usage(index=True).sum())
+
+    def to_csv(self, *args, **kwargs):
+        """Proxy to DataFrame.to_csv (used by dcc.send_data_frame)."""
+        return self.frame.to_csv(*args, **kwargs)
+
+    # ============================================
+    # COLUMNAR PERSISTENCE (Parquet / Arrow IPC)
+    # ============================================
+
+    def to_arrow(self) -> "pa.Table":
+        """Arrow table with metadata/source embedded in the schema."""
+        _require_pyarrow()
+        table = pa.Table.from_pandas(self.frame, preserve_index=False)
+        extra = json.dumps({"metadata": self.metadata, "source": self.source}, default=str)
+        schema_metadata = dict(table.schema.metadata or {})
+        schema_metadata[ARROW_METADATA_KEY] = extra.encode("utf-8")
+        return table.replace_schema_metadata(schema_metadata)
+
+    @classmethod
+    def from_arrow(cls, table: "pa.Table") -> "TrainingDataset":
+        """Rebuild a dataset from an Arrow table written by to_arrow()."""
+        extra = (table.schema.metadata or {}).get(ARROW_METADATA_KEY)
+        info = json.loads(extra) if extra else {}
+        return cls(table.to_pandas(), metadata=info.get("metadata", {}), source=info.get("source", ""))
+
+    def to_parquet(self, path: Union[str, Path, BinaryIO]):
+        """Write as Parquet (compressed, column-selective reads)."""
+        pq.write_table(self.to_arrow(), path)
+
+    def to_feather(self, path: Union[str, Path, BinaryIO]):
+        """Write as uncompressed Arrow IPC (memory-mappable, zero-copy reads)."""
+        feather.write_feather(self.to_arrow(), path, compression="uncompressed")
+
+    @classmethod
+    def read_parquet(
+        cls,
+        source: Union[str, Path, BinaryIO],
+        columns: Optional[List[str]] = None,
+    ) -> "TrainingDataset":
+        """
+        Read a Parquet file, optionally only some columns.
+
+        Args:
+            source: Path or binary file
+            columns: Columns to load (missing names are ignored)
+
+        Returns:
+            TrainingDataset
+        """
+        _require_pyarrow()
+        parquet_file = pq.ParquetFile(source, memory_map=isinstance(source, (str, Path)))
+        if columns is not None:
+            columns = [c for c in columns if c in parquet_file.schema_arrow.names]
+        return cls.from_arrow(parquet_file.read(columns=columns))
+
+    @classmethod
+    def read_feather(
+        cls,
+        source: Union[str, Path, BinaryIO],
+        columns: Optional[List[str]] = None,
+    ) -> "TrainingDataset":
+        """
+        Read an Arrow IPC (Feather v2) file, memory-mapped when given a path.
+
+        Args:
+            source: Path or binary file
+            columns: Columns to load (missing names are ignored)
+
+        Returns:
+            TrainingDataset
+        """
+        _require_pyarrow()
+        memory_map = isinstance(source, (str, Path))
+        if columns is not None:
+            # Schema only: the footer is read, not the columns
+            schema_source = pa.memory_map(str(source)) if memory_map else source
+            names = pa.ipc.open_file(schema_source).schema.names
+            columns = [c for c in columns if c in names]
+            if hasattr(source, "seek"):
+                source.seek(0)
+        return cls.from_arrow(feather.read_table(source, columns=columns, memory_map=memory_map))
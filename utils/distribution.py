@@ -0,0 +1,106 @@
+"""
+📶 RETURNS DISTRIBUTION - Trading Dashboard Pro
+Server-side histogram, binned KDE and tail statistics
+"""
+
+from typing import Dict
+
+import numpy as np
+
+from utils.metrics import MetricsKernel
+
+
+DEFAULT_BINS = 60
+
+# Fine grid for the binned KDE (independent of history length)
+KDE_GRID_POINTS = 512
+
+# Quantiles bounding the plotted range; the rest is reported as outliers
+RANGE_QUANTILES = (0.001, 0.999)
+
+
+def _binned_kde(counts: np.ndarray, bin_width: float, bandwidth: float) -> np.ndarray:
+    """
+    Gaussian KDE evaluated on the bin centres of a fine histogram.
+
+    Convolving bin counts with a sampled Gaussian costs O(grid) instead
+    of O(n x grid) for a direct KDE.
+
+    Args:
+        counts: Fine-grid histogram counts
+        bin_width: Width of one grid bin
+        bandwidth: Kernel standard deviation
+
+    Returns:
+        Density per grid point (integrates to 1 over the grid range)
+    """
+    total = counts.sum()
+    if total == 0 or bandwidth <= 0:
+        return np.zeros(len(counts), dtype=np.float64)
+
+    # Kernel no longer than the grid, so mode="same" keeps the grid length
+    half_width = min((len(counts) - 1) // 2, int(np.ceil(4 * bandwidth / bin_width)))
+    offsets = np.arange(-half_width, half_width + 1) * bin_width
+    kernel = np.exp(-0.5 * (offsets / bandwidth) ** 2) / (bandwidth * np.sqrt(2 * np.pi))
+    return np.convolve(counts, kernel, mode="same") / total
+
+
+def returns_distribution(
+    kernel: MetricsKernel,
+    bins: int = DEFAULT_BINS,
+    grid_points: int = KDE_GRID_POINTS,
+    confidence: float = 0.95,
+) -> Dict:
+    """
+    Everything the distribution chart needs, with a size independent of n.
+
+    The histogram, the KDE grid and the tail statistics (moments, VaR,
+    CVaR) all reuse the kernel's returns, sorted returns and central
+    moments; raw returns never leave the server.
+
+    Args:
+        kernel: Metrics kernel of the dataset
+        bins: Histogram bins
+        grid_points: KDE grid resolution
+        confidence: VaR/CVaR confidence level
+
+    Returns:
+        Dictionary with bin_centers/counts/bin_width, kde_x/kde_y (in
+        percent), outliers and tail statistics
+    """
+    if kernel.n < 2:
+        return {}
+
+    returns = kernel.returns
+    low, high = kernel.quantile(RANGE_QUANTILES[0]), kernel.quantile(RANGE_QUANTILES[1])
+    if high <= low:
+        low, high = low - 1e-6, high + 1e-6
+
+    counts, edges = np.histogram(returns, bins=bins, range=(low, high))
+    fine_counts, fine_edges = np.histogram(returns, bins=grid_points, range=(low, high))
+    fine_width = fine_edges[1] - fine_edges[0]
+
+    # Silverman's rule of thumb
+    std = kernel.returns_std
+    iqr = kernel.quantile(0.75) - kernel.quantile(0.25)
+    spread = min(std, iqr / 1.34) if iqr > 0 else std
+    bandwidth = 0.9 * spread * kernel.n ** (-1 / 5)
+    density = _binned_kde(fine_counts.astype(np.float64), fine_width, bandwidth)
+
+    return {
+        "bin_centers": ((edges[:-1] + edges[1:]) / 2 * 100).tolist(),
+        "bin_width": float(edges[1] - edges[0]) * 100,
+        "counts": counts.tolist(),
+        # Density per percentage point, scaled to histogram counts by the caller
+        "kde_x": ((fine_edges[:-1] + fine_edges[1:]) / 2 * 100).tolist(),
+        "kde_y": (density / 100).tolist(),
+        "outliers": int(kernel.n - counts.sum()),
+        "n": kernel.n,
+        "mean_pct": kernel.returns_mean * 100,
+        "std_pct": std * 100,
+        "skewness": kernel.skewness,
+        "kurtosis": kernel.kurtosis,
+        "var_pct": kernel.var(confidence),
+        "cvar_pct": kernel.cvar(confidence),
+        "confidence": confidence,
+    }
@@ -0,0 +1,336 @@
+"""
+📉 DOWNSAMPLING - Trading Dashboard Pro
+Server-side point reduction for long equity curves
+"""
+
+from typing import Optional, Tuple
+
+import numpy as np
+
+
+DEFAULT_MAX_POINTS = 2000
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets selection.
+
+    Keeps the first and last points and, for each of the n_out - 2 buckets
+    in between, the point forming the largest triangle with the previously
+    selected point and the average of the next bucket.
+
+    Args:
+        x: X values (monotonic)
+        y: Y values
+        n_out: Number of points to keep
+
+    Returns:
+        Sorted indices of the selected points
+    """
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    anchor = 0
+
+    for i in range(n_out - 2):
+        start, end = edges[i], max(edges[i + 1], edges[i] + 1)
+
+        # Average of the next bucket (or the last point)
+        if i + 2 < len(edges):
+            next_start, next_end = edges[i + 1], max(edges[i + 2], edges[i + 1] + 1)
+            avg_x, avg_y = x[next_start:next_end].mean(), y[next_start:next_end].mean()
+        else:
+            avg_x, avg_y = x[-1], y[-1]
+
+        bucket_x, bucket_y = x[start:end], y[start:end]
+        area = np.abs(
+            (x[anchor] - avg_x) * (bucket_y - y[anchor])
+            - (x[anchor] - bucket_x) * (avg_y - y[anchor])
+        )
+        anchor = start + int(np.nanargmax(area)) if len(area) else start
+        selected[i + 1] = anchor
+
+    return selected
+
+
+def minmax_indices(y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Min/max envelope selection: the lowest and highest point of each bucket.
+
+    Args:
+        y: Y values
+        n_out: Number of points to keep (two per bucket)
+
+    Returns:
+        Sorted indices of the selected points
+    """
+    n = len(y)
+    if n_out >= n or n_out < 4:
+        return np.arange(n)
+
+    y = np.asarray(y, dtype=np.float64)
+    edges = np.linspace(0, n, n_out // 2 + 1).astype(np.int64)
+    selected = []
+    for start, end in zip(edges[:-1], edges[1:]):
+        if end > start:
+            bucket = y[start:end]
+            selected.append(start + int(np.nanargmin(bucket)))
+            selected.append(start + int(np.nanargmax(bucket)))
+
+    return np.unique(selected)
+
+
+def drawdown_extreme_indices(y: np.ndarray) -> np.ndarray:
+    """
+    Indices that must survive downsampling: global min/max and the
+    peak/trough pair of the maximum drawdown.
+
+    Args:
+        y: Balance values
+
+    Returns:
+        Indices of extreme points
+    """
+    if len(y) == 0:
+        return np.empty(0, dtype=np.int64)
+
+    y = np.asarray(y, dtype=np.float64)
+    running_max = np.fmax.accumulate(y)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        drawdown = (y - running_max) / running_max
+
+    trough = int(np.nanargmin(drawdown)) if not np.all(np.isnan(drawdown)) else 0
+    peak = int(np.nanargmax(y[:trough + 1])) if not np.all(np.isnan(y[:trough + 1])) else 0
+    extremes = [peak, trough]
+    if not np.all(np.isnan(y)):
+        extremes += [int(np.nanargmin(y)), int(np.nanargmax(y))]
+    return np.unique(extremes)
+
+
+def downsample(
+    x: np.ndarray,
+    y: np.ndarray,
+    max_points: int = DEFAULT_MAX_POINTS,
+    method: str = "lttb",
+    x_range: Optional[Tuple[float, float]] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Reduce a series to at most max_points while keeping drawdown extremes.
+
+    Args:
+        x: X values (monotonic)
+        y: Y values
+        max_points: Point budget per trace
+        method: "lttb" or "minmax"
+        x_range: Optional (x0, x1) window to keep (zoomed view)
+
+    Returns:
+        Tuple of (x, y) downsampled arrays
+    """
+    x = np.asarray(x)
+    y = np.asarray(y)
+
+    if x_range is not None:
+        lo = int(np.searchsorted(x, x_range[0], side="left"))
+        hi = int(np.searchsorted(x, x_range[1], side="right"))
+        # One point beyond each edge so lines reach the axis borders
+        lo, hi = max(0, lo - 1), min(len(x), hi + 1)
+        x, y = x[lo:hi], y[lo:hi]
+
+    if len(y) <= max_points:
+        return x, y
+
+    # Ends and extremes are always kept: the selection gets what is left of the budget
+    extremes = np.union1d(drawdown_extreme_indices(y), [0, len(y) - 1])
+    budget = max_points - len(extremes)
+    if method == "minmax":
+        indices = minmax_indices(y, budget)
+    else:
+        indices = lttb_indices(x, y, budget)
+
+    indices = np.union1d(indices, extremes)
+    return x[indices], y[indices]
+
+
+class StreamingEnvelope:
+    """
+    Min/max envelope of a growing series, updated in O(batch).
+
+    Points fall into buckets of `width` consecutive values and each bucket
+    keeps its lowest and highest point, as minmax_indices() does. When the
+    bucket count passes the budget, neighbouring buckets are merged and the
+    width doubles, so points() stays under max_points however long the
+    series grows. The first and last points, the global min/max and the
+    peak/trough of the maximum drawdown (see drawdown_extreme_indices) are
+    tracked alongside.
+    """
+
+    def __init__(self, max_points: int = DEFAULT_MAX_POINTS):
+        # Two points per bucket, two for the open bucket, six extremes
+        self.max_buckets = max(2, (max_points - 8) // 2)
+        self.width = 1
+        self.n = 0
+
+        # Closed buckets: index and value of their min and max
+        self._lo_i = np.empty(0, dtype=np.int64)
+        self._lo_y = np.empty(0)
+        self._hi_i = np.empty(0, dtype=np.int64)
+        self._hi_y = np.empty(0)
+        # Open bucket: [count, lo_i, lo_y, hi_i, hi_y]
+        self._open = [0, 0, np.inf, 0, -np.inf]
+
+        # (index, value) of the tracked extremes
+        self._first = self._last = (0, np.nan)
+        self._min = (0, np.inf)
+        self._max = (0, -np.inf)
+        self._peak = (-1, -np.inf)  # Running max so far
+        self._drawdown = 0.0
+        self._drawdown_points = ()  # Peak and trough of the max drawdown
+
+    @staticmethod
+    def _bucket_extremes(values: np.ndarray, start: int):
+        """Per-row (lo_i, lo_y, hi_i, hi_y) of a (buckets x width) block starting at index start."""
+        width = values.shape[1]
+        offsets = start + np.arange(len(values), dtype=np.int64) * width
+        lo = np.where(np.isnan(values), np.inf, values).argmin(axis=1)
+        hi = np.where(np.isnan(values), -np.inf, values).argmax(axis=1)
+        rows = np.arange(len(values))
+        return offsets + lo, values[rows, lo], offsets + hi, values[rows, hi]
+
+    def _close(self, lo_i, lo_y, hi_i, hi_y):
+        self._lo_i = np.append(self._lo_i, lo_i)
+        self._lo_y = np.append(self._lo_y, lo_y)
+        self._hi_i = np.append(self._hi_i, hi_i)
+        self._hi_y = np.append(self._hi_y, hi_y)
+
+    def _merge(self):
+        """Halve the bucket count: pairs of buckets become one, width doubles."""
+        if len(self._lo_i) % 2:
+            # Unpaired last bucket + open bucket = the new (still open) bucket
+            count, lo_i, lo_y, hi_i, hi_y = self._open
+            last_lo_y, last_hi_y = self._lo_y[-1], self._hi_y[-1]
+            self._open = [
+                count + self.width,
+                *((self._lo_i[-1], last_lo_y) if not lo_y < last_lo_y else (lo_i, lo_y)),
+                *((self._hi_i[-1], last_hi_y) if not hi_y > last_hi_y else (hi_i, hi_y)),
+            ]
+            self._lo_i, self._lo_y = self._lo_i[:-1], self._lo_y[:-1]
+            self._hi_i, self._hi_y = self._hi_i[:-1], self._hi_y[:-1]
+
+        lo_y = self._lo_y.reshape(-1, 2)
+        pick = np.where(lo_y[:, 1] < lo_y[:, 0], 1, 0)
+        rows = np.arange(len(lo_y))
+        self._lo_i, self._lo_y = self._lo_i.reshape(-1, 2)[rows, pick], lo_y[rows, pick]
+        hi_y = self._hi_y.reshape(-1, 2)
+        pick = np.where(hi_y[:, 1] > hi_y[:, 0], 1, 0)
+        self._hi_i, self._hi_y = self._hi_i.reshape(-1, 2)[rows, pick], hi_y[rows, pick]
+        self.width *= 2
+
+    def _track_extremes(self, values: np.ndarray, start: int):
+        indices = start + np.arange(len(values), dtype=np.int64)
+        if self.n == 0:
+            self._first = (0, values[0])
+        finite = ~np.isnan(values)
+        if finite.any():
+            lo, hi = int(np.nanargmin(values)), int(np.nanargmax(values))
+            if values[lo] < self._min[1]:
+                self._min = (start + lo, values[lo])
+            if values[hi] > self._max[1]:
+                self._max = (start + hi, values[hi])
+
+        # Running max and where it was reached (first occurrence, like nanargmax)
+        previous = np.concatenate(([self._peak[1]], np.fmax.accumulate(np.where(finite, values, -np.inf))[:-1]))
+        previous = np.fmax(previous, self._peak[1])
+        rises = finite & (values > previous)
+        peak_i = np.fmax.accumulate(np.where(rises, indices, -1).astype(np.float64))
+        peak_i = np.where(peak_i < 0, self._peak[0], peak_i).astype(np.int64)
+        running_max = np.fmax(previous, np.where(finite, values, -np.inf))
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            drawdown = (values - running_max) / running_max
+        if finite.any() and np.nanmin(drawdown) < self._drawdown:
+            trough = int(np.nanargmin(drawdown))
+            self._drawdown = float(drawdown[trough])
+            peak = int(peak_i[trough])
+            self._drawdown_points = ((peak, self._value_at(peak, values, start)), (start + trough, values[trough]))
+        if rises.any():
+            last = int(np.flatnonzero(rises)[-1])
+            self._peak = (start + last, values[last])
+
+    def _value_at(self, index: int, values: np.ndarray, start: int) -> float:
+        if index >= start:
+            return values[index - start]
+        return self._peak[1]  # Earlier peak: the running max carried in
+
+    def extend(self, values: np.ndarray):
+        """Append new values, in order."""
+        values = np.asarray(values, dtype=np.float64)
+        if len(values) == 0:
+            return
+
+        start = self.n
+        self._track_extremes(values, start)
+        self._last = (start + len(values) - 1, values[-1])
+
+        position = 0
+        while position < len(values):
+            count = self._open[0]
+            if count == 0 and len(values) - position >= self.width:
+                # Whole buckets at once
+                blocks = (len(values) - position) // self.width
+                block = values[position:position + blocks * self.width].reshape(blocks, self.width)
+                self._close(*self._bucket_extremes(block, start + position))
+                position += blocks * self.width
+            else:
+                # Fill the open bucket
+                take = min(self.width - count, len(values) - position)
+                chunk = values[position:position + take]
+                (lo_i,), (lo_y,), (hi_i,), (hi_y,) = self._bucket_extremes(chunk[None, :], start + position)
+                _, open_lo_i, open_lo_y, open_hi_i, open_hi_y = self._open
+                self._open = [
+                    count + take,
+                    *((lo_i, lo_y) if count == 0 or lo_y < open_lo_y else (open_lo_i, open_lo_y)),
+                    *((hi_i, hi_y) if count == 0 or hi_y > open_hi_y else (open_hi_i, open_hi_y)),
+                ]
+                position += take
+                if self._open[0] == self.width:
+                    self._close(*self._open[1:])
+                    self._open = [0, 0, np.inf, 0, -np.inf]
+
+            while len(self._lo_i) > self.max_buckets:
+                self._merge()
+
+        self.n += len(values)
+
+    def points(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Current envelope.
+
+        Returns:
+            Tuple of (x, y) with x the positions in the series, sorted
+        """
+        if self.n == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+
+        x = [self._lo_i, self._hi_i]
+        y = [self._lo_y, self._hi_y]
+        extra = [self._first, self._last]
+        if self._open[0]:
+            extra += [(self._open[1], self._open[2]), (self._open[3], self._open[4])]
+        if np.isfinite(self._min[1]):
+            extra += [self._min, self._max]
+        if self._drawdown < 0:
+            extra += list(self._drawdown_points)
+        x.append(np.array([i for i, _ in extra], dtype=np.int64))
+        y.append(np.array([v for _, v in extra], dtype=np.float64))
+
+        x, y = np.concatenate(x), np.concatenate(y)
+        x, first = np.unique(x, return_index=True)
+        return x, y[first]
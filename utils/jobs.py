@@ -0,0 +1,88 @@
+"""
+⏳ BACKGROUND JOBS - Trading Dashboard Pro
+Run heavy callbacks outside the gunicorn request cycle
+"""
+
+import functools
+import os
+from pathlib import Path
+from typing import Callable, Optional
+
+from dash import callback
+
+from utils.cache import DEFAULT_CACHE_DIR
+
+try:
+    import diskcache
+    from dash import DiskcacheManager
+except ImportError:  # dash[diskcache] extras not installed
+    diskcache = None
+
+
+# Finished job results are dropped after this many seconds
+JOB_RESULT_TTL = int(os.getenv("JOB_RESULT_TTL", "3600"))
+
+_manager = None
+
+
+def get_background_manager() -> Optional["DiskcacheManager"]:
+    """
+    Process-wide background callback manager.
+
+    Jobs run in their own process and their results go through a diskcache
+    directory next to the dataset cache, so any gunicorn worker can answer
+    the browser's polling requests.
+
+    Returns:
+        DiskcacheManager, or None when diskcache is not installed
+    """
+    global _manager
+    if _manager is None and diskcache is not None:
+        root = Path(os.getenv("DATASET_CACHE_DIR", DEFAULT_CACHE_DIR))
+        _manager = DiskcacheManager(diskcache.Cache(str(root / "jobs")), expire=JOB_RESULT_TTL)
+    return _manager
+
+
+def _no_progress(*args, **kwargs):
+    """set_progress stand-in when callbacks run synchronously."""
+
+
+def background_callback(*dependencies, progress=None, running=None, **kwargs) -> Callable:
+    """
+    `dash.callback` that runs as a background job when possible.
+
+    The decorated function always receives `set_progress` as its first
+    argument, on both paths: without `progress` outputs (or without
+    diskcache, where the callback runs synchronously as before) it is a
+    no-op.
+
+    Args:
+        *dependencies: Outputs, Inputs and States, as for dash.callback
+        progress: Output(s) updated by set_progress
+        running: (component, value while running, value when done) triples
+        **kwargs: Other dash.callback options
+
+    Returns:
+        Decorator
+    """
+    manager = get_background_manager()
+
+    def decorator(func):
+        @functools.wraps(func)
+        def without_progress(*args):
+            return func(_no_progress, *args)
+
+        if manager is not None:
+            # Dash only passes set_progress when progress outputs are declared
+            return callback(
+                *dependencies,
+                background=True,
+                manager=manager,
+                progress=progress,
+                running=running,
+                **kwargs,
+            )(func if progress is not None else without_progress)
+
+        return callback(*dependencies, **kwargs)(without_progress)
+
+    return decorator
@@ -0,0 +1,542 @@
+"""
+📚 DATASET LIBRARY - Trading Dashboard Pro
+Persistent catalog of stored agents over memory-mapped Arrow files
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+import numpy as np
+
+from utils.dataset import TrainingDataset
+
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+DEFAULT_LIBRARY_DIR = DATA_DIR / "library"
+
+# Files picked up by scan() (same set as DataLoader.load_local_file)
+IMPORTABLE_SUFFIXES = (".json", ".csv", ".xlsx", ".parquet", ".feather", ".arrow")
+
+# Summary metrics precomputed at ingest time (column -> SQLite type).
+# Each one is indexed so leaderboards sort without touching the datasets.
+SUMMARY_COLUMNS = {
+    "final_balance": "REAL",
+    "roi_percent": "REAL",
+    "sharpe_ratio": "REAL",
+    "sortino_ratio": "REAL",
+    "max_drawdown_pct": "REAL",
+    "max_daily_loss_pct": "REAL",
+    "calmar_ratio": "REAL",
+    "profit_factor": "REAL",
+    "win_rate": "REAL",
+    "total_trades": "INTEGER",
+    "ftmo_max_dd_ok": "INTEGER",
+    "ftmo_daily_loss_ok": "INTEGER",
+    "ftmo_compliant": "INTEGER",
+}
+
+# Catalog columns a listing can be sorted by
+SORTABLE_COLUMNS = ("added_at", "agent_name", "algorithm", "rows", "timestep_max") + tuple(SUMMARY_COLUMNS)
+
+
+def _file_hash(path: Path, chunk_size: int = 1 << 20) -> str:
+    """Same id scheme as cache.content_hash, streamed from disk."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()[:32]
+
+
+class DatasetLibrary:
+    """
+    Local library of agents.
+
+    Every dataset is stored once as an uncompressed Arrow IPC file
+    (`<library_dir>/<id>.arrow`), which is memory-mapped when opened, and
+    described by one row of a SQLite catalog (agent name, algorithm,
+    timestep range, row count and the SUMMARY_COLUMNS metrics, computed
+    once at ingest). Listing, filtering and leaderboards only touch the
+    indexed catalog, so thousands of agents can be ranked without loading
+    or recomputing any of them.
+
+    Like DatasetStore, the Arrow files share a byte budget: file mtime is
+    the LRU clock and add() evicts the oldest entries once the library
+    exceeds `max_bytes`. Uploads go first; files imported by scan() are
+    only evicted when uploads alone do not free enough space, since their
+    source is still in data/.
+    """
+
+    def __init__(self, library_dir: Optional[Union[str, Path]] = None, max_bytes: Optional[int] = None):
+        """
+        Initialize the library.
+
+        Args:
+            library_dir: Storage directory (default: LIBRARY_DIR env or data/library)
+            max_bytes: Size budget (default: LIBRARY_MAX_MB env or 2048 MB)
+        """
+        self.directory = Path(library_dir or os.getenv("LIBRARY_DIR", DEFAULT_LIBRARY_DIR))
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.db_path = self.directory / "catalog.sqlite"
+
+        if max_bytes is None:
+            max_bytes = int(float(os.getenv("LIBRARY_MAX_MB", "2048")) * 1024 * 1024)
+        self.max_bytes = max_bytes
+
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS datasets ("
+                "id TEXT PRIMARY KEY, "
+                "agent_name TEXT NOT NULL, "
+                "algorithm TEXT, "
+                "source TEXT, "
+                "source_mtime REAL, "
+                "rows INTEGER NOT NULL, "
+                "timestep_min REAL, "
+                "timestep_max REAL, "
+                "columns TEXT NOT NULL, "
+                "added_at REAL NOT NULL)"
+            )
+
+            # Catalogs created by older versions lack newer summary columns
+            existing = {row["name"] for row in conn.execute("PRAGMA table_info(datasets)")}
+            for column, sql_type in SUMMARY_COLUMNS.items():
+                if column not in existing:
+                    conn.execute(f"ALTER TABLE datasets ADD COLUMN {column} {sql_type}")
+
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_datasets_agent ON datasets (agent_name)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_datasets_algorithm ON datasets (algorithm)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_datasets_source ON datasets (source)")
+            for column in SUMMARY_COLUMNS:
+                conn.execute(f"CREATE INDEX IF NOT EXISTS idx_datasets_{column} ON datasets ({column})")
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # One short-lived connection per call: safe across forked workers
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:  # Commit on success, rollback on error
+                yield conn
+        finally:
+            conn.close()
+
+    def _path(self, dataset_id: str) -> Path:
+        return self.directory / f"{dataset_id}.arrow"
+
+    def __contains__(self, dataset_id: str) -> bool:
+        return bool(dataset_id) and self._path(dataset_id).exists()
+
+    def __len__(self) -> int:
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM datasets").fetchone()[0]
+
+    # ============================================
+    # WRITE
+    # ============================================
+
+    def add(
+        self,
+        dataset_id: str,
+        dataset: TrainingDataset,
+        initial_balance: float = 10000.0,
+        source_mtime: Optional[float] = None,
+        metrics: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        """
+        Store a dataset and (re)write its catalog entry, then evict least
+        recently used entries if over budget.
+
+        Args:
+            dataset_id: Content hash of the original file
+            dataset: Parsed dataset
+            initial_balance: Balance used for the summary metrics
+            source_mtime: Modification time of the source file (scan only)
+            metrics: get_all_metrics() result if the caller already has it
+
+        Returns:
+            The dataset id
+        """
+        path = self._path(dataset_id)
+        if not path.exists():
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            os.close(fd)
+            try:
+                dataset.to_feather(tmp_path)
+                os.replace(tmp_path, path)
+            except Exception:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+
+        entry = self._describe(dataset)
+        entry.update(self._summarize(dataset, initial_balance, metrics))
+        entry.update(id=dataset_id, source_mtime=source_mtime, added_at=time.time())
+
+        with self._connect() as conn:
+            conn.execute(
+                f"INSERT OR REPLACE INTO datasets ({', '.join(entry)}) "
+                f"VALUES ({', '.join('?' * len(entry))})",
+                list(entry.values()),
+            )
+
+        self._evict(keep=dataset_id)
+        return dataset_id
+
+    def total_bytes(self) -> int:
+        """Current on-disk size of all stored datasets."""
+        return sum(size for *_, size in self._entries())
+
+    def _entries(self):
+        """(imported by scan, mtime, id, size) for every stored dataset."""
+        with self._connect() as conn:
+            scanned = dict(conn.execute("SELECT id, source_mtime IS NOT NULL FROM datasets").fetchall())
+
+        entries = []
+        for path in self.directory.glob("*.arrow"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue  # Evicted by another worker
+            entries.append((bool(scanned.get(path.stem)), stat.st_mtime, path.stem, stat.st_size))
+        return entries
+
+    def _evict(self, keep: Optional[str] = None):
+        """Remove uploads, then scanned files, oldest first until within max_bytes."""
+        entries = sorted(self._entries())
+        total = sum(size for *_, size in entries)
+
+        for _, _, dataset_id, size in entries:
+            if total <= self.max_bytes:
+                break
+            if dataset_id == keep:
+                continue
+            self.remove(dataset_id)
+            total -= size
+
+    @staticmethod
+    def _describe(dataset: TrainingDataset) -> Dict[str, Any]:
+        """Descriptive catalog fields for one dataset."""
+        frame = dataset.frame
+        metadata = dataset.metadata
+        source = dataset.source
+
+        if "timestep" in frame.columns and len(frame):
+            timesteps = frame["timestep"].to_numpy(dtype=np.float64)
+            timestep_min, timestep_max = float(np.nanmin(timesteps)), float(np.nanmax(timesteps))
+        else:
+            timestep_min, timestep_max = 0.0, float(max(len(frame) - 1, 0))
+
+        return {
+            "agent_name": str(metadata.get("agent_name") or Path(source).stem or "agent"),
+            "algorithm": metadata.get("algorithm"),
+            "source": source,
+            "rows": len(frame),
+            "timestep_min": timestep_min,
+            "timestep_max": timestep_max,
+            "columns": json.dumps(list(map(str, frame.columns))),
+        }
+
+    @staticmethod
+    def _summarize(
+        dataset: TrainingDataset,
+        initial_balance: float,
+        metrics: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """SUMMARY_COLUMNS values, from the full metrics and FTMO checks."""
+        from utils.metrics import MetricsCalculator, ftmo_compliance
+
+        if metrics is None:
+            metrics = MetricsCalculator(dataset, initial_balance).get_all_metrics()
+        if not metrics:
+            return dict.fromkeys(SUMMARY_COLUMNS)
+
+        compliance = ftmo_compliance(metrics)
+        summary = {column: metrics.get(column) for column in SUMMARY_COLUMNS}
+        summary.update(
+            ftmo_max_dd_ok=compliance["max_drawdown_ok"],
+            ftmo_daily_loss_ok=compliance["daily_drawdown_ok"],
+            ftmo_compliant=compliance["overall_compliant"],
+        )
+        # NumPy scalars -> plain Python values for sqlite3
+        return {k: v.item() if isinstance(v, np.generic) else v for k, v in summary.items()}
+
+    def rebuild_summaries(self, only_missing: bool = True, initial_balance: float = 10000.0) -> int:
+        """
+        Recompute summary metrics from the stored files.
+
+        Needed once after SUMMARY_COLUMNS grows: entries ingested earlier
+        have NULL in the new columns.
+
+        Args:
+            only_missing: Only entries with at least one NULL summary column
+            initial_balance: Balance used for the summary metrics
+
+        Returns:
+            Number of entries updated
+        """
+        query = "SELECT id FROM datasets"
+        if only_missing:
+            query += " WHERE " + " OR ".join(f"{column} IS NULL" for column in SUMMARY_COLUMNS)
+        with self._connect() as conn:
+            ids = [row["id"] for row in conn.execute(query)]
+
+        updated = 0
+        for dataset_id in ids:
+            dataset = self.open(dataset_id)
+            if dataset is None:
+                continue
+            summary = self._summarize(dataset, initial_balance)
+            with self._connect() as conn:
+                conn.execute(
+                    f"UPDATE datasets SET {', '.join(f'{c} = ?' for c in summary)} WHERE id = ?",
+                    [*summary.values(), dataset_id],
+                )
+            updated += 1
+        return updated
+
+    def import_file(self, filepath: Union[str, Path]) -> Optional[str]:
+        """
+        Parse a local file and add it to the library.
+
+        Args:
+            filepath: JSON/CSV/XLSX/Parquet/Arrow training log
+
+        Returns:
+            Dataset id, or None if the file could not be parsed
+        """
+        from utils.data_loader import DataLoader
+
+        filepath = Path(filepath)
+        dataset_id = _file_hash(filepath)
+        if dataset_id in self:
+            return dataset_id
+
+        dataset = DataLoader().load_local_file(filepath)
+        if dataset is None:
+            return None
+        dataset.source = str(filepath)  # scan() matches files by path
+        return self.add(dataset_id, dataset, source_mtime=filepath.stat().st_mtime)
+
+    def scan(self, directory: Optional[Union[str, Path]] = None) -> List[str]:
+        """
+        Import every new or modified training log found in a directory.
+
+        Unchanged files (same path and mtime as in the catalog) are skipped
+        without being read; entries missing summary metrics are backfilled.
+
+        Args:
+            directory: Directory to scan (default: data/)
+
+        Returns:
+            Ids of the datasets imported by this scan
+        """
+        directory = Path(directory or DATA_DIR)
+        with self._connect() as conn:
+            known = dict(
+                conn.execute("SELECT source, source_mtime FROM datasets WHERE source_mtime IS NOT NULL").fetchall()
+            )
+
+        imported = []
+        for path in sorted(directory.iterdir()):
+            if not path.is_file() or path.suffix not in IMPORTABLE_SUFFIXES:
+                continue
+            if known.get(str(path)) == path.stat().st_mtime:
+                continue
+            try:
+                dataset_id = self.import_file(path)
+            except Exception as e:
+                print(f"Error importing {path.name}: {e}")
+                continue
+            if dataset_id:
+                imported.append(dataset_id)
+
+        self.rebuild_summaries(only_missing=True)
+        return imported
+
+    def remove(self, dataset_id: str) -> bool:
+        """Delete a dataset and its catalog entry. Returns True if it existed."""
+        with self._connect() as conn:
+            deleted = conn.execute("DELETE FROM datasets WHERE id = ?", (dataset_id,)).rowcount
+        self._path(dataset_id).unlink(missing_ok=True)
+        return bool(deleted)
+
+    # ============================================
+    # READ
+    # ============================================
+
+    def list(
+        self,
+        search: Optional[str] = None,
+        algorithm: Optional[str] = None,
+        min_rows: Optional[int] = None,
+        min_sharpe: Optional[float] = None,
+        max_drawdown: Optional[float] = None,
+        ftmo_only: bool = False,
+        order_by: str = "added_at",
+        descending: bool = True,
+        limit: Optional[int] = None,
+        offset: int = 0,
+    ) -> List[Dict[str, Any]]:
+        """
+        Query the catalog without opening any dataset.
+
+        Args:
+            search: Case-insensitive substring of the agent name
+            algorithm: Exact algorithm
+            min_rows: Minimum number of checkpoints
+            min_sharpe: Minimum Sharpe ratio
+            max_drawdown: Maximum absolute drawdown in percent
+            ftmo_only: Only FTMO-compliant agents
+            order_by: One of SORTABLE_COLUMNS
+            descending: Sort direction
+            limit: Maximum number of entries
+            offset: Entries to skip (pagination)
+
+        Returns:
+            Catalog entries as dictionaries
+        """
+        if order_by not in SORTABLE_COLUMNS:
+            raise ValueError(f"Cannot sort by {order_by!r}")
+
+        clauses, params = [], []
+        if search:
+            clauses.append("agent_name LIKE ? ESCAPE '\\'")
+            escaped = search.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            params.append(f"%{escaped}%")
+        if algorithm:
+            clauses.append("algorithm = ?")
+            params.append(algorithm)
+        if min_rows is not None:
+            clauses.append("rows >= ?")
+            params.append(min_rows)
+        if min_sharpe is not None:
+            clauses.append("sharpe_ratio >= ?")
+            params.append(min_sharpe)
+        if max_drawdown is not None:
+            # Drawdowns are stored as negative percentages
+            clauses.append("max_drawdown_pct >= ?")
+            params.append(-abs(max_drawdown))
+        if ftmo_only:
+            clauses.append("ftmo_compliant = 1")
+        if order_by in SUMMARY_COLUMNS:
+            # Entries ingested before a metric existed are not ranked on it
+            clauses.append(f"{order_by} IS NOT NULL")
+
+        query = "SELECT * FROM datasets"
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += f" ORDER BY {order_by} {'DESC' if descending else 'ASC'}"
+        if limit is not None or offset:
+            query += " LIMIT ? OFFSET ?"
+            params += [int(limit) if limit is not None else -1, int(offset)]
+
+        with self._connect() as conn:
+            rows = conn.execute(query, params).fetchall()
+
+        entries = []
+        for row in rows:
+            entry = dict(row)
+            entry["columns"] = json.loads(entry["columns"])
+            entries.append(entry)
+        return entries
+
+    def leaderboard(
+        self,
+        order_by: str = "sharpe_ratio",
+        descending: bool = True,
+        limit: int = 100,
+        offset: int = 0,
+        **filters,
+    ) -> List[Dict[str, Any]]:
+        """
+        Ranked agents, straight from the indexed summary columns.
+
+        Args:
+            order_by: Ranking column (one of SORTABLE_COLUMNS)
+            descending: Best first when higher is better
+            limit: Page size
+            offset: Entries to skip (pagination)
+            **filters: Any list() filter (search, algorithm, ftmo_only, ...)
+
+        Returns:
+            Catalog entries with a 1-based `rank`
+        """
+        entries = self.list(order_by=order_by, descending=descending, limit=limit, offset=offset, **filters)
+        for rank, entry in enumerate(entries, start=offset + 1):
+            entry["rank"] = rank
+        return entries
+
+    def entry(self, dataset_id: str) -> Optional[Dict[str, Any]]:
+        """Catalog entry for one dataset, or None."""
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM datasets WHERE id = ?", (dataset_id,)).fetchone()
+        if row is None:
+            return None
+        entry = dict(row)
+        entry["columns"] = json.loads(entry["columns"])
+        return entry
+
+    def open(self, dataset_id: Optional[str], columns: Optional[List[str]] = None) -> Optional[TrainingDataset]:
+        """
+        Memory-map a stored dataset.
+
+        Args:
+            dataset_id: Catalog id
+            columns: Columns to load (default: all)
+
+        Returns:
+            TrainingDataset or None if unknown
+        """
+        if not dataset_id:
+            return None
+
+        path = self._path(dataset_id)
+        try:
+            dataset = TrainingDataset.read_feather(path, columns=columns)
+            os.utime(path)  # Touch for LRU
+            return dataset
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"Error opening library dataset {dataset_id}: {e}")
+            return None
+
+
+_library: Optional[DatasetLibrary] = None
+
+
+def get_library() -> DatasetLibrary:
+    """Process-wide DatasetLibrary (all workers share the same catalog)."""
+    global _library
+    if _library is None:
+        _library = DatasetLibrary()
+    return _library
+
+
+def load_dataset(dataset_id: Optional[str], columns: Optional[List[str]] = None) -> Optional[TrainingDataset]:
+    """
+    Resolve a dashboard dataset id: recent upload (DatasetStore) first,
+    then the library.
+
+    Args:
+        dataset_id: Content hash held by the browser
+        columns: Columns to load (default: all)
+
+    Returns:
+        TrainingDataset or None
+    """
+    from utils.cache import get_dataset_store
+
+    dataset = get_dataset_store().get(dataset_id, columns=columns)
+    if dataset is None:
+        dataset = get_library().open(dataset_id, columns=columns)
+    return dataset
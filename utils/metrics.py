@@ -3,10 +3,222 @@
 COMPLETE institutional-grade trading metrics (30+ metrics)
 """
 
-from typing import List, Dict, Optional
+from functools import cached_property
+from typing import List, Dict, Optional, Union
 import pandas as pd
 import numpy as np
-from scipy import stats
+
+from utils.dataset import TrainingDataset
+
+
+TRADING_DAYS_PER_YEAR = 252
+
+
+class MetricsKernel:
+    """
+    Shared NumPy intermediates for one balance history.
+
+    Returns, running maximum, drawdown and sorted returns are computed once;
+    every metric is then a cheap reduction over these arrays, so
+    get_all_metrics() walks the history a constant number of times instead
+    of once per metric.
+    """
+
+    def __init__(self, balance: np.ndarray, initial_balance: float = 10000.0):
+        """
+        Build intermediates from a balance series.
+
+        Args:
+            balance: Balance per checkpoint
+            initial_balance: Starting account balance
+        """
+        self.balance = np.asarray(balance, dtype=np.float64)
+        self.initial_balance = initial_balance
+        self.n = len(self.balance)
+
+        # Period returns (same as pct_change().fillna(0))
+        self.returns = np.zeros(self.n)
+        if self.n > 1:
+            with np.errstate(divide="ignore", invalid="ignore"):
+                self.returns[1:] = self.balance[1:] / self.balance[:-1] - 1
+            self.returns[np.isnan(self.returns)] = 0.0
+
+        # P&L per period (same as diff().fillna(0))
+        self.pnl = np.zeros(self.n)
+        if self.n > 1:
+            self.pnl[1:] = np.diff(self.balance)
+
+        # Running maximum and drawdown (fmax ignores NaN like cummax)
+        self.running_max = np.fmax.accumulate(self.balance) if self.n else self.balance
+        self.drawdown_dollars = self.balance - self.running_max
+        with np.errstate(divide="ignore", invalid="ignore"):
+            self.drawdown_pct = self.drawdown_dollars / self.running_max * 100
+
+    # ============================================
+    # SHARED REDUCTIONS
+    # ============================================
+
+    @cached_property
+    def returns_mean(self) -> float:
+        return float(self.returns.mean()) if self.n else 0.0
+
+    @cached_property
+    def returns_std(self) -> float:
+        return float(self.returns.std()) if self.n else 0.0
+
+    @cached_property
+    def central_moments(self) -> tuple:
+        """(m2, m3, m4) central moments of returns (population, like scipy bias=True)."""
+        if self.n == 0:
+            return 0.0, 0.0, 0.0
+        deviation = self.returns - self.returns_mean
+        squared = deviation * deviation
+        return float(squared.mean()), float((squared * deviation).mean()), float((squared * squared).mean())
+
+    @cached_property
+    def skewness(self) -> float:
+        m2, m3, _ = self.central_moments
+        return m3 / m2 ** 1.5 if m2 > 0 else 0.0
+
+    @cached_property
+    def kurtosis(self) -> float:
+        """Fisher kurtosis (normal = 0), same as scipy.stats.kurtosis."""
+        m2, _, m4 = self.central_moments
+        return m4 / m2 ** 2 - 3 if m2 > 0 else 0.0
+
+    @cached_property
+    def sorted_returns(self) -> np.ndarray:
+        return np.sort(self.returns)
+
+    @cached_property
+    def _sorted_cumsum(self) -> np.ndarray:
+        return np.cumsum(self.sorted_returns)
+
+    def quantile(self, q: float) -> float:
+        """Linear-interpolated quantile of returns (matches np.percentile)."""
+        if self.n == 0:
+            return 0.0
+        pos = q * (self.n - 1)
+        lo = int(np.floor(pos))
+        hi = min(lo + 1, self.n - 1)
+        frac = pos - lo
+        low, high = self.sorted_returns[lo], self.sorted_returns[hi]
+        return float(low + (high - low) * frac)
+
+    # ============================================
+    # METRICS
+    # ============================================
+
+    @cached_property
+    def final_balance(self) -> float:
+        return float(self.balance[-1]) if self.n else self.initial_balance
+
+    @cached_property
+    def max_drawdown_pct(self) -> float:
+        return float(np.nanmin(self.drawdown_pct)) if self.n else 0.0
+
+    @cached_property
+    def max_drawdown_dollars(self) -> float:
+        return float(np.nanmin(self.drawdown_dollars)) if self.n else 0.0
+
+    @cached_property
+    def ulcer_index(self) -> float:
+        if self.n == 0:
+            return 0.0
+        return abs(float(np.sqrt(np.nanmean(self.drawdown_pct ** 2))))
+
+    @cached_property
+    def pain_index(self) -> float:
+        return float(np.nanmean(np.abs(self.drawdown_pct))) if self.n else 0.0
+
+    @cached_property
+    def profit_factor(self) -> float:
+        if self.n == 0:
+            return 0.0
+        gains = float(self.pnl[self.pnl > 0].sum())
+        losses = abs(float(self.pnl[self.pnl < 0].sum()))
+        if losses == 0:
+            return gains if gains > 0 else 0.0
+        return gains / losses
+
+    @cached_property
+    def cagr(self) -> float:
+        if self.n == 0 or self.initial_balance == 0:
+            return 0.0
+        years = max(0.1, self.n / 1000)  # Rough estimate
+        return (((self.final_balance / self.initial_balance) ** (1 / years)) - 1) * 100
+
+    @cached_property
+    def calmar_ratio(self) -> float:
+        max_dd = abs(self.max_drawdown_pct)
+        if max_dd == 0:
+            return 0.0
+        return self.cagr / max_dd
+
+    @cached_property
+    def recovery_factor(self) -> float:
+        if self.n == 0:
+            return 0.0
+        net_profit = self.final_balance - self.initial_balance
+        if self.max_drawdown_dollars == 0:
+            return net_profit if net_profit > 0 else 0.0
+        return abs(net_profit / self.max_drawdown_dollars)
+
+    def sharpe_ratio(self, risk_free_rate: float = 0.02) -> float:
+        """Annualized Sharpe from cached mean/std (std is shift-invariant)."""
+        if self.n < 2 or self.returns_std == 0:
+            return 0.0
+        excess_mean = self.returns_mean - risk_free_rate / TRADING_DAYS_PER_YEAR
+        return excess_mean / self.returns_std * np.sqrt(TRADING_DAYS_PER_YEAR)
+
+    def sortino_ratio(self, risk_free_rate: float = 0.02) -> float:
+        """Annualized Sortino using downside deviation of excess returns."""
+        if self.n < 2:
+            return 0.0
+        daily_rf = risk_free_rate / TRADING_DAYS_PER_YEAR
+        # Sorted returns make the downside set a prefix
+        k = int(np.searchsorted(self.sorted_returns, daily_rf, side="left"))
+        if k == 0:
+            return 0.0
+        downside_std = float(self.sorted_returns[:k].std())
+        if downside_std == 0:
+            return 0.0
+        return (self.returns_mean - daily_rf) / downside_std * np.sqrt(TRADING_DAYS_PER_YEAR)
+
+    def var(self, confidence: float = 0.95) -> float:
+        """Historical VaR as percentage."""
+        if self.n < 2:
+            return 0.0
+        return self.quantile(1 - confidence) * 100
+
+    def cvar(self, confidence: float = 0.95) -> float:
+        """Expected shortfall as percentage (mean of returns <= VaR)."""
+        if self.n < 2:
+            return 0.0
+        threshold = self.quantile(1 - confidence)
+        k = int(np.searchsorted(self.sorted_returns, threshold, side="right"))
+        if k == 0:
+            return 0.0
+        return float(self._sorted_cumsum[k - 1] / k) * 100
+
+
+def ftmo_compliance(metrics: Dict[str, any]) -> Dict[str, bool]:
+    """
+    FTMO rule compliance from an already computed metrics dictionary.
+
+    Args:
+        metrics: Result of MetricsCalculator.get_all_metrics()
+
+    Returns:
+        Dictionary with compliance status
+    """
+    return {
+        "max_drawdown_ok": metrics["ftmo_max_dd_compliant"],
+        "daily_drawdown_ok": metrics["ftmo_daily_loss_compliant"],
+        "overall_compliant": metrics["ftmo_max_dd_compliant"] and metrics["ftmo_daily_loss_compliant"],
+        "max_drawdown_value": abs(metrics["max_drawdown_pct"]),
+        "daily_drawdown_value": abs(metrics["max_daily_loss_pct"]),
+    }
 
 
 class MetricsCalculator:
@@ -21,25 +233,40 @@ class MetricsCalculator:
     - Advanced: Recovery Factor, Ulcer Index, Pain Index, Kelly
     """
 
-    def __init__(self, data: List[Dict], initial_balance: float = 10000.0):
+    def __init__(
+        self,
+        data: Union[TrainingDataset, List[Dict], pd.DataFrame],
+        initial_balance: float = 10000.0,
+        kernel: Optional["MetricsKernel"] = None,
+    ):
         """
         Initialize calculator with checkpoint data.
 
         Args:
-            data: List of checkpoint dictionaries (from training_stats.json)
+            data: TrainingDataset (shared by reference), list of checkpoint
+                dictionaries or DataFrame (from training_stats.json)
             initial_balance: Starting account balance
+            kernel: Prebuilt intermediates (e.g. StreamingMetrics in live mode)
         """
         self.data = data
-        self.df = pd.DataFrame(data)
+        # The frame is read-only here: no columns are added to a shared dataset
+        self.df = data.frame if isinstance(data, TrainingDataset) else pd.DataFrame(data)
         self.initial_balance = initial_balance
 
-        # Calculate returns if not present
+        if kernel is not None:
+            self.kernel = kernel
+            return
+
         if "balance" in self.df.columns:
-            self.df["returns"] = self.df["balance"].pct_change().fillna(0)
+            balance = self.df["balance"].to_numpy(dtype=np.float64)
         elif "total_reward" in self.df.columns:
             # If only total_reward available, create balance
-            self.df["balance"] = initial_balance + self.df["total_reward"]
-            self.df["returns"] = self.df["balance"].pct_change().fillna(0)
+            balance = initial_balance + self.df["total_reward"].to_numpy(dtype=np.float64)
+        else:
+            balance = np.empty(0)
+
+        # Shared intermediates, computed once for every metric
+        self.kernel = MetricsKernel(balance, initial_balance)
 
     # ============================================
     # MAIN FUNCTION - GET ALL METRICS
@@ -57,7 +284,7 @@ class MetricsCalculator:
 
         # Get last row for final values
         last_row = self.df.iloc[-1]
-        final_balance = last_row.get("balance", self.initial_balance)
+        final_balance = self.kernel.final_balance
 
         # Calculate all metrics
         return {
@@ -130,18 +357,7 @@ class MetricsCalculator:
         Returns:
             Profit factor
         """
-        if self.df.empty or "balance" not in self.df.columns:
-            return 0.0
-
-        # Calculate P&L per period
-        pnl = self.df["balance"].diff().fillna(0)
-        gains = pnl[pnl > 0].sum()
-        losses = abs(pnl[pnl < 0].sum())
-
-        if losses == 0:
-            return gains if gains > 0 else 0.0
-
-        return gains / losses
+        return self.kernel.profit_factor
 
     def calculate_expectancy(self) -> float:
         """
@@ -175,17 +391,7 @@ class MetricsCalculator:
         Returns:
             Sharpe ratio
         """
-        if "returns" not in self.df.columns or len(self.df) < 2:
-            return 0.0
-
-        returns = self.df["returns"].values
-        excess_returns = returns - (risk_free_rate / 252)  # Daily risk-free rate
-
-        if np.std(excess_returns) == 0:
-            return 0.0
-
-        sharpe = np.mean(excess_returns) / np.std(excess_returns)
-        return sharpe * np.sqrt(252)  # Annualize
+        return self.kernel.sharpe_ratio(risk_free_rate)
 
     def calculate_sortino_ratio(self, risk_free_rate: float = 0.02) -> float:
         """
@@ -197,20 +403,7 @@ class MetricsCalculator:
         Returns:
             Sortino ratio
         """
-        if "returns" not in self.df.columns or len(self.df) < 2:
-            return 0.0
-
-        returns = self.df["returns"].values
-        excess_returns = returns - (risk_free_rate / 252)
-
-        # Downside deviation (only negative returns)
-        downside_returns = excess_returns[excess_returns < 0]
-
-        if len(downside_returns) == 0 or np.std(downside_returns) == 0:
-            return 0.0
-
-        sortino = np.mean(excess_returns) / np.std(downside_returns)
-        return sortino * np.sqrt(252)  # Annualize
+        return self.kernel.sortino_ratio(risk_free_rate)
 
     def calculate_calmar_ratio(self) -> float:
         """
@@ -219,13 +412,7 @@ class MetricsCalculator:
         Returns:
             Calmar ratio
         """
-        max_dd = abs(self.calculate_max_drawdown())
-
-        if max_dd == 0:
-            return 0.0
-
-        cagr = self.calculate_cagr()
-        return cagr / max_dd
+        return self.kernel.calmar_ratio
 
     def calculate_max_drawdown(self) -> float:
         """
@@ -234,16 +421,7 @@ class MetricsCalculator:
         Returns:
             Max drawdown as percentage (negative value)
         """
-        if self.df.empty or "balance" not in self.df.columns:
-            return 0.0
-
-        # Calculate running maximum
-        running_max = self.df["balance"].cummax()
-
-        # Calculate drawdown
-        drawdown = (self.df["balance"] - running_max) / running_max * 100
-
-        return drawdown.min()  # Most negative value
+        return self.kernel.max_drawdown_pct
 
     def calculate_cagr(self) -> float:
         """
@@ -252,21 +430,7 @@ class MetricsCalculator:
         Returns:
             CAGR as percentage
         """
-        if self.df.empty or "balance" not in self.df.columns:
-            return 0.0
-
-        final_balance = self.df["balance"].iloc[-1]
-        initial = self.initial_balance
-
-        # Estimate years (assuming ~252 trading days per year or 1000 episodes per year)
-        num_periods = len(self.df)
-        years = max(0.1, num_periods / 1000)  # Rough estimate
-
-        if years == 0 or initial == 0:
-            return 0.0
-
-        cagr = (((final_balance / initial) ** (1 / years)) - 1) * 100
-        return cagr
+        return self.kernel.cagr
 
     def calculate_var(self, confidence: float = 0.95) -> float:
         """
@@ -278,12 +442,7 @@ class MetricsCalculator:
         Returns:
             VaR as percentage
         """
-        if "returns" not in self.df.columns or len(self.df) < 2:
-            return 0.0
-
-        returns = self.df["returns"].values
-        var = np.percentile(returns, (1 - confidence) * 100)
-        return var * 100  # Convert to percentage
+        return self.kernel.var(confidence)
 
     def calculate_cvar(self, confidence: float = 0.95) -> float:
         """
@@ -295,20 +454,7 @@ class MetricsCalculator:
         Returns:
             CVaR as percentage
         """
-        if "returns" not in self.df.columns or len(self.df) < 2:
-            return 0.0
-
-        returns = self.df["returns"].values
-        var_threshold = np.percentile(returns, (1 - confidence) * 100)
-
-        # Average of returns below VaR
-        tail_returns = returns[returns <= var_threshold]
-
-        if len(tail_returns) == 0:
-            return 0.0
-
-        cvar = tail_returns.mean()
-        return cvar * 100
+        return self.kernel.cvar(confidence)
 
     # ============================================
     # TRADE STATS
@@ -363,19 +509,7 @@ class MetricsCalculator:
         Returns:
             Recovery factor
         """
-        if self.df.empty or "balance" not in self.df.columns:
-            return 0.0
-
-        net_profit = self.df["balance"].iloc[-1] - self.initial_balance
-
-        # Max drawdown in dollars
-        running_max = self.df["balance"].cummax()
-        drawdown_dollars = (self.df["balance"] - running_max).min()
-
-        if drawdown_dollars == 0:
-            return net_profit if net_profit > 0 else 0.0
-
-        return abs(net_profit / drawdown_dollars)
+        return self.kernel.recovery_factor
 
     def calculate_ulcer_index(self) -> float:
         """
@@ -386,18 +520,7 @@ class MetricsCalculator:
         Returns:
             Ulcer index
         """
-        if self.df.empty or "balance" not in self.df.columns:
-            return 0.0
-
-        # Calculate drawdown percentage from peak
-        running_max = self.df["balance"].cummax()
-        drawdown_pct = ((self.df["balance"] - running_max) / running_max) * 100
-
-        # Square each drawdown and calculate mean
-        squared_dd = drawdown_pct ** 2
-        ulcer = np.sqrt(squared_dd.mean())
-
-        return abs(ulcer)
+        return self.kernel.ulcer_index
 
     def calculate_pain_index(self) -> float:
         """
@@ -408,17 +531,7 @@ class MetricsCalculator:
         Returns:
             Pain index
         """
-        if self.df.empty or "balance" not in self.df.columns:
-            return 0.0
-
-        # Calculate drawdown percentage from peak
-        running_max = self.df["balance"].cummax()
-        drawdown_pct = ((self.df["balance"] - running_max) / running_max) * 100
-
-        # Average of absolute drawdowns
-        pain = abs(drawdown_pct).mean()
-
-        return pain
+        return self.kernel.pain_index
 
     def calculate_kelly_criterion(self) -> float:
         """
@@ -451,6 +564,63 @@ class MetricsCalculator:
     # LEGACY FUNCTIONS (for compatibility)
     # ============================================
 
+    def bootstrap_confidence_intervals(
+        self,
+        n_resamples: Optional[int] = None,
+        confidence: float = 0.95,
+        block_size: Optional[int] = None,
+        seed: Optional[int] = None,
+    ) -> Dict[str, tuple]:
+        """
+        Bootstrap intervals for calculate_sharpe_ratio, calculate_sortino_ratio
+        and calculate_max_drawdown.
+
+        Args:
+            n_resamples: Number of resamples (default: BOOTSTRAP_RESAMPLES env or 500)
+            confidence: Interval coverage
+            block_size: Moving-block length (default: n^(1/3); 1 = iid)
+            seed: RNG seed for reproducible intervals
+
+        Returns:
+            Dictionary of (low, high) keyed like get_all_metrics()
+        """
+        from utils.bootstrap import DEFAULT_RESAMPLES, bootstrap_confidence_intervals
+
+        return bootstrap_confidence_intervals(
+            self.kernel.returns,
+            n_resamples=n_resamples or DEFAULT_RESAMPLES,
+            confidence=confidence,
+            block_size=block_size,
+            seed=seed,
+        )
+
+    def simulate_ftmo_breach(
+        self,
+        n_paths: Optional[int] = None,
+        n_steps: Optional[int] = None,
+        seed: Optional[int] = None,
+    ) -> Dict[str, float]:
+        """
+        Monte Carlo probability of breaching the limits checked by
+        get_ftmo_compliance (10% max drawdown, 5% daily loss).
+
+        Args:
+            n_paths: Simulated paths (default: MONTE_CARLO_PATHS env or 10,000)
+            n_steps: Horizon in checkpoints (default: history length, capped)
+            seed: RNG seed for reproducible probabilities
+
+        Returns:
+            Breach probabilities (0-1) and outcome percentiles
+        """
+        from utils.monte_carlo import DEFAULT_PATHS, ftmo_breach_probabilities
+
+        return ftmo_breach_probabilities(
+            self.kernel.returns,
+            n_paths=n_paths or DEFAULT_PATHS,
+            n_steps=n_steps,
+            seed=seed,
+        )
+
     def get_summary_metrics(self) -> Dict[str, float]:
         """
         Get summary of key metrics (legacy function).
@@ -467,13 +637,11 @@ class MetricsCalculator:
         Returns:
             Dictionary with tail risk metrics
         """
-        if "returns" not in self.df.columns or len(self.df) < 4:
+        if self.kernel.n < 4:
             return {"skewness": 0.0, "kurtosis": 0.0, "excess_kurtosis": 0.0}
 
-        returns = self.df["returns"].values
-
-        skew = stats.skew(returns)
-        kurt = stats.kurtosis(returns)
+        skew = self.kernel.skewness
+        kurt = self.kernel.kurtosis
         excess_kurt = kurt - 3  # Excess kurtosis (normal = 0)
 
         return {
@@ -483,22 +651,17 @@ class MetricsCalculator:
             "has_fat_tails": excess_kurt > 3.0,
         }
 
-    def get_ftmo_compliance(self) -> Dict[str, bool]:
+    def get_ftmo_compliance(self, metrics: Optional[Dict[str, any]] = None) -> Dict[str, bool]:
         """
         Check FTMO rule compliance.
 
+        Args:
+            metrics: Result of get_all_metrics() if already computed
+
         Returns:
             Dictionary with compliance status
         """
-        metrics = self.get_all_metrics()
-
-        return {
-            "max_drawdown_ok": metrics["ftmo_max_dd_compliant"],
-            "daily_drawdown_ok": metrics["ftmo_daily_loss_compliant"],
-            "overall_compliant": metrics["ftmo_max_dd_compliant"] and metrics["ftmo_daily_loss_compliant"],
-            "max_drawdown_value": abs(metrics["max_drawdown_pct"]),
-            "daily_drawdown_value": abs(metrics["max_daily_loss_pct"]),
-        }
+        return ftmo_compliance(metrics if metrics is not None else self.get_all_metrics())
 
     def get_advanced_stats(self) -> Dict[str, any]:
         """
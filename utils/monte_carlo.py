@@ -0,0 +1,215 @@
+"""
+🎰 MONTE CARLO - Trading Dashboard Pro
+FTMO breach probabilities from simulated equity paths
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+
+# Upper bound on cells (paths x steps) simulated in one chunk
+MAX_CHUNK_CELLS = 2_000_000
+
+# Below this many cells in total, a process pool costs more than it saves
+PARALLEL_MIN_CELLS = 20_000_000
+
+# Same convention as MetricsCalculator._estimate_trading_days
+STEPS_PER_DAY = 50
+
+DEFAULT_PATHS = int(os.getenv("MONTE_CARLO_PATHS", "10000"))
+DEFAULT_MAX_STEPS = int(os.getenv("MONTE_CARLO_MAX_STEPS", "10000"))
+
+# Result columns per path
+MAX_DD, DAILY_LOSS, FINAL_RETURN = range(3)
+
+
+def simulate_paths(
+    returns: np.ndarray,
+    rng: np.random.Generator,
+    n_paths: int,
+    n_steps: int,
+    steps_per_day: int = STEPS_PER_DAY,
+) -> np.ndarray:
+    """
+    Simulate equity paths by resampling empirical returns.
+
+    Args:
+        returns: Empirical period returns
+        rng: Random generator
+        n_paths: Number of paths
+        n_steps: Steps per path
+        steps_per_day: Steps grouped into one trading day
+
+    Returns:
+        (n_paths x 3) array: max drawdown %, worst daily loss %, final return %
+        (losses are positive percentages)
+    """
+    samples = returns[rng.integers(0, len(returns), size=(n_paths, n_steps))]
+    wealth = np.cumprod(1 + samples, axis=1)
+    del samples
+
+    out = np.empty((n_paths, 3))
+
+    # Drawdown from the running peak; the starting balance is a peak too
+    peak = np.maximum(np.maximum.accumulate(wealth, axis=1), 1.0)
+    out[:, MAX_DD] = -((wealth - peak) / peak).min(axis=1) * 100
+    del peak
+
+    # Daily loss: lowest equity of the day vs the balance the day opened at
+    n_days = -(-n_steps // steps_per_day)
+    padded = np.empty((n_paths, n_days * steps_per_day))
+    padded[:, :n_steps] = wealth
+    padded[:, n_steps:] = wealth[:, -1:]
+    days = padded.reshape(n_paths, n_days, steps_per_day)
+    day_open = np.empty((n_paths, n_days))
+    day_open[:, 0] = 1.0
+    day_open[:, 1:] = days[:, :-1, -1]
+    out[:, DAILY_LOSS] = ((day_open - days.min(axis=2)) / day_open).max(axis=1).clip(min=0) * 100
+
+    out[:, FINAL_RETURN] = (wealth[:, -1] - 1) * 100
+    return out
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    try:
+        # The parent owns (and unlinks) the segment
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:  # Python < 3.13
+        return shared_memory.SharedMemory(name=name)
+
+
+def _simulate_chunk(job: Tuple) -> int:
+    """Simulate one chunk straight into the shared result array. Runs in a worker process."""
+    returns_name, n_returns, results_name, n_paths, start, size, n_steps, steps_per_day, seed = job
+
+    returns_shm, results_shm = _attach(returns_name), _attach(results_name)
+    try:
+        returns = np.ndarray((n_returns,), dtype=np.float64, buffer=returns_shm.buf)
+        results = np.ndarray((n_paths, 3), dtype=np.float64, buffer=results_shm.buf)
+        rng = np.random.default_rng(seed)
+        results[start:start + size] = simulate_paths(returns, rng, size, n_steps, steps_per_day)
+        del returns, results  # Release buffer views before close()
+    finally:
+        returns_shm.close()
+        results_shm.close()
+    return size
+
+
+def run_simulation(
+    returns: np.ndarray,
+    n_paths: int = DEFAULT_PATHS,
+    n_steps: Optional[int] = None,
+    steps_per_day: int = STEPS_PER_DAY,
+    seed: Optional[int] = None,
+    max_workers: Optional[int] = None,
+) -> np.ndarray:
+    """
+    Per-path outcomes for n_paths simulated equity curves.
+
+    Paths are simulated in chunks of at most MAX_CHUNK_CELLS cells, each
+    seeded by its own child of one SeedSequence (same seed, same paths,
+    whatever the number of workers). With a process pool, the returns and
+    the (n_paths x 3) result array live in shared memory: workers read the
+    returns and write their rows in place, so nothing but the job tuples is
+    pickled.
+
+    Args:
+        returns: Empirical period returns
+        n_paths: Number of simulated paths
+        n_steps: Horizon in steps (default: history length, capped at MONTE_CARLO_MAX_STEPS)
+        steps_per_day: Steps grouped into one trading day
+        seed: RNG seed
+        max_workers: Pool size (default: MONTE_CARLO_WORKERS env or CPU count)
+
+    Returns:
+        (n_paths x 3) array, see simulate_paths()
+    """
+    returns = np.ascontiguousarray(returns, dtype=np.float64)
+    if n_steps is None:
+        n_steps = min(len(returns), DEFAULT_MAX_STEPS)
+
+    rows = max(1, MAX_CHUNK_CELLS // n_steps)
+    starts = list(range(0, n_paths, rows))
+    seeds = np.random.SeedSequence(seed).spawn(len(starts))
+
+    if max_workers is None:
+        max_workers = int(os.getenv("MONTE_CARLO_WORKERS", os.cpu_count() or 1))
+    max_workers = max(1, min(max_workers, len(starts)))
+
+    if max_workers == 1 or n_paths * n_steps < PARALLEL_MIN_CELLS:
+        results = np.empty((n_paths, 3))
+        for start, chunk_seed in zip(starts, seeds):
+            size = min(rows, n_paths - start)
+            rng = np.random.default_rng(chunk_seed)
+            results[start:start + size] = simulate_paths(returns, rng, size, n_steps, steps_per_day)
+        return results
+
+    returns_shm = shared_memory.SharedMemory(create=True, size=max(returns.nbytes, 1))
+    results_shm = shared_memory.SharedMemory(create=True, size=n_paths * 3 * 8)
+    try:
+        np.ndarray(returns.shape, dtype=np.float64, buffer=returns_shm.buf)[:] = returns
+        jobs = [
+            (returns_shm.name, len(returns), results_shm.name, n_paths,
+             start, min(rows, n_paths - start), n_steps, steps_per_day, chunk_seed)
+            for start, chunk_seed in zip(starts, seeds)
+        ]
+        with ProcessPoolExecutor(max_workers) as pool:
+            list(pool.map(_simulate_chunk, jobs))
+
+        return np.ndarray((n_paths, 3), dtype=np.float64, buffer=results_shm.buf).copy()
+    finally:
+        for shm in (returns_shm, results_shm):
+            shm.close()
+            shm.unlink()
+
+
+def ftmo_breach_probabilities(
+    returns: np.ndarray,
+    max_dd_limit: float = 10.0,
+    daily_loss_limit: float = 5.0,
+    n_paths: int = DEFAULT_PATHS,
+    n_steps: Optional[int] = None,
+    seed: Optional[int] = None,
+    max_workers: Optional[int] = None,
+) -> Dict[str, float]:
+    """
+    Probability of breaching the FTMO limits over the simulated horizon.
+
+    Args:
+        returns: Empirical period returns (e.g. MetricsKernel.returns)
+        max_dd_limit: Max drawdown limit in percent
+        daily_loss_limit: Daily loss limit in percent
+        n_paths: Number of simulated paths
+        n_steps: Horizon in steps (default: history length, capped)
+        seed: RNG seed
+        max_workers: Pool size
+
+    Returns:
+        Breach probabilities (0-1) and drawdown / final return percentiles
+    """
+    returns = np.asarray(returns, dtype=np.float64)
+    if len(returns) < 2 or n_paths < 1:
+        return {}
+
+    results = run_simulation(returns, n_paths, n_steps, seed=seed, max_workers=max_workers)
+    max_dd_breach = results[:, MAX_DD] >= max_dd_limit
+    daily_breach = results[:, DAILY_LOSS] >= daily_loss_limit
+    dd_p50, dd_p95 = np.percentile(results[:, MAX_DD], [50, 95])
+    ret_p5, ret_p50, ret_p95 = np.percentile(results[:, FINAL_RETURN], [5, 50, 95])
+
+    return {
+        "paths": n_paths,
+        "steps": n_steps if n_steps is not None else min(len(returns), DEFAULT_MAX_STEPS),
+        "max_dd_breach_prob": float(max_dd_breach.mean()),
+        "daily_loss_breach_prob": float(daily_breach.mean()),
+        "any_breach_prob": float((max_dd_breach | daily_breach).mean()),
+        "max_dd_p50": float(dd_p50),
+        "max_dd_p95": float(dd_p95),
+        "final_return_p5": float(ret_p5),
+        "final_return_p50": float(ret_p50),
+        "final_return_p95": float(ret_p95),
+    }
@@ -0,0 +1,326 @@
+"""
+⏱️ PROFILING - Trading Dashboard Pro
+Opt-in callback/stage timings, Prometheus export and slow-request profiles
+"""
+
+import cProfile
+import functools
+import json
+import os
+import sqlite3
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+try:
+    import resource  # Not available on Windows
+except ImportError:
+    resource = None
+
+try:
+    import pyinstrument
+except ImportError:
+    pyinstrument = None
+
+
+DEFAULT_PROFILING_DB = Path(__file__).resolve().parent.parent / "data" / "cache" / "profiling.sqlite"
+
+# Histogram upper bounds in seconds (Prometheus "le" labels)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Families exported at /metrics: name -> (type, label name, help)
+METRIC_FAMILIES = {
+    "dashboard_callback_seconds": ("histogram", "callback", "Dash callback latency"),
+    "dashboard_stage_seconds": ("histogram", "stage", "Upload pipeline stage latency"),
+    "dashboard_http_request_seconds": ("histogram", "endpoint", "HTTP request latency by route"),
+    "dashboard_payload_bytes": ("summary", "name", "Serialized callback outputs and uploads"),
+    "dashboard_memory_delta_bytes": ("summary", "callback", "Resident memory growth during a callback"),
+}
+
+
+def is_enabled() -> bool:
+    """PROFILING_ENABLED=True turns instrumentation on (read on each call)."""
+    return os.getenv("PROFILING_ENABLED", "False") == "True"
+
+
+def _rss_bytes() -> int:
+    """Current resident set size (peak RSS when psutil is missing)."""
+    if psutil is not None:
+        return psutil.Process().memory_info().rss
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reports KB, macOS bytes
+        return peak if sys.platform == "darwin" else peak * 1024
+    return 0
+
+
+class MetricsRegistry:
+    """
+    Histograms and summaries aggregated across workers in one SQLite file.
+
+    Every observation is a single UPSERT that increments count/sum, bucket
+    counters and max in place, so gunicorn workers and background job
+    processes feed the same series and /metrics reflects all of them.
+    """
+
+    def __init__(self, db_path: Optional[Union[str, Path]] = None):
+        """
+        Initialize the registry.
+
+        Args:
+            db_path: SQLite file (default: PROFILING_DB env or data/cache/profiling.sqlite)
+        """
+        self.db_path = Path(db_path or os.getenv("PROFILING_DB", DEFAULT_PROFILING_DB))
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        buckets = ", ".join(f"b{i} INTEGER NOT NULL DEFAULT 0" for i in range(len(LATENCY_BUCKETS)))
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS observations ("
+                "metric TEXT NOT NULL, label TEXT NOT NULL, "
+                "count INTEGER NOT NULL, total REAL NOT NULL, max REAL NOT NULL, "
+                f"{buckets}, PRIMARY KEY (metric, label))"
+            )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def observe(self, metric: str, label: str, value: float):
+        """
+        Record one observation.
+
+        Args:
+            metric: Family name from METRIC_FAMILIES
+            label: Callback, stage or endpoint name
+            value: Seconds for histograms, bytes for summaries
+        """
+        hits = [int(value <= bound) for bound in LATENCY_BUCKETS]
+        columns = [f"b{i}" for i in range(len(LATENCY_BUCKETS))]
+        updates = ", ".join(f"{c} = {c} + excluded.{c}" for c in columns)
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    f"INSERT INTO observations (metric, label, count, total, max, {', '.join(columns)}) "
+                    f"VALUES (?, ?, 1, ?, ?, {', '.join('?' * len(columns))}) "
+                    "ON CONFLICT (metric, label) DO UPDATE SET "
+                    "count = count + 1, total = total + excluded.total, "
+                    f"max = MAX(max, excluded.max), {updates}",
+                    (metric, label, value, value, *hits),
+                )
+        except sqlite3.Error as e:
+            print(f"Error recording {metric}: {e}")
+
+    def rows(self) -> List[Tuple]:
+        """All series as (metric, label, count, total, max, *buckets)."""
+        with self._connect() as conn:
+            return conn.execute("SELECT * FROM observations ORDER BY metric, label").fetchall()
+
+    def reset(self):
+        """Delete every series."""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM observations")
+
+    def render_prometheus(self) -> str:
+        """
+        Prometheus text exposition format (version 0.0.4).
+
+        Returns:
+            Text for the /metrics endpoint
+        """
+        by_metric: Dict[str, List[Tuple]] = {}
+        for row in self.rows():
+            by_metric.setdefault(row[0], []).append(row)
+
+        lines = []
+        for metric, (kind, label_name, help_text) in METRIC_FAMILIES.items():
+            series = by_metric.get(metric, [])
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} {kind}")
+            for _, label, count, total, maximum, *buckets in series:
+                tag = f'{label_name}="{label}"'
+                if kind == "histogram":
+                    # Bucket columns count hits per bound already (cumulative)
+                    for bound, hits in zip(LATENCY_BUCKETS, buckets):
+                        lines.append(f'{metric}_bucket{{{tag},le="{bound}"}} {hits}')
+                    lines.append(f'{metric}_bucket{{{tag},le="+Inf"}} {count}')
+                lines.append(f"{metric}_sum{{{tag}}} {total}")
+                lines.append(f"{metric}_count{{{tag}}} {count}")
+
+            # Largest observation, as its own gauge family
+            lines.append(f"# HELP {metric}_max {help_text} (largest observation)")
+            lines.append(f"# TYPE {metric}_max gauge")
+            for _, label, _count, _total, maximum, *_ in series:
+                lines.append(f'{metric}_max{{{label_name}="{label}"}} {maximum}')
+        return "\n".join(lines) + "\n"
+
+
+_registry: Optional[MetricsRegistry] = None
+
+
+def get_registry() -> MetricsRegistry:
+    """Process-wide MetricsRegistry (all workers share the same SQLite file)."""
+    global _registry
+    if _registry is None:
+        _registry = MetricsRegistry()
+    return _registry
+
+
+# ============================================
+# INSTRUMENTATION
+# ============================================
+
+
+@contextmanager
+def timed(stage: str) -> Iterator[None]:
+    """
+    Time a pipeline stage (base64_decode, parse, dataframe_build, ...).
+
+    No-op unless profiling is enabled.
+    """
+    if not is_enabled():
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        get_registry().observe("dashboard_stage_seconds", stage, time.perf_counter() - start)
+
+
+def observe_size(name: str, n_bytes: int):
+    """Record a payload size in bytes (no-op unless profiling is enabled)."""
+    if is_enabled():
+        get_registry().observe("dashboard_payload_bytes", name, float(n_bytes))
+
+
+def _payload_bytes(value) -> int:
+    """Size of a callback output once serialized like Dash does."""
+    import plotly
+
+    try:
+        return len(json.dumps(value, cls=plotly.utils.PlotlyJSONEncoder))
+    except (TypeError, ValueError):
+        return 0
+
+
+def _dump_profile(name: str, elapsed: float, profiler) -> Optional[Path]:
+    """Write a cProfile (.prof) or pyinstrument (.html) report to PROFILE_DIR."""
+    directory = Path(os.getenv("PROFILE_DIR", "data/profiles"))
+    directory.mkdir(parents=True, exist_ok=True)
+    stem = f"{name}-{time.strftime('%Y%m%d-%H%M%S')}-{int(elapsed * 1000)}ms-{os.getpid()}"
+
+    if isinstance(profiler, cProfile.Profile):
+        path = directory / f"{stem}.prof"
+        profiler.dump_stats(path)
+    else:
+        path = directory / f"{stem}.html"
+        path.write_text(profiler.output_html(), encoding="utf-8")
+    return path
+
+
+def _start_profiler():
+    """Profiler for slow-request reports, or None when PROFILE_SLOW_MS is unset."""
+    if not os.getenv("PROFILE_SLOW_MS"):
+        return None
+    if os.getenv("PROFILER", "cprofile") == "pyinstrument" and pyinstrument is not None:
+        profiler = pyinstrument.Profiler()
+        profiler.start()
+        return profiler
+    profiler = cProfile.Profile()
+    profiler.enable()
+    return profiler
+
+
+def _stop_profiler(profiler):
+    if isinstance(profiler, cProfile.Profile):
+        profiler.disable()
+    else:
+        profiler.stop()
+
+
+def instrument(name: str) -> Callable:
+    """
+    Decorator recording latency, output payload size and memory growth of a callback.
+
+    Place it under @callback / @background_callback. With PROFILE_SLOW_MS
+    set, the call also runs under cProfile (or pyinstrument with
+    PROFILER=pyinstrument) and a report is written to PROFILE_DIR when it
+    takes longer than the threshold.
+
+    Args:
+        name: Series label (usually the callback name)
+    """
+
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not is_enabled():
+                return func(*args, **kwargs)
+
+            rss_before = _rss_bytes()
+            profiler = _start_profiler()
+            start = time.perf_counter()
+            try:
+                result = func(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                if profiler is not None:
+                    _stop_profiler(profiler)
+                    if elapsed * 1000 >= float(os.getenv("PROFILE_SLOW_MS")):
+                        print(f"Slow callback {name} ({elapsed * 1000:.0f} ms): {_dump_profile(name, elapsed, profiler)}")
+
+                registry = get_registry()
+                registry.observe("dashboard_callback_seconds", name, elapsed)
+                registry.observe("dashboard_memory_delta_bytes", name, float(max(0, _rss_bytes() - rss_before)))
+
+            registry.observe("dashboard_payload_bytes", f"{name}_output", float(_payload_bytes(result)))
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+def init_app(server):
+    """
+    Add /metrics and per-endpoint HTTP timings to a Flask server.
+
+    /metrics answers 404 unless profiling is enabled.
+
+    Args:
+        server: Flask app (dash.Dash(...).server)
+    """
+    from flask import Response, abort, g, request
+
+    @server.before_request
+    def _start_timer():
+        g.profiling_start = time.perf_counter()
+
+    @server.after_request
+    def _record_request(response):
+        start = g.pop("profiling_start", None)
+        if start is not None and is_enabled() and request.path != "/metrics":
+            # Route pattern, not the raw path: bounded number of series
+            route = request.url_rule.rule if request.url_rule is not None else "unmatched"
+            get_registry().observe("dashboard_http_request_seconds", route, time.perf_counter() - start)
+        return response
+
+    @server.route("/metrics")
+    def metrics():
+        if not is_enabled():
+            abort(404)
+        return Response(get_registry().render_prometheus(), mimetype="text/plain; version=0.0.4")
@@ -0,0 +1,193 @@
+"""
+🪟 ROLLING METRICS - Trading Dashboard Pro
+O(n) sliding-window risk metrics over NumPy arrays
+"""
+
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+from utils.metrics import TRADING_DAYS_PER_YEAR, MetricsKernel
+
+
+DEFAULT_WINDOWS = [50, 100, 250, 500]
+
+
+def _window_sums(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Sum of every trailing window via one cumulative sum.
+
+    Args:
+        values: Input array
+        window: Window length
+
+    Returns:
+        Array of len(values); the first window - 1 entries are NaN
+    """
+    n = len(values)
+    out = np.full(n, np.nan)
+    if window > n:
+        return out
+    csum = np.concatenate(([0.0], np.cumsum(values, dtype=np.float64)))
+    out[window - 1:] = csum[window:] - csum[:-window]
+    return out
+
+
+def rolling_mean_std(values: np.ndarray, window: int):
+    """
+    Rolling mean and population std (ddof=0, like np.std).
+
+    Constant windows get a std of exactly 0: the sum-of-squares difference
+    would otherwise leave round-off noise there (e.g. idle stretches of
+    zero returns), which turns into huge ratios once divided by.
+
+    Args:
+        values: Input array
+        window: Window length
+
+    Returns:
+        Tuple of (mean, std) arrays
+    """
+    values = np.asarray(values, dtype=np.float64)
+    # Centering keeps the sum-of-squares difference well conditioned
+    center = values.mean() if len(values) else 0.0
+    shifted = values - center
+    mean = _window_sums(shifted, window) / window
+    variance = _window_sums(shifted * shifted, window) / window - mean * mean
+    std = np.sqrt(np.maximum(variance, 0.0))
+    std[rolling_flat(values, window)] = 0.0
+    return mean + center, std
+
+
+def rolling_max(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Trailing-window maximum in O(n) (van Herk / Gil-Werman).
+
+    Equivalent to a monotonic-deque scan, but expressed as two blockwise
+    NumPy accumulations: each window spans at most two blocks of `window`
+    elements, so its maximum is max(suffix-max of the first block,
+    prefix-max of the second). NaN is ignored like pandas' rolling max.
+
+    Args:
+        values: Input array
+        window: Window length
+
+    Returns:
+        Array of len(values); the first window - 1 entries are NaN
+    """
+    values = np.asarray(values, dtype=np.float64)
+    n = len(values)
+    out = np.full(n, np.nan)
+    if window > n or window < 1:
+        return out
+
+    blocks = -(-n // window)
+    padded = np.full(blocks * window, -np.inf)
+    padded[:n] = np.where(np.isnan(values), -np.inf, values)
+    padded = padded.reshape(blocks, window)
+
+    prefix = np.maximum.accumulate(padded, axis=1).ravel()
+    suffix = np.maximum.accumulate(padded[:, ::-1], axis=1)[:, ::-1].ravel()
+
+    end = np.arange(window - 1, n)
+    out[window - 1:] = np.maximum(suffix[end - window + 1], prefix[end])
+    out[np.isneginf(out)] = np.nan
+    return out
+
+
+def rolling_flat(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Windows whose values are all equal, in O(n) (rolling max == rolling min).
+
+    NaN entries are ignored; windows with no value at all are not flat.
+
+    Args:
+        values: Input array
+        window: Window length
+
+    Returns:
+        Boolean array of len(values)
+    """
+    values = np.asarray(values, dtype=np.float64)
+    high = rolling_max(values, window)
+    low = -rolling_max(-values, window)
+    return high == low
+
+
+def rolling_risk_metrics(
+    balance: np.ndarray,
+    window: int = 250,
+    risk_free_rate: float = 0.02,
+    confidence: float = 0.95,
+    initial_balance: float = 10000.0,
+) -> pd.DataFrame:
+    """
+    Rolling Sharpe, Sortino, volatility, VaR/CVaR and drawdown.
+
+    Every series is O(n) regardless of the window: means, deviations and
+    downside deviations come from cumulative sums, the window high from
+    rolling_max(). Returns follow MetricsKernel, so the last value of a
+    window equal to the full history matches the whole-history scalar
+    (except VaR/CVaR, see below).
+
+    VaR and CVaR are parametric (Gaussian) on the rolling mean/std: an
+    exact rolling quantile cannot be computed in O(n).
+
+    Args:
+        balance: Balance per checkpoint
+        window: Window length in checkpoints
+        risk_free_rate: Annual risk-free rate
+        confidence: VaR/CVaR confidence level
+        initial_balance: Starting account balance
+
+    Returns:
+        DataFrame indexed like balance with columns sharpe_ratio,
+        sortino_ratio, volatility_pct, var_pct, cvar_pct, drawdown_pct;
+        the first window - 1 rows are NaN
+    """
+    kernel = MetricsKernel(balance, initial_balance)
+    returns = kernel.returns
+    daily_rf = risk_free_rate / TRADING_DAYS_PER_YEAR
+    annualize = np.sqrt(TRADING_DAYS_PER_YEAR)
+
+    mean, std = rolling_mean_std(returns, window)
+
+    # Downside deviation: std of the returns below the risk-free rate
+    excess = returns - daily_rf
+    downside = np.where(excess < 0, excess, 0.0)
+    count = _window_sums((excess < 0).astype(np.float64), window)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        down_mean = _window_sums(downside, window) / count
+        down_var = _window_sums(downside * downside, window) / count - down_mean * down_mean
+        down_std = np.sqrt(np.maximum(down_var, 0.0))
+        # Same exact-zero rule when every downside return of the window is equal
+        down_std[rolling_flat(np.where(excess < 0, excess, np.nan), window)] = 0.0
+
+        sharpe = np.where(std > 0, (mean - daily_rf) / std * annualize, 0.0)
+        sortino = np.where((count > 0) & (down_std > 0), (mean - daily_rf) / down_std * annualize, 0.0)
+
+    normal = NormalDist()
+    alpha = 1 - confidence
+    z = normal.inv_cdf(alpha)
+    var = (mean + z * std) * 100
+    cvar = (mean - std * normal.pdf(z) / alpha) * 100
+
+    high = rolling_max(kernel.balance, window)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        drawdown = (kernel.balance - high) / high * 100
+
+    warmup = np.isnan(mean)
+    sharpe[warmup] = np.nan
+    sortino[warmup] = np.nan
+
+    return pd.DataFrame(
+        {
+            "sharpe_ratio": sharpe,
+            "sortino_ratio": sortino,
+            "volatility_pct": std * annualize * 100,
+            "var_pct": var,
+            "cvar_pct": cvar,
+            "drawdown_pct": drawdown,
+        }
+    )
@@ -0,0 +1,528 @@
+"""
+📡 STREAMING - Trading Dashboard Pro
+Incremental metrics for training logs that grow while an agent trains
+"""
+
+import io
+import json
+import math
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from utils.downsampling import StreamingEnvelope
+from utils.metrics import MetricsCalculator, TRADING_DAYS_PER_YEAR
+
+
+DEFAULT_LIVE_DIR = Path(__file__).resolve().parent.parent / "data"
+
+
+# ============================================
+# QUANTILE SKETCH
+# ============================================
+
+
+class QuantileSketch:
+    """
+    Relative-error quantile sketch (DDSketch-style) for returns.
+
+    Values are counted in logarithmic buckets, so memory is bounded by the
+    dynamic range of the data rather than its length; quantiles are
+    accurate to `relative_accuracy`.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01, min_value: float = 1e-9):
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.min_value = min_value
+        self.positive: Dict[int, int] = {}
+        self.negative: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+
+    def _add_to(self, store: Dict[int, int], magnitudes: np.ndarray):
+        if len(magnitudes) == 0:
+            return
+        keys = np.ceil(np.log(magnitudes) / self.log_gamma).astype(np.int64)
+        unique, counts = np.unique(keys, return_counts=True)
+        for key, count in zip(unique.tolist(), counts.tolist()):
+            store[key] = store.get(key, 0) + count
+
+    def add(self, values: np.ndarray):
+        """Add a batch of values."""
+        values = values[np.isfinite(values)]
+        self._add_to(self.positive, values[values > self.min_value])
+        self._add_to(self.negative, -values[values < -self.min_value])
+        self.zero_count += int(np.count_nonzero(np.abs(values) <= self.min_value))
+        self.count += len(values)
+
+    def _value(self, key: int) -> float:
+        return 2 * self.gamma ** key / (self.gamma + 1)
+
+    def _ascending(self):
+        """(value, count) pairs from most negative to most positive."""
+        for key in sorted(self.negative, reverse=True):
+            yield -self._value(key), self.negative[key]
+        if self.zero_count:
+            yield 0.0, self.zero_count
+        for key in sorted(self.positive):
+            yield self._value(key), self.positive[key]
+
+    def quantile(self, q: float) -> float:
+        """Approximate q-quantile (0 <= q <= 1)."""
+        if self.count == 0:
+            return 0.0
+        rank = q * (self.count - 1)
+        seen = 0
+        value = 0.0
+        for value, count in self._ascending():
+            seen += count
+            if seen > rank:
+                return value
+        return value
+
+    def tail_mean(self, q: float) -> float:
+        """Approximate mean of values <= the q-quantile (expected shortfall)."""
+        threshold = self.quantile(q)
+        total, weight = 0.0, 0
+        for value, count in self._ascending():
+            if value > threshold:
+                break
+            total += value * count
+            weight += count
+        return total / weight if weight else 0.0
+
+
+# ============================================
+# STREAMING METRICS
+# ============================================
+
+
+class StreamingMetrics:
+    """
+    Incrementally updated counterpart of MetricsKernel.
+
+    update() folds a batch of new balances into running state (running max,
+    drawdown sums, Welford mean/variance of returns and downside returns,
+    P&L sums, quantile sketch) in O(batch) time. The object exposes the same
+    attributes and methods MetricsCalculator reads from a kernel, so it can
+    be passed as `kernel=` to reuse get_all_metrics().
+    """
+
+    def __init__(self, initial_balance: float = 10000.0, risk_free_rate: float = 0.02):
+        self.initial_balance = initial_balance
+        self.risk_free_rate = risk_free_rate
+        self._daily_rf = risk_free_rate / TRADING_DAYS_PER_YEAR
+
+        self.n = 0
+        self.last_balance = math.nan
+        self.running_max = -math.inf
+
+        # Welford state (count, mean, M2) for all returns and downside returns
+        self._returns = [0, 0.0, 0.0]
+        self._downside = [0, 0.0, 0.0]
+
+        self.max_drawdown_pct = 0.0
+        self.max_drawdown_dollars = 0.0
+        self._dd_count = 0
+        self._dd_sq_sum = 0.0
+        self._dd_abs_sum = 0.0
+
+        self._gains = 0.0
+        self._losses = 0.0
+
+        self.sketch = QuantileSketch()
+
+    @staticmethod
+    def _merge(state: list, values: np.ndarray):
+        """Chan et al. parallel merge of a batch into Welford state."""
+        n_b = len(values)
+        if n_b == 0:
+            return
+        n_a, mean_a, m2_a = state
+        mean_b = float(values.mean())
+        m2_b = float(((values - mean_b) ** 2).sum())
+        n = n_a + n_b
+        delta = mean_b - mean_a
+        state[0] = n
+        state[1] = mean_a + delta * n_b / n
+        state[2] = m2_a + m2_b + delta * delta * n_a * n_b / n
+
+    def update(self, balances: np.ndarray):
+        """
+        Fold new checkpoints into the running metrics.
+
+        Args:
+            balances: New balance values, in order
+        """
+        balances = np.asarray(balances, dtype=np.float64)
+        if len(balances) == 0:
+            return
+
+        # Returns and P&L need the previous balance
+        if self.n == 0:
+            previous = balances[:-1]
+            returns = np.zeros(len(balances))
+            pnl = np.zeros(len(balances))
+            with np.errstate(divide="ignore", invalid="ignore"):
+                returns[1:] = balances[1:] / previous - 1
+            pnl[1:] = np.diff(balances)
+        else:
+            previous = np.concatenate(([self.last_balance], balances[:-1]))
+            with np.errstate(divide="ignore", invalid="ignore"):
+                returns = balances / previous - 1
+            pnl = balances - previous
+        returns[np.isnan(returns)] = 0.0
+        pnl = np.nan_to_num(pnl, nan=0.0)
+
+        self._merge(self._returns, returns)
+        self._merge(self._downside, returns[returns < self._daily_rf])
+        self.sketch.add(returns)
+
+        self._gains += float(pnl[pnl > 0].sum())
+        self._losses += float(-pnl[pnl < 0].sum())
+
+        # Streaming drawdown: carry the running max across batches
+        running_max = np.fmax.accumulate(np.concatenate(([self.running_max], balances)))[1:]
+        drawdown_dollars = balances - running_max
+        with np.errstate(divide="ignore", invalid="ignore"):
+            drawdown_pct = drawdown_dollars / running_max * 100
+        valid = ~np.isnan(drawdown_pct)
+        if valid.any():
+            self.max_drawdown_pct = min(self.max_drawdown_pct, float(drawdown_pct[valid].min()))
+            self._dd_count += int(valid.sum())
+            self._dd_sq_sum += float((drawdown_pct[valid] ** 2).sum())
+            self._dd_abs_sum += float(np.abs(drawdown_pct[valid]).sum())
+        if np.isfinite(drawdown_dollars).any():
+            self.max_drawdown_dollars = min(self.max_drawdown_dollars, float(np.nanmin(drawdown_dollars)))
+
+        self.running_max = float(running_max[-1])
+        self.last_balance = float(balances[-1])
+        self.n += len(balances)
+
+    # ============================================
+    # KERNEL INTERFACE
+    # ============================================
+
+    @property
+    def final_balance(self) -> float:
+        return self.last_balance if self.n else self.initial_balance
+
+    @property
+    def returns_mean(self) -> float:
+        return self._returns[1]
+
+    @property
+    def returns_std(self) -> float:
+        n, _, m2 = self._returns
+        return math.sqrt(m2 / n) if n else 0.0
+
+    @property
+    def ulcer_index(self) -> float:
+        return math.sqrt(self._dd_sq_sum / self._dd_count) if self._dd_count else 0.0
+
+    @property
+    def pain_index(self) -> float:
+        return self._dd_abs_sum / self._dd_count if self._dd_count else 0.0
+
+    @property
+    def profit_factor(self) -> float:
+        if self.n == 0:
+            return 0.0
+        if self._losses == 0:
+            return self._gains if self._gains > 0 else 0.0
+        return self._gains / self._losses
+
+    @property
+    def cagr(self) -> float:
+        if self.n == 0 or self.initial_balance == 0:
+            return 0.0
+        years = max(0.1, self.n / 1000)  # Same estimate as MetricsKernel
+        return (((self.final_balance / self.initial_balance) ** (1 / years)) - 1) * 100
+
+    @property
+    def calmar_ratio(self) -> float:
+        max_dd = abs(self.max_drawdown_pct)
+        return self.cagr / max_dd if max_dd else 0.0
+
+    @property
+    def recovery_factor(self) -> float:
+        if self.n == 0:
+            return 0.0
+        net_profit = self.final_balance - self.initial_balance
+        if self.max_drawdown_dollars == 0:
+            return net_profit if net_profit > 0 else 0.0
+        return abs(net_profit / self.max_drawdown_dollars)
+
+    def sharpe_ratio(self, risk_free_rate: float = 0.02) -> float:
+        if self.n < 2 or self.returns_std == 0:
+            return 0.0
+        excess_mean = self.returns_mean - risk_free_rate / TRADING_DAYS_PER_YEAR
+        return excess_mean / self.returns_std * math.sqrt(TRADING_DAYS_PER_YEAR)
+
+    def sortino_ratio(self, risk_free_rate: float = 0.02) -> float:
+        if risk_free_rate != self.risk_free_rate:
+            raise ValueError("Streaming Sortino is tracked for the construction risk_free_rate only")
+        n_down, _, m2_down = self._downside
+        if self.n < 2 or n_down == 0 or m2_down == 0:
+            return 0.0
+        downside_std = math.sqrt(m2_down / n_down)
+        return (self.returns_mean - self._daily_rf) / downside_std * math.sqrt(TRADING_DAYS_PER_YEAR)
+
+    def var(self, confidence: float = 0.95) -> float:
+        if self.n < 2:
+            return 0.0
+        return self.sketch.quantile(1 - confidence) * 100
+
+    def cvar(self, confidence: float = 0.95) -> float:
+        if self.n < 2:
+            return 0.0
+        return self.sketch.tail_mean(1 - confidence) * 100
+
+
+# ============================================
+# LOG TAILING
+# ============================================
+
+
+class _GrowableArray:
+    """Append-only float64 buffer with amortized O(1) appends."""
+
+    def __init__(self, capacity: int = 1024):
+        self._data = np.empty(capacity)
+        self.size = 0
+
+    def extend(self, values: np.ndarray):
+        needed = self.size + len(values)
+        if needed > len(self._data):
+            grown = np.empty(max(needed, 2 * len(self._data)))
+            grown[:self.size] = self._data[:self.size]
+            self._data = grown
+        self._data[self.size:needed] = values
+        self.size = needed
+
+    def view(self) -> np.ndarray:
+        return self._data[:self.size]
+
+
+# Logs with one JSON object per line; .json files are sniffed (see LogTailer)
+JSON_LINES_SUFFIXES = (".jsonl", ".ndjson")
+
+
+class LogTailer:
+    """
+    Read only the new checkpoints of a growing training log.
+
+    CSV and JSON-lines files are tailed from the last byte offset (complete
+    lines only); a .json file whose first line is a flat JSON object is
+    treated as JSON lines. The file is considered replaced, and read again
+    from the start, when its inode changes or it shrinks below the offset.
+    Other JSON files are rewritten as a whole by trainers, so they are
+    re-read when their mtime changes and only rows past the last seen one
+    are returned.
+    """
+
+    def __init__(self, path: Union[str, Path], initial_balance: float = 10000.0):
+        self.path = Path(path)
+        self.initial_balance = initial_balance
+        self.rows_seen = 0
+        self._offset = 0
+        self._inode: Optional[int] = None
+        self._header: Optional[bytes] = None
+        self._mtime = None
+        self._json_lines: Optional[bool] = True if self.path.suffix.lower() in JSON_LINES_SUFFIXES else None
+
+    def _balance(self, frame: pd.DataFrame) -> np.ndarray:
+        if "balance" in frame.columns:
+            return frame["balance"].to_numpy(dtype=np.float64)
+        if "total_reward" in frame.columns:
+            return self.initial_balance + frame["total_reward"].to_numpy(dtype=np.float64)
+        raise ValueError("Log has no 'balance' or 'total_reward' column")
+
+    def read_new(self) -> Tuple[np.ndarray, bool]:
+        """
+        Return balances appended since the last call.
+
+        Returns:
+            Tuple of (new balances, reset) where reset is True if the file
+            was truncated/replaced and state must be rebuilt
+        """
+        replaced = self._check_replaced()
+        if self.path.suffix.lower() == ".csv":
+            balances, reset = self._read_csv()
+        else:
+            if self._json_lines is None:
+                self._json_lines = self._sniff_json_lines()
+            if self._json_lines:
+                balances, reset = self._read_json_lines()
+            else:
+                balances, reset = self._read_json()
+        return balances, replaced or reset
+
+    def _check_replaced(self) -> bool:
+        """Start over if the file was replaced (new inode) or truncated."""
+        stat = self.path.stat()
+        replaced = self._inode is not None and (stat.st_ino != self._inode or stat.st_size < self._offset)
+        self._inode = stat.st_ino
+        if replaced:
+            self._offset, self._header, self._mtime, self.rows_seen = 0, None, None, 0
+            # The new file may not have the old one's format
+            self._json_lines = True if self.path.suffix.lower() in JSON_LINES_SUFFIXES else None
+        return replaced
+
+    def _sniff_json_lines(self) -> Optional[bool]:
+        """True if the first line is a flat JSON object (None: no complete line yet)."""
+        with open(self.path, "rb") as f:
+            first = f.readline()
+        if not first.endswith(b"\n"):
+            return None
+        try:
+            record = json.loads(first)
+        except ValueError:
+            return False  # Pretty-printed document
+        # A single-line document nests its checkpoints, a record does not
+        return isinstance(record, dict) and not any(isinstance(v, (dict, list)) for v in record.values())
+
+    def _read_lines(self) -> bytes:
+        """Complete lines appended since the last call."""
+        with open(self.path, "rb") as f:
+            f.seek(self._offset)
+            chunk = f.read()
+
+        # Keep only complete lines; the trainer may be mid-write
+        end = chunk.rfind(b"\n")
+        if end < 0:
+            return b""
+        chunk = chunk[:end + 1]
+        self._offset += len(chunk)
+        return chunk
+
+    def _read_csv(self) -> Tuple[np.ndarray, bool]:
+        chunk = self._read_lines()
+        if not chunk:
+            return np.empty(0), False
+
+        if self._header is None:
+            header_end = chunk.find(b"\n") + 1
+            self._header, chunk = chunk[:header_end], chunk[header_end:]
+        if not chunk.strip():
+            return np.empty(0), False
+
+        frame = pd.read_csv(io.BytesIO(self._header + chunk))
+        self.rows_seen += len(frame)
+        return self._balance(frame), False
+
+    def _read_json_lines(self) -> Tuple[np.ndarray, bool]:
+        chunk = self._read_lines()
+        records = [json.loads(line) for line in chunk.splitlines() if line.strip()]
+        if not records:
+            return np.empty(0), False
+
+        frame = pd.DataFrame.from_records(records)
+        self.rows_seen += len(frame)
+        return self._balance(frame), False
+
+    def _read_json(self) -> Tuple[np.ndarray, bool]:
+        from utils.data_loader import DataLoader
+
+        mtime = self.path.stat().st_mtime
+        if mtime == self._mtime:
+            return np.empty(0), False
+        self._mtime = mtime
+
+        dataset = DataLoader().load_local_file(self.path)
+        if dataset is None:
+            return np.empty(0), False
+
+        balance = self._balance(dataset.frame)
+        reset = len(balance) < self.rows_seen
+        start = 0 if reset else self.rows_seen
+        self.rows_seen = len(balance)
+        return balance[start:], reset
+
+
+class LiveSession:
+    """
+    Tail one training log and keep its metrics up to date.
+
+    `generation` is bumped whenever the log is replaced and the history is
+    rebuilt, so views that render incrementally know to start over.
+    """
+
+    def __init__(self, path: Union[str, Path], initial_balance: float = 10000.0):
+        self.path = Path(path)
+        self.initial_balance = initial_balance
+        self._lock = threading.Lock()
+        self.tailer = LogTailer(self.path, initial_balance)
+        self.generation = -1
+        self._reset()
+
+    def _reset(self):
+        self.metrics = StreamingMetrics(self.initial_balance)
+        self.balance = _GrowableArray()
+        self.envelope = StreamingEnvelope()
+        self.generation += 1
+
+    def poll(self) -> Tuple[pd.DataFrame, Dict]:
+        """
+        Ingest new checkpoints and return the current view.
+
+        Returns:
+            Tuple of (balance frame, metrics dictionary)
+        """
+        with self._lock:
+            new_balances, reset = self.tailer.read_new()
+            if reset:
+                # Log was truncated/replaced: new_balances is the full history
+                self._reset()
+
+            self.metrics.update(new_balances)
+            self.balance.extend(new_balances)
+            self.envelope.extend(new_balances)
+
+            frame = pd.DataFrame({"balance": self.balance.view()}, copy=False)
+            calculator = MetricsCalculator(frame, self.initial_balance, kernel=self.metrics)
+            return frame, calculator.get_all_metrics()
+
+    def equity_points(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Downsampled equity curve (positions, balances), kept up to date by poll()."""
+        with self._lock:
+            return self.envelope.points()
+
+
+_live_sessions: Dict[str, LiveSession] = {}
+
+
+def resolve_live_path(path: str) -> Path:
+    """
+    Resolve a user-supplied log path inside LIVE_LOG_DIR.
+
+    Args:
+        path: Absolute path or path relative to LIVE_LOG_DIR
+
+    Returns:
+        Resolved path
+
+    Raises:
+        ValueError: If the path escapes LIVE_LOG_DIR or has an unsupported format
+    """
+    root = Path(os.getenv("LIVE_LOG_DIR", DEFAULT_LIVE_DIR)).resolve()
+    resolved = (root / path).resolve()
+    if root != resolved and root not in resolved.parents:
+        raise ValueError(f"Live logs must be inside {root}")
+    if resolved.suffix.lower() not in (".json", ".csv") + JSON_LINES_SUFFIXES:
+        raise ValueError("Live mode supports .json, .jsonl and .csv logs")
+    return resolved
+
+
+def get_live_session(path: str) -> LiveSession:
+    """Per-process LiveSession for a log path (created on first use)."""
+    resolved = resolve_live_path(path)
+    key = str(resolved)
+    if key not in _live_sessions:
+        _live_sessions[key] = LiveSession(resolved)
+    return _live_sessions[key]